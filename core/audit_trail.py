@@ -0,0 +1,265 @@
+"""
+core/audit_trail.py — Segmented Sovereign Audit Trail v1.0
+Daily audit-log segments with count footers + reverse-seeking tail reader
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+from collections import Counter, deque
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+COUNTED_MARKERS = ("BLOCKED", "REJECTED", "BYPASS")
+VIOLATION_MARKERS = ("BLOCKED", "REJECTED")
+FOOTER_TAG = "#footer "
+_SEGMENT_RE = re.compile(r"^(?P<prefix>.+)-(?P<day>\d{4}-\d{2}-\d{2})\.log(?P<gz>\.gz)?$")
+
+
+def tail_lines(path, n: int = 20, block_size: int = 8192, skip: Callable[[str], bool] = None) -> List[str]:
+    """
+    Last n lines of a file, reading backwards in blocks from EOF.
+    Memory and I/O are O(tail) no matter how large the file is.
+    """
+    if n <= 0:
+        return []
+    lines: List[bytes] = []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        remainder = b""
+        while pos > 0 and len(lines) < n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + remainder
+            parts = chunk.split(b"\n")
+            remainder = parts[0]            # may be a partial line — finish it next block
+            for raw in reversed(parts[1:]):
+                text = raw.decode("utf-8", errors="replace")
+                if text and not (skip and skip(text)):
+                    lines.append(raw)
+                    if len(lines) >= n:
+                        break
+        if pos == 0 and remainder and len(lines) < n:
+            text = remainder.decode("utf-8", errors="replace")
+            if not (skip and skip(text)):
+                lines.append(remainder)
+    return [raw.decode("utf-8", errors="replace") for raw in reversed(lines)]
+
+
+def count_markers(line: str) -> Counter:
+    """Per-marker hits plus 'violations' — lines with any violation marker, each counted once."""
+    counts = Counter(marker for marker in COUNTED_MARKERS if marker in line)
+    if any(marker in counts for marker in VIOLATION_MARKERS):
+        counts["violations"] += 1
+    return counts
+
+
+def _is_footer(line: str) -> bool:
+    return line.startswith(FOOTER_TAG)
+
+
+class SegmentedAuditLog:
+    """
+    ethics_audit.log split into daily segments:
+
+        output/ethics_audit-2025-11-25.log      closed → ends with a '#footer {...}' count line
+        output/ethics_audit-2025-11-24.log.gz   closed + compressed
+        output/ethics_audit.index.json          footer counts of every closed segment
+
+    Totals = index (closed segments) + an incremental scan of today's segment,
+    so counts() and tail() never read the whole history. Compressing a closed
+    segment leaves its counts in the index untouched.
+    """
+
+    def __init__(self, directory, prefix: str = "ethics_audit", clock: Callable[[], datetime] = datetime.now):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.clock = clock
+        self.index_path = self.directory / f"{prefix}.index.json"
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, int]] = self._load_index()
+        self._active_day: Optional[str] = None
+        self._active_counts = Counter()
+        self._active_offset = 0
+        self._close_stale_segments()
+
+    # ---------- paths ----------
+    def segment_path(self, day: str, compressed: bool = False) -> Path:
+        return self.directory / f"{self.prefix}-{day}.log{'.gz' if compressed else ''}"
+
+    def segments(self) -> List[Path]:
+        """All segments, oldest first."""
+        found = []
+        for path in self.directory.iterdir():
+            m = _SEGMENT_RE.match(path.name)
+            if m and m.group("prefix") == self.prefix:
+                found.append((m.group("day"), path))
+        return [path for _, path in sorted(found)]
+
+    def _today(self) -> str:
+        return self.clock().date().isoformat()
+
+    # ---------- index ----------
+    def _load_index(self) -> Dict[str, Dict[str, int]]:
+        if self.index_path.exists():
+            try:
+                return json.loads(self.index_path.read_text())
+            except json.JSONDecodeError:
+                pass
+        return {}
+
+    def _save_index(self):
+        tmp = self.index_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self._index, indent=1, sort_keys=True))
+        os.replace(tmp, self.index_path)
+
+    def _read_footer(self, path: Path) -> Optional[Dict[str, int]]:
+        if path.suffix == ".gz":
+            with gzip.open(path, "rt") as f:
+                last = None
+                for line in f:
+                    last = line
+            return json.loads(last[len(FOOTER_TAG):]) if last and _is_footer(last) else None
+        tail = tail_lines(path, 1)
+        return json.loads(tail[0][len(FOOTER_TAG):]) if tail and _is_footer(tail[0]) else None
+
+    # ---------- segment lifecycle ----------
+    def _close_segment(self, day: str):
+        """Append the count footer to a finished day and record it in the index."""
+        path = self.segment_path(day)
+        if day in self._index:
+            return
+        footer = self._read_footer(path) if path.exists() else None
+        if footer is None:
+            counts, lines = Counter(), 0
+            if path.exists():
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        lines += 1
+                        counts.update(count_markers(line))
+            footer = {"lines": lines, "violations": counts["violations"],
+                      **{m: counts.get(m, 0) for m in COUNTED_MARKERS}}
+            if path.exists():
+                with open(path, "a") as f:
+                    f.write(FOOTER_TAG + json.dumps(footer, sort_keys=True) + "\n")
+        self._index[day] = footer
+        self._save_index()
+
+    def _close_stale_segments(self):
+        today = self._today()
+        for path in self.segments():
+            day = _SEGMENT_RE.match(path.name).group("day")
+            if day < today and day not in self._index:
+                footer = self._read_footer(path)
+                if footer is not None:
+                    self._index[day] = footer
+                    self._save_index()
+                elif path.suffix != ".gz":
+                    self._close_segment(day)
+
+    def _roll(self, today: str):
+        if self._active_day is not None and self._active_day != today:
+            self._close_segment(self._active_day)
+        if self._active_day != today:
+            self._active_day = today
+            self._active_counts = Counter()
+            self._active_offset = 0
+
+    def _refresh_active(self) -> Counter:
+        """Count only bytes appended since the last call (other processes included)."""
+        path = self.segment_path(self._active_day)
+        if not path.exists():
+            return self._active_counts
+        with open(path, "rb") as f:
+            f.seek(self._active_offset)
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        for raw in data[:complete].splitlines():
+            line = raw.decode("utf-8", errors="replace")
+            if not _is_footer(line):
+                self._active_counts["lines"] += 1
+                self._active_counts.update(count_markers(line))
+        self._active_offset += complete
+        return self._active_counts
+
+    # ---------- public API ----------
+    def write(self, line: str):
+        with self._lock:
+            self._roll(self._today())
+            with open(self.segment_path(self._active_day), "a") as f:
+                f.write(line if line.endswith("\n") else line + "\n")
+
+    def counts(self) -> Counter:
+        """All-time marker counts: closed segments from the index + today's incremental scan."""
+        with self._lock:
+            self._roll(self._today())
+            total = Counter()
+            for footer in self._index.values():
+                total.update(footer)
+            total.update(self._refresh_active())
+            return total
+
+    def tail(self, n: int = 20) -> List[str]:
+        """Last n audit lines across segments, newest segment first; footers skipped."""
+        collected: List[str] = []
+        for path in reversed(self.segments()):
+            need = n - len(collected)
+            if need <= 0:
+                break
+            if path.suffix == ".gz":
+                with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+                    window = deque(maxlen=need)
+                    for line in f:
+                        line = line.rstrip("\n")
+                        if line and not _is_footer(line):
+                            window.append(line)
+                chunk = list(window)
+            else:
+                chunk = tail_lines(path, need, skip=_is_footer)
+            collected = chunk + collected
+        return collected[-n:] if n else []
+
+    def compress_before(self, cutoff: date) -> List[Path]:
+        """gzip closed segments older than cutoff. Their counts stay in the index."""
+        compressed = []
+        with self._lock:
+            for path in self.segments():
+                m = _SEGMENT_RE.match(path.name)
+                day = m.group("day")
+                if m.group("gz") or day >= cutoff.isoformat() or day == self._active_day:
+                    continue
+                self._close_segment(day)
+                target = self.segment_path(day, compressed=True)
+                with open(path, "rb") as src, gzip.open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                path.unlink()
+                compressed.append(target)
+        return compressed
+
+    def import_legacy(self, legacy_path) -> int:
+        """Split a single ever-growing ethics_audit.log into daily segments by timestamp prefix."""
+        moved = 0
+        handles = {}
+        try:
+            with open(legacy_path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    day = line[:10]
+                    if not re.match(r"\d{4}-\d{2}-\d{2}$", day):
+                        continue
+                    if day not in handles:
+                        handles[day] = open(self.segment_path(day), "a")
+                    handles[day].write(line if line.endswith("\n") else line + "\n")
+                    moved += 1
+        finally:
+            for handle in handles.values():
+                handle.close()
+        self._close_stale_segments()
+        return moved
@@ -0,0 +1,418 @@
+"""
+core/bid_config.py — Compiled Sovereign Config v1.0
+config.yaml compiled once into a frozen, validated object + hot-reload watcher
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional, Tuple
+
+import yaml
+
+ETHICS_MODES = ("blacklist", "whitelist")
+
+# Which crew installs which productivity line — used for the precomputed $/unit table
+DEFAULT_LABOR_ROLES = {
+    "sealant_lf_per_hour": "Sealant Installer",
+    "deck_coating_sf_per_hour": "Deck Coating Foreman",
+    "penetrations_per_hour": "Sealant Installer",
+    "expansion_joints_lf_per_hour": "Sealant Installer",
+}
+
+
+class ConfigError(ValueError):
+    """Raised when config.yaml is missing a required key or holds an invalid value."""
+    pass
+
+
+@dataclass(frozen=True)
+class RegionConfig:
+    key: str
+    name: str
+    tax_rate: float
+
+
+@dataclass(frozen=True)
+class SupplierConfig:
+    name: str
+    url: str
+    active: bool = True
+
+
+@dataclass(frozen=True)
+class SubcontractorConfig:
+    name: str
+    email: str
+    scopes: Tuple[str, ...]
+    last_rate: float
+    ethics_approved: bool
+
+
+@dataclass(frozen=True)
+class LaborConfig:
+    rates: Mapping[str, float]
+    productivity: Mapping[str, float]
+    roles: Mapping[str, str]
+    cost_per_unit: Mapping[str, float]   # derived: role rate / units per hour
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    """One priceable product: which takeoff quantity it consumes and which crew installs it."""
+    key: str
+    takeoff_key: str
+    product: str
+    search: str
+    unit: str
+    productivity: str
+    role: str
+    fallback_price: float
+
+
+@dataclass(frozen=True)
+class BypassConfig:
+    enabled: bool = False
+    allow_manufacturer_override: bool = False
+    allow_supplier_override: bool = False
+    allow_subcontractor_override: bool = False
+    override_reason_required: bool = False
+
+    def allows(self, entity_type: str) -> bool:
+        return self.enabled and getattr(self, f"allow_{entity_type}_override", False)
+
+
+@dataclass(frozen=True)
+class EthicsConfig:
+    enabled: bool
+    mode: str
+    strict_mode: bool
+    log_violations: bool
+    blacklist_file: str
+    whitelist_file: str
+    bypass: BypassConfig
+    emergency_active: bool
+    emergency_reason: str
+    blacklist: frozenset
+    whitelist: frozenset
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """Typed, frozen view of config.yaml. Never mutated — reloads build a new one."""
+    version: str
+    source: str
+    compiled_at: float
+    company_name: str
+    letterhead_path: str
+    default_profit_pct: float
+    output_folder: str
+    region: RegionConfig
+    regions: Mapping[str, RegionConfig]
+    suppliers: Tuple[SupplierConfig, ...]
+    manufacturers_priority: Tuple[str, ...]
+    labor: LaborConfig
+    catalog: Tuple[CatalogItem, ...]
+    ethics: EthicsConfig
+    subcontractors_enabled: bool
+    subcontractors: Tuple[SubcontractorConfig, ...]
+    paths: Mapping[str, str]
+    raw: Mapping[str, Any] = field(repr=False)
+
+    @property
+    def tax_rate(self) -> float:
+        return self.region.tax_rate
+
+    @property
+    def profit_multiplier(self) -> float:
+        return 1.0 + self.default_profit_pct / 100.0
+
+    @property
+    def active_suppliers(self) -> Tuple[SupplierConfig, ...]:
+        return tuple(s for s in self.suppliers if s.active)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _require(section: Mapping, key: str, where: str) -> Any:
+    if not isinstance(section, Mapping) or key not in section:
+        raise ConfigError(f"config: missing required key '{where + '.' if where else ''}{key}'")
+    return section[key]
+
+
+def _positive(value: Any, where: str, allow_zero: bool = False) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ConfigError(f"config: '{where}' must be a number, got {value!r}")
+    if number < 0 or (number == 0 and not allow_zero):
+        raise ConfigError(f"config: '{where}' must be {'>= 0' if allow_zero else '> 0'}, got {number}")
+    return number
+
+
+def _load_name_list(path: str) -> frozenset:
+    if not path or not os.path.exists(path):
+        return frozenset()
+    with open(path) as f:
+        return frozenset(str(name) for name in (yaml.safe_load(f) or []))
+
+
+def _compile_labor(labor: Mapping) -> LaborConfig:
+    rates = {role: _positive(rate, f"labor.rates.{role}")
+             for role, rate in _require(labor, "rates", "labor").items()}
+    productivity = {key: _positive(per_hour, f"labor.productivity.{key}")
+                    for key, per_hour in _require(labor, "productivity", "labor").items()}
+    roles = {**DEFAULT_LABOR_ROLES, **(labor.get("roles") or {})}
+    roles = {key: role for key, role in roles.items() if key in productivity}
+
+    cost_per_unit = {}
+    for key, role in roles.items():
+        if role not in rates:
+            raise ConfigError(f"config: labor role '{role}' for '{key}' has no entry in labor.rates")
+        cost_per_unit[key] = rates[role] / productivity[key]
+
+    return LaborConfig(
+        rates=MappingProxyType(rates),
+        productivity=MappingProxyType(productivity),
+        roles=MappingProxyType(roles),
+        cost_per_unit=MappingProxyType(cost_per_unit),
+    )
+
+
+def _compile_catalog(entries, labor: LaborConfig) -> Tuple[CatalogItem, ...]:
+    items = []
+    seen = set()
+    for entry in entries or []:
+        key = str(_require(entry, "key", "catalog[]"))
+        if key in seen:
+            raise ConfigError(f"config: duplicate catalog key '{key}'")
+        seen.add(key)
+        productivity = str(_require(entry, "productivity", f"catalog.{key}"))
+        if productivity not in labor.productivity:
+            raise ConfigError(f"config: catalog.{key}.productivity '{productivity}' not in labor.productivity")
+        role = str(entry.get("role") or labor.roles.get(productivity, ""))
+        if role not in labor.rates:
+            raise ConfigError(f"config: catalog.{key}.role '{role}' has no entry in labor.rates")
+        if role != labor.roles.get(productivity):
+            # Labor is priced from labor.cost_per_unit, which labor.roles fixes per productivity line
+            raise ConfigError(f"config: catalog.{key}.role '{role}' differs from labor.roles.{productivity} "
+                              f"'{labor.roles.get(productivity, '')}'")
+        product = str(_require(entry, "product", f"catalog.{key}"))
+        items.append(CatalogItem(
+            key=key,
+            takeoff_key=str(_require(entry, "takeoff_key", f"catalog.{key}")),
+            product=product,
+            search=str(entry.get("search", product)),
+            unit=str(_require(entry, "unit", f"catalog.{key}")),
+            productivity=productivity,
+            role=role,
+            fallback_price=_positive(_require(entry, "fallback_price", f"catalog.{key}"), f"catalog.{key}.fallback_price"),
+        ))
+    return tuple(items)
+
+
+def _compile_ethics(ethics: Mapping, paths: Mapping) -> EthicsConfig:
+    mode = ethics.get("mode", "blacklist")
+    if mode not in ETHICS_MODES:
+        raise ConfigError(f"config: ethics.mode must be one of {ETHICS_MODES}, got {mode!r}")
+
+    data_dir = paths.get("ethics_data", "data/")
+    blacklist_file = ethics.get("blacklist_file") or os.path.join(data_dir, "ethics_blacklist.yaml")
+    whitelist_file = ethics.get("whitelist_file") or os.path.join(data_dir, "ethics_whitelist.yaml")
+    bypass = ethics.get("bypass") or {}
+    emergency = ethics.get("emergency_mode") or {}
+
+    return EthicsConfig(
+        enabled=bool(ethics.get("enabled", True)),
+        mode=mode,
+        strict_mode=bool(ethics.get("strict_mode", False)),
+        log_violations=bool(ethics.get("log_violations", True)),
+        blacklist_file=blacklist_file,
+        whitelist_file=whitelist_file,
+        bypass=BypassConfig(**{k: bool(v) for k, v in bypass.items() if k in BypassConfig.__dataclass_fields__}),
+        emergency_active=bool(emergency.get("active", False)),
+        emergency_reason=str(emergency.get("reason", "") or ""),
+        blacklist=_load_name_list(blacklist_file),
+        whitelist=_load_name_list(whitelist_file),
+    )
+
+
+def compile_config(raw: Mapping[str, Any], source: str = "<memory>", version: Optional[str] = None) -> CompiledConfig:
+    """Validate a parsed config dict and build the frozen CompiledConfig."""
+    if not isinstance(raw, Mapping):
+        raise ConfigError("config: top level must be a mapping")
+
+    app = _require(raw, "app", "")
+    region_section = _require(raw, "region", "")
+    paths = raw.get("paths") or {}
+
+    regions = {}
+    for key, entry in _require(region_section, "regions", "region").items():
+        key = str(key)
+        regions[key] = RegionConfig(
+            key=key,
+            name=str(entry.get("name", key)),
+            tax_rate=_positive(entry.get("tax_rate", 0.0), f"region.regions.{key}.tax_rate", allow_zero=True),
+        )
+    current = str(_require(region_section, "current", "region"))
+    if current not in regions:
+        raise ConfigError(f"config: region.current '{current}' is not defined in region.regions")
+
+    profit_pct = _positive(_require(app, "default_profit_pct", "app"), "app.default_profit_pct", allow_zero=True)
+    if profit_pct >= 100:
+        raise ConfigError(f"config: app.default_profit_pct must be < 100, got {profit_pct}")
+
+    suppliers = tuple(
+        SupplierConfig(name=str(_require(s, "name", "suppliers[]")), url=str(s.get("url", "")),
+                       active=bool(s.get("active", True)))
+        for s in raw.get("suppliers") or []
+    )
+
+    subs_section = raw.get("subcontractors") or {}
+    subs = tuple(
+        SubcontractorConfig(
+            name=str(_require(s, "name", "subcontractors.subs[]")),
+            email=str(s.get("email", "")),
+            scopes=tuple(s.get("scopes") or ()),
+            last_rate=_positive(s.get("last_rate", 0.0), f"subcontractors.{s['name']}.last_rate", allow_zero=True),
+            ethics_approved=bool(s.get("ethics_approved", False)),
+        )
+        for s in subs_section.get("subs") or []
+    )
+
+    labor = _compile_labor(_require(raw, "labor", ""))
+
+    if version is None:
+        version = hashlib.sha256(repr(sorted(raw.items(), key=lambda kv: kv[0])).encode()).hexdigest()[:12]
+
+    return CompiledConfig(
+        version=version,
+        source=source,
+        compiled_at=time.time(),
+        company_name=str(app.get("company_name", "")),
+        letterhead_path=str(app.get("letterhead_path", "")),
+        default_profit_pct=profit_pct,
+        output_folder=str(app.get("output_folder", "output")),
+        region=regions[current],
+        regions=MappingProxyType(regions),
+        suppliers=suppliers,
+        manufacturers_priority=tuple(raw.get("manufacturers_priority") or ()),
+        labor=labor,
+        catalog=_compile_catalog(raw.get("catalog"), labor),
+        ethics=_compile_ethics(raw.get("ethics") or {}, paths),
+        subcontractors_enabled=bool(subs_section.get("enabled", False)),
+        subcontractors=subs,
+        paths=_freeze(dict(paths)),
+        raw=_freeze(dict(raw)),
+    )
+
+
+def load_config(path: str = "config.yaml") -> CompiledConfig:
+    """Read + compile config.yaml. Version = sha256 of the file bytes and both ethics lists."""
+    data = Path(path).read_bytes()
+    raw = yaml.safe_load(data) or {}
+    digest = hashlib.sha256(data)
+    compiled = compile_config(raw, source=str(path), version="pending")
+    for list_file in (compiled.ethics.blacklist_file, compiled.ethics.whitelist_file):
+        if os.path.exists(list_file):
+            digest.update(Path(list_file).read_bytes())
+    return replace(compiled, version=digest.hexdigest()[:12])
+
+
+class ConfigWatcher:
+    """
+    Holds the live CompiledConfig for long-running batch/API processes.
+    A daemon thread polls config.yaml (+ ethics lists) and swaps in a freshly
+    compiled object when they change. Readers call current() once per bid and
+    keep that snapshot, so a reload mid-bid never mixes two versions.
+    A config that fails validation is rejected and the previous one stays live.
+    """
+
+    def __init__(self, path: str = "config.yaml", poll_interval: float = 2.0,
+                 on_reload: Optional[Callable[[CompiledConfig, CompiledConfig], None]] = None):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.on_reload = on_reload
+        self.last_error: Optional[str] = None
+        self._config = load_config(path)
+        self._stamp = self._fingerprint()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def current(self) -> CompiledConfig:
+        return self._config
+
+    @property
+    def version(self) -> str:
+        return self._config.version
+
+    def _watched_files(self) -> Tuple[str, ...]:
+        ethics = self._config.ethics
+        return (self.path, ethics.blacklist_file, ethics.whitelist_file)
+
+    def _fingerprint(self) -> Tuple:
+        stamp = []
+        for path in self._watched_files():
+            try:
+                st = os.stat(path)
+                stamp.append((path, st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stamp.append((path, None, None))
+        return tuple(stamp)
+
+    def reload_if_changed(self) -> bool:
+        """Recompile if any watched file changed. Returns True when a new config went live."""
+        with self._lock:
+            stamp = self._fingerprint()
+            if stamp == self._stamp:
+                return False
+            self._stamp = stamp
+            try:
+                fresh = load_config(self.path)
+            except (ConfigError, yaml.YAMLError, OSError) as e:
+                self.last_error = str(e)
+                return False
+            self.last_error = None
+            if fresh.version == self._config.version:
+                return False
+            previous, self._config = self._config, fresh   # atomic reference swap
+            self._stamp = self._fingerprint()
+        if self.on_reload:
+            self.on_reload(previous, fresh)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload_if_changed()
+
+    def start(self) -> "ConfigWatcher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+
+if __name__ == "__main__":
+    conf = load_config("config.yaml")
+    print(f"config {conf.version} — region {conf.region.name} (tax {conf.tax_rate:.5f})")
+    for key, cost in conf.labor.cost_per_unit.items():
+        print(f"  {key:<30} {conf.labor.roles[key]:<22} ${cost:.4f}/unit")
@@ -0,0 +1,411 @@
+"""
+core/bid_service.py — Sovereign Bid Service v1.0
+Async FastAPI front door for the main.py bid pipeline: job queue, bounded workers,
+WebSocket progress, cancellation, certificate download
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import asyncio
+import re
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, JSONResponse
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+TERMINAL = {DONE, FAILED, CANCELLED}
+
+Stage = Tuple[str, Callable[[dict], None]]
+
+
+class JobCancelled(Exception):
+    """Raised between stages when a client cancelled the job."""
+    pass
+
+
+class QueueFull(Exception):
+    """Raised when the job queue is at capacity — surfaced to clients as 503 + Retry-After."""
+    pass
+
+
+@dataclass
+class BidJob:
+    id: str
+    pdf_path: Path
+    project_key: str
+    status: str = QUEUED
+    stage: str = ""
+    error: str = ""
+    config_version: str = ""
+    certificates: List[str] = field(default_factory=list)
+    events: List[dict] = field(default_factory=list)
+    created: float = field(default_factory=time.time)
+    finished: float = 0.0
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def summary(self) -> dict:
+        return {
+            "job_id": self.id,
+            "project_key": self.project_key,
+            "status": self.status,
+            "stage": self.stage,
+            "error": self.error,
+            "config_version": self.config_version,
+            "certificates": self.certificates,
+        }
+
+
+# ==================== QUEUE BACKENDS ====================
+
+class JobQueue(ABC):
+    """Swap point: LocalJobQueue in-process today, a persistent broker tomorrow."""
+
+    @abstractmethod
+    def put_nowait(self, job_id: str) -> None: ...
+
+    @abstractmethod
+    async def get(self) -> str: ...
+
+    @abstractmethod
+    def qsize(self) -> int: ...
+
+    @property
+    @abstractmethod
+    def maxsize(self) -> int: ...
+
+    def remove(self, job_id: str) -> bool:
+        """Drop a still-queued job so it frees its slot. Backends that can't just let workers skip it."""
+        return False
+
+
+class LocalJobQueue(JobQueue):
+    def __init__(self, maxsize: int = 16):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def put_nowait(self, job_id: str) -> None:
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise QueueFull(f"{self._queue.qsize()} bids already waiting")
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def remove(self, job_id: str) -> bool:
+        # At most maxsize ids: drain and re-queue the rest in order
+        waiting = []
+        while not self._queue.empty():
+            waiting.append(self._queue.get_nowait())
+        for queued in waiting:
+            if queued != job_id:
+                self._queue.put_nowait(queued)
+        return len(waiting) != self._queue.qsize()
+
+    @property
+    def maxsize(self) -> int:
+        return self._queue.maxsize
+
+
+# ==================== PIPELINE ====================
+
+# Everything default_stages() calls on main.py, checked once when the pipeline is built
+PIPELINE_ENTRY_POINTS = (
+    "CONFIG", "AUDIT", "gemini_vision_takeoff", "detect_project_type", "build_line_items",
+    "calculate_financial_compliance", "generate_financial_compliance_certificate",
+    "detect_environmental_risk", "generate_environmental_certificate",
+    "calculate_dei_impact", "generate_dei_impact_report", "calculate_risk_profile", "generate_risk_report",
+    "verify_insurance_compliance", "generate_insurance_certificate", "finalize_audit", "generate_audit_report",
+)
+
+
+def default_stages() -> List[Stage]:
+    """The main.py bid pipeline, one entry per progress step. Imported lazily — main.py is heavy."""
+    import main as bid
+    from core.bid_sweep import final_bid_for
+    missing = [name for name in PIPELINE_ENTRY_POINTS if not hasattr(bid, name)]
+    if missing:
+        raise RuntimeError(f"main.py is missing bid pipeline entry points: {', '.join(missing)}")
+    bid.CONFIG.start()      # long-running service: hot-reload config.yaml (idempotent)
+
+    def extract(ctx):
+        ctx["conf"] = bid.CONFIG.current()
+        ctx["takeoff"] = bid.gemini_vision_takeoff(ctx["pdf"])
+        ctx["flags"] = bid.detect_project_type(ctx["pdf"].stem, ctx["pdf"])
+
+    def price(ctx):
+        conf = ctx["conf"]
+        items = bid.build_line_items(ctx["takeoff"], conf.region.key, ctx["project_key"], conf=conf)
+        ctx["line_items"] = items
+        ctx["final_bid"] = float(final_bid_for(items.material_subtotal, items.labor_subtotal,
+                                               conf.tax_rate, conf.default_profit_pct / 100.0))
+
+    def financial(ctx):
+        ctx["compliance"] = bid.calculate_financial_compliance(ctx["line_items"], ctx["takeoff"], ctx["flags"],
+                                                               ctx["final_bid"], conf=ctx["conf"])
+        bid.generate_financial_compliance_certificate(ctx["pdf"].stem, ctx["project_key"], ctx["compliance"], ctx["final_bid"])
+
+    def environmental(ctx):
+        ctx["env_risks"] = bid.detect_environmental_risk(ctx["line_items"], ctx["pdf"].stem, ctx["pdf"])
+        bid.generate_environmental_certificate(ctx["pdf"].stem, ctx["project_key"], ctx["env_risks"], ctx["final_bid"])
+
+    def dei(ctx):
+        ctx["dei"] = bid.calculate_dei_impact(ctx["line_items"], ctx["final_bid"], ctx["project_key"])
+        bid.generate_dei_impact_report(ctx["pdf"].stem, ctx["project_key"], ctx["dei"], ctx["final_bid"])
+
+    def risk(ctx):
+        ctx["risk"] = bid.calculate_risk_profile(ctx["project_key"], ctx["line_items"], ctx["final_bid"],
+                                                 ctx["env_risks"], ctx["dei"], {}, conf=ctx["conf"])
+        bid.generate_risk_report(ctx["pdf"].stem, ctx["project_key"], ctx["risk"], ctx["final_bid"])
+
+    def insurance(ctx):
+        ctx["insurance"] = bid.verify_insurance_compliance(ctx["project_key"], ctx["final_bid"], ctx["flags"], ctx["risk"])
+        bid.generate_insurance_certificate(ctx["pdf"].stem, ctx["project_key"], ctx["insurance"], ctx["final_bid"])
+
+    def audit(ctx):
+        counts = bid.AUDIT.counts()
+        violations, overrides = counts["violations"], counts["BYPASS"]
+        bid.finalize_audit(ctx["pdf"].stem, violations, overrides, ctx["conf"].version)
+        bid.generate_audit_report(ctx["pdf"].stem, ctx["project_key"], violations, overrides, ctx["final_bid"],
+                                  conf=ctx["conf"])
+
+    return [("extract", extract), ("price", price), ("financial", financial), ("environmental", environmental),
+            ("dei", dei), ("risk", risk), ("insurance", insurance), ("audit", audit)]
+
+
+class BidService:
+    """
+    Bounded worker pool over a JobQueue. Each worker pulls a job id and runs the
+    blocking pipeline stages on a thread; progress events are pushed back onto
+    the event loop for WebSocket subscribers. Cancellation is checked between
+    stages; a cancelled job still waiting is taken off the queue. Finished jobs
+    (status, events, upload) are forgotten `job_ttl` seconds after they end.
+    """
+
+    def __init__(self, output_dir: Path, upload_dir: Path, stages: Optional[Callable[[], Sequence[Stage]]] = None,
+                 workers: int = 2, queue: Optional[JobQueue] = None, max_queue: int = 16, job_ttl: float = 3600.0):
+        self.output_dir = Path(output_dir)
+        self.upload_dir = Path(upload_dir)
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.stage_factory = stages or default_stages
+        self.workers = workers
+        self.queue = queue
+        self.max_queue = max_queue
+        self.job_ttl = job_ttl
+        self.jobs: Dict[str, BidJob] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stages: Optional[Sequence[Stage]] = None
+
+    # ---------- lifecycle ----------
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self.queue = self.queue or LocalJobQueue(self.max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bid-worker")
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self):
+        for job in self.jobs.values():
+            job.cancel_event.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- jobs ----------
+    def submit(self, pdf_bytes: bytes, filename: str) -> BidJob:
+        self.evict_expired()
+        job_id = uuid.uuid4().hex[:12]
+        stem = re.sub(r"[^A-Za-z0-9_.-]", "_", Path(filename).stem) or "bid"
+        pdf_path = self.upload_dir / f"{job_id}_{stem}.pdf"
+        job = BidJob(id=job_id, pdf_path=pdf_path, project_key=f"{stem}_{job_id}")
+        self.queue.put_nowait(job_id)          # raises QueueFull before anything touches disk
+        pdf_path.write_bytes(pdf_bytes)
+        self.jobs[job_id] = job
+        self._emit(job, {"event": "queued", "position": self.queue.qsize()})
+        return job
+
+    def cancel(self, job_id: str) -> BidJob:
+        job = self.jobs[job_id]
+        if job.status not in TERMINAL:
+            job.cancel_event.set()
+            if job.status == QUEUED:
+                self.queue.remove(job_id)
+                self._finish(job, CANCELLED)
+        return job
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """Forget jobs that finished more than job_ttl seconds ago."""
+        cutoff = (now if now is not None else time.time()) - self.job_ttl
+        expired = [job for job in self.jobs.values() if job.status in TERMINAL and job.finished < cutoff]
+        for job in expired:
+            del self.jobs[job.id]
+            self._subscribers.pop(job.id, None)
+            job.pdf_path.unlink(missing_ok=True)
+        return len(expired)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in self.jobs[job_id].events:
+            queue.put_nowait(event)
+        self._subscribers.setdefault(job_id, []).append(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(job_id, [])
+        if queue in subscribers:
+            subscribers.remove(queue)
+
+    # ---------- internals ----------
+    def _emit(self, job: BidJob, event: dict):
+        """Safe from worker threads: hops onto the loop before touching subscriber queues."""
+        event = {"job_id": job.id, "ts": time.time(), **event}
+
+        def push():
+            job.events.append(event)
+            for queue in self._subscribers.get(job.id, []):
+                queue.put_nowait(event)
+
+        if self._loop is not None and not self._on_loop():
+            self._loop.call_soon_threadsafe(push)
+        else:
+            push()
+
+    def _on_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _finish(self, job: BidJob, status: str, error: str = ""):
+        job.status, job.error, job.finished = status, error, time.time()
+        job.certificates = sorted(p.name for p in self.output_dir.glob(f"*{job.project_key}*.pdf"))
+        self._emit(job, {"event": status, "error": error, "certificates": job.certificates})
+
+    def _run_pipeline(self, job: BidJob):
+        """Blocking — runs on a worker thread."""
+        if self._stages is None:
+            self._stages = list(self.stage_factory())
+        ctx: Dict[str, Any] = {"pdf": job.pdf_path, "project_key": job.project_key}
+        total = len(self._stages)
+        for n, (name, fn) in enumerate(self._stages, start=1):
+            if job.cancel_event.is_set():
+                raise JobCancelled()
+            job.stage = name
+            self._emit(job, {"event": "stage", "stage": name, "step": n, "of": total})
+            fn(ctx)
+            if "conf" in ctx and not job.config_version:
+                job.config_version = ctx["conf"].version
+
+    async def _worker(self, n: int):
+        while True:
+            job_id = await self.queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status in TERMINAL:
+                continue
+            job.status = RUNNING
+            self._emit(job, {"event": "running", "worker": n})
+            try:
+                await self._loop.run_in_executor(self._executor, self._run_pipeline, job)
+            except JobCancelled:
+                self._finish(job, CANCELLED)
+            except asyncio.CancelledError:
+                self._finish(job, CANCELLED)
+                raise
+            except Exception as e:
+                self._finish(job, FAILED, f"{type(e).__name__}: {e}")
+            else:
+                self._finish(job, DONE)
+
+
+# ==================== HTTP / WEBSOCKET ====================
+
+def create_app(output_dir: Path = Path("output"), upload_dir: Path = Path("input/uploads"),
+               stages: Optional[Callable[[], Sequence[Stage]]] = None, workers: int = 2,
+               max_queue: int = 16, queue: Optional[JobQueue] = None, job_ttl: float = 3600.0) -> FastAPI:
+    service = BidService(output_dir, upload_dir, stages=stages, workers=workers, queue=queue, max_queue=max_queue,
+                         job_ttl=job_ttl)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await service.start()
+        yield
+        await service.stop()
+
+    app = FastAPI(title="Turbo Takeoff Bid Service", version="1.0", lifespan=lifespan)
+    app.state.service = service
+
+    def _job(job_id: str) -> BidJob:
+        job = service.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(404, f"Unknown job {job_id}")
+        return job
+
+    @app.post("/bids", status_code=202)
+    async def submit_bid(request: Request, name: str = "bid.pdf"):
+        """Raw PDF body (Content-Type: application/pdf) → job id."""
+        body = await request.body()
+        if not body.startswith(b"%PDF"):
+            raise HTTPException(415, "Body must be a PDF")
+        try:
+            job = service.submit(body, name)
+        except QueueFull as e:
+            return JSONResponse({"detail": f"Bid queue full — {e}"}, status_code=503, headers={"Retry-After": "30"})
+        return {"job_id": job.id, "status": job.status, "queue_depth": service.queue.qsize()}
+
+    @app.get("/bids/{job_id}")
+    async def bid_status(job_id: str):
+        return _job(job_id).summary()
+
+    @app.delete("/bids/{job_id}")
+    async def cancel_bid(job_id: str):
+        _job(job_id)
+        return service.cancel(job_id).summary()
+
+    @app.get("/bids/{job_id}/certificates/{filename}")
+    async def download_certificate(job_id: str, filename: str):
+        job = _job(job_id)
+        if job.status != DONE:
+            raise HTTPException(409, f"Job is {job.status}")
+        if filename not in job.certificates:
+            raise HTTPException(404, f"No certificate {filename} for this job")
+        return FileResponse(service.output_dir / filename, media_type="application/pdf", filename=filename)
+
+    @app.websocket("/bids/{job_id}/progress")
+    async def bid_progress(websocket: WebSocket, job_id: str):
+        await websocket.accept()
+        if job_id not in service.jobs:
+            await websocket.close(code=4404)
+            return
+        queue = service.subscribe(job_id)
+        try:
+            while True:
+                event = await queue.get()
+                await websocket.send_json(event)
+                if event["event"] in TERMINAL:
+                    break
+            await websocket.close()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            service.unsubscribe(job_id, queue)
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(create_app(), host="0.0.0.0", port=8100)
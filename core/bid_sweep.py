@@ -0,0 +1,218 @@
+"""
+core/bid_sweep.py — What-If Margin / Price Sweep v1.0
+Margin × material-shock grid scored against cached line items in one vectorized batch
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import argparse
+import csv
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from core.pricing_kernel import LineItemTable
+
+# Shared with calculate_risk_profile / calculate_financial_compliance in main.py
+RISK_BANDS = (
+    (70, "CRITICAL — RECONSIDER BID"),
+    (45, "HIGH — PROCEED WITH CAUTION"),
+    (25, "MODERATE"),
+    (0, "LOW — CLEAN CHASE"),
+)
+PROFIT_EROSION_LINE = 0.18      # margin on final bid below this = survival risk
+PROFIT_EROSION_POINTS = 40
+CIRCLE_CAP = 0.33               # max gross margin on village jobs
+NATIVE_SUB_FLOW = 25000         # $ credited per Native-owned sub line (ESG native_flow_pct)
+NATIVE_CORPORATIONS = ("Doyon", "Calista", "Tanana")
+BUILDERS_RISK_FACTOR = 1.1
+UMBRELLA_TRIGGER = 2500000
+
+
+def risk_level(score: float) -> str:
+    for floor, label in RISK_BANDS:
+        if score >= floor:
+            return label
+    return RISK_BANDS[-1][1]
+
+
+def final_bid_for(material: np.ndarray, labor: np.ndarray, tax_rate: float, margin: np.ndarray) -> np.ndarray:
+    """Materials carry sales tax; the whole cost carries the margin."""
+    return (material * (1.0 + tax_rate) + labor) * (1.0 + margin)
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    margins: np.ndarray          # (M,) fractional margins
+    shocks: np.ndarray           # (S,) fractional material price shocks
+    subtotal: np.ndarray         # (S, 1) material + labor after shock
+    final_bid: np.ndarray        # (S, M)
+    gross_margin: np.ndarray     # (S, M) on cost — financial compliance check
+    bid_margin: np.ndarray       # (S, M) on final bid — risk profit-erosion check
+    risk_score: np.ndarray       # (S, M)
+    native_flow_pct: np.ndarray  # (S, M)
+    builders_risk: np.ndarray    # (S, M)
+    circle_cap_ok: np.ndarray    # (S, M) bool
+    umbrella_gap: np.ndarray     # (S, M) bool
+
+    def band_index(self) -> np.ndarray:
+        floors = np.array([floor for floor, _ in RISK_BANDS])
+        return np.argmax(self.risk_score[..., None] >= floors, axis=-1)
+
+    def crossings(self) -> Dict[float, Dict[str, Optional[float]]]:
+        """
+        Per shock: the lowest grid margin at which the bid is at or below each
+        risk band, plus the first margin that breaks the village Circle Cap.
+        None = never reached on this grid.
+        """
+        bands = self.band_index()
+        out = {}
+        for s, shock in enumerate(self.shocks):
+            row = {}
+            for b, (_, label) in enumerate(RISK_BANDS):
+                hits = np.flatnonzero(bands[s] >= b)
+                row[label] = float(self.margins[hits[0]]) if hits.size else None
+            over = np.flatnonzero(~self.circle_cap_ok[s])
+            row["circle_cap_exceeded"] = float(self.margins[over[0]]) if over.size else None
+            out[float(shock)] = row
+        return out
+
+    def rows(self) -> List[dict]:
+        bands = self.band_index()
+        rows = []
+        for s, shock in enumerate(self.shocks):
+            for m, margin in enumerate(self.margins):
+                rows.append({
+                    "shock_pct": round(float(shock) * 100, 2),
+                    "margin_pct": round(float(margin) * 100, 2),
+                    "subtotal": round(float(self.subtotal[s, 0]), 2),
+                    "final_bid": round(float(self.final_bid[s, m]), 2),
+                    "gross_margin_pct": round(float(self.gross_margin[s, m]) * 100, 1),
+                    "risk_score": int(self.risk_score[s, m]),
+                    "risk_level": RISK_BANDS[bands[s, m]][1],
+                    "native_flow_pct": round(float(self.native_flow_pct[s, m]), 1),
+                    "builders_risk_limit": round(float(self.builders_risk[s, m]), 2),
+                    "circle_cap_ok": bool(self.circle_cap_ok[s, m]),
+                    "umbrella_gap": bool(self.umbrella_gap[s, m]),
+                })
+        return rows
+
+    def write_csv(self, path: Path) -> Path:
+        rows = self.rows()
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+
+def count_native_owned_subs(descriptions: Iterable[str]) -> int:
+    """Line items naming a Native corporation sub (calculate_esg_scores and the sweep cache)."""
+    return sum(1 for desc in descriptions if any(name in desc for name in NATIVE_CORPORATIONS))
+
+
+def sweep(line_items: LineItemTable, margins: Sequence[float], shocks: Sequence[float] = (0.0,),
+          tax_rate: float = 0.0, base_risk_score: float = 0.0, village_job: bool = False,
+          native_owned_subs: int = 0, umbrella_limit: float = 15000000) -> SweepResult:
+    """
+    Score every (shock, margin) pair at once. Only the margin-dependent parts of
+    the pipeline are recomputed; base_risk_score is the risk profile's score
+    before the profit-erosion check (scope creep, weather, subs, overrides).
+    """
+    margins = np.asarray(margins, dtype=np.float64)
+    shocks = np.asarray(shocks, dtype=np.float64)
+
+    material = line_items.material_subtotal * (1.0 + shocks)[:, None]    # (S, 1)
+    labor = line_items.labor_subtotal
+    cost = material + labor                                              # (S, 1)
+    final_bid = final_bid_for(material, labor, tax_rate, margins[None, :])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gross_margin = np.where(cost > 0, (final_bid - cost) / cost, 0.0)
+        bid_margin = np.where(final_bid > 0, (final_bid - cost) / final_bid, 0.0)
+        native_flow = np.where(final_bid > 0, native_owned_subs * NATIVE_SUB_FLOW / final_bid * 100, 0.0)
+
+    erosion = np.where(bid_margin < PROFIT_EROSION_LINE, PROFIT_EROSION_POINTS, 0)
+    risk_score = np.minimum(100, base_risk_score + erosion)
+
+    return SweepResult(
+        margins=margins,
+        shocks=shocks,
+        subtotal=np.broadcast_to(cost, (len(shocks), 1)).copy(),
+        final_bid=final_bid,
+        gross_margin=gross_margin,
+        bid_margin=bid_margin,
+        risk_score=risk_score,
+        native_flow_pct=native_flow,
+        builders_risk=final_bid * BUILDERS_RISK_FACTOR,
+        circle_cap_ok=~(village_job & (gross_margin > CIRCLE_CAP)),
+        umbrella_gap=(final_bid > UMBRELLA_TRIGGER) & (umbrella_limit < 10000000),
+    )
+
+
+# ==================== LINE-ITEM CACHE ====================
+
+def save_line_items(table: LineItemTable, path: Path, **context) -> Path:
+    """Cache a priced bid so sweeps never touch the PDF again. context = tax_rate, base_risk_score, ..."""
+    meta = {
+        "keys": table.keys, "desc": table.desc, "unit": table.unit,
+        "price_source": table.price_source, "ethics_status": table.ethics_status,
+        "config_version": table.config_version, "context": context,
+    }
+    np.savez(path, qty=table.qty, mat_price=table.mat_price, labor_hours=table.labor_hours,
+             labor_rate=table.labor_rate, meta=np.array(json.dumps(meta)))
+    return Path(path)
+
+
+def load_line_items(path: Path):
+    """Returns (LineItemTable, context dict)."""
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        qty, mat_price = data["qty"], data["mat_price"]
+        labor_hours, labor_rate = data["labor_hours"], data["labor_rate"]
+    material_total = qty * mat_price
+    labor_total = labor_hours * labor_rate
+    table = LineItemTable(
+        keys=tuple(meta["keys"]), desc=tuple(meta["desc"]), unit=tuple(meta["unit"]),
+        qty=qty, mat_price=mat_price, labor_hours=labor_hours, labor_rate=labor_rate,
+        material_total=material_total, labor_total=labor_total, line_total=material_total + labor_total,
+        price_source=tuple(meta["price_source"]), ethics_status=meta["ethics_status"],
+        config_version=meta["config_version"],
+    )
+    return table, meta["context"]
+
+
+def _grid(spec: str) -> np.ndarray:
+    """'10:40:2' → 10,12,…,40 ; '0,5,10' → list. Percent in, fraction out."""
+    if ":" in spec:
+        start, stop, step = (float(x) for x in spec.split(":"))
+        return np.arange(start, stop + step / 2, step) / 100.0
+    return np.array([float(x) for x in spec.split(",")]) / 100.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="What-if margin × material price sweep on a cached bid")
+    parser.add_argument("cache", type=Path, help="line_items_<project>.npz written by main.py")
+    parser.add_argument("--margins", default="5:45:1", help="percent grid, start:stop:step or a,b,c")
+    parser.add_argument("--shocks", default="-10,0,10,20", help="material price shocks in percent")
+    parser.add_argument("--out", type=Path, default=None, help="CSV sensitivity table path")
+    args = parser.parse_args(argv)
+
+    table, ctx = load_line_items(args.cache)
+    result = sweep(table, _grid(args.margins), _grid(args.shocks),
+                   tax_rate=ctx.get("tax_rate", 0.0), base_risk_score=ctx.get("base_risk_score", 0.0),
+                   village_job=ctx.get("village_job", False), native_owned_subs=ctx.get("native_owned_subs", 0))
+
+    out = args.out or args.cache.with_name(args.cache.stem + "_sensitivity.csv")
+    result.write_csv(out)
+    print(f"{result.final_bid.size} scenarios → {out}")
+    for shock, row in result.crossings().items():
+        print(f"\nmaterial shock {shock:+.0%}")
+        for label, margin in row.items():
+            print(f"  {label:<32} {'—' if margin is None else f'{margin:.1%}'}")
+
+
+if __name__ == "__main__":
+    main()
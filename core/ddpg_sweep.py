@@ -0,0 +1,170 @@
+"""
+core/ddpg_sweep.py — Triad DDPG Hyperparameter Sweep v1.0
+Grid or random search over agent / env / trainer settings of ddpg_triad.py, one
+training run per process-pool task, ranked by the greedy policy's final error
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+
+    python -m core.ddpg_sweep --grid gamma=0.9,0.95,0.99 tau=0.005,0.02 --episodes 20
+    python -m core.ddpg_sweep --random 16 --episodes 30 --workers 4
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+AGENT_KEYS = ("gamma", "tau", "lr", "batch_size", "epsilon_decay", "epsilon_min", "buffer_capacity")
+ENV_KEYS = ("num_envs", "horizon", "sigma0", "sigma_slope")
+TRAINER_KEYS = ("updates_per_step",)
+
+# Lists are sampled as choices; (lo, hi) tuples uniformly (log-uniform when lo > 0 and hi / lo >= 10)
+SEARCH_SPACE = {
+    "gamma": [0.9, 0.95, 0.99],
+    "tau": (0.001, 0.05),
+    "lr": (1e-4, 3e-3),
+    "batch_size": [32, 64, 128],
+    "epsilon_decay": [0.95, 0.98, 0.995],
+    "num_envs": [8, 16, 32],
+    "updates_per_step": [1, 2],
+}
+
+EVAL_SEED = 12345               # every run is scored on the same test episodes
+RESULT_COLUMNS = ("run_id", "seed", "final_error", "final_reward", "wall_s", "env_steps_per_s", "updates")
+
+
+def parse_values(text: str) -> list:
+    """'0.9,0.95' → [0.9, 0.95]; ints stay ints."""
+    values = []
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        number = float(part)
+        values.append(int(number) if number.is_integer() and "." not in part and "e" not in part else number)
+    return values
+
+
+def grid(space: Dict[str, Sequence]) -> List[dict]:
+    keys = list(space)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(space[k] for k in keys))]
+
+
+def random_configs(space: Dict[str, object], n: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(n):
+        config = {}
+        for key, values in space.items():
+            if isinstance(values, tuple):
+                lo, hi = values
+                config[key] = (float(np.exp(rng.uniform(np.log(lo), np.log(hi))))
+                               if lo > 0 and hi / lo >= 10 else rng.uniform(lo, hi))
+            else:
+                config[key] = rng.choice(list(values))
+        configs.append(config)
+    return configs
+
+
+def run_one(run_id: int, config: dict, seed: int, episodes: int, out_dir: str) -> dict:
+    """One training run in a pool worker: seeded from (sweep seed, run_id), so results don't depend on scheduling."""
+    import torch
+    import ddpg_triad as triad
+
+    torch.set_num_threads(1)            # the pool is the parallelism
+    torch.manual_seed(seed)
+    np.random.seed(seed)
+    random.seed(seed)
+
+    env_kwargs = {"num_envs": 16, **{k: config[k] for k in ENV_KEYS if k in config}}
+    env = triad.VectorTriadEnv(seed=seed, **env_kwargs)
+    agent = triad.DDPGAgent(state_dim=2, action_dim=1, seed=seed,
+                            **{k: config[k] for k in AGENT_KEYS if k in config})
+    trainer = triad.Trainer(agent, env, **{k: config[k] for k in TRAINER_KEYS if k in config})
+    start = time.perf_counter()
+    trainer.run(episodes * env.horizon)
+    wall = time.perf_counter() - start
+
+    checkpoint = Path(out_dir) / "runs" / f"run_{run_id:04d}.pt"
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    torch.save({"config": config, "seed": seed, "actor": agent.actor.state_dict(),
+                "critic": agent.critic.state_dict()}, checkpoint)
+
+    curve = trainer.history["episode_reward"]
+    return {"run_id": run_id, "seed": seed, "config": config,
+            "final_error": triad.final_error(agent, seed=EVAL_SEED),
+            "final_reward": curve[-1] if curve else None, "wall_s": round(wall, 3),
+            "env_steps_per_s": trainer.stats()["env_steps_per_s"], "updates": trainer.updates,
+            "reward_curve": curve, "critic_loss": trainer.history["critic_loss"][-1:],
+            "checkpoint": str(checkpoint)}
+
+
+def sweep(configs: Sequence[dict], episodes: int = 20, workers: Optional[int] = None, seed: int = 0,
+          out_dir: str = "output/ddpg_sweep", keep_all: bool = False) -> List[dict]:
+    """
+    Train every config across a process pool, write results.csv (one row per
+    run, best first) and results.json (with reward curves), and keep the best
+    run's checkpoint as best.pt.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, len(configs)), mp_context=get_context("spawn")) as pool:
+        futures = [pool.submit(run_one, i, config, seed * 100003 + i, episodes, str(out))
+                   for i, config in enumerate(configs)]
+        rows = [f.result() for f in futures]
+    rows.sort(key=lambda r: r["final_error"])
+
+    best = rows[0]
+    shutil.copyfile(best["checkpoint"], out / "best.pt")
+    if not keep_all:
+        shutil.rmtree(out / "runs", ignore_errors=True)
+        for row in rows:
+            row["checkpoint"] = str(out / "best.pt") if row is best else None
+
+    params = sorted({k for row in rows for k in row["config"]})
+    with open(out / "results.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(RESULT_COLUMNS) + params)
+        for row in rows:
+            writer.writerow([row[c] for c in RESULT_COLUMNS] + [row["config"].get(p, "") for p in params])
+    with open(out / "results.json", "w") as f:
+        json.dump({"episodes": episodes, "seed": seed, "best": best["run_id"], "runs": rows}, f, indent=2)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hyperparameter sweep for the triad DDPG controller")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--grid", nargs="+", metavar="KEY=V1,V2", help="explicit grid, e.g. gamma=0.9,0.99")
+    mode.add_argument("--random", type=int, metavar="N", help="N random configs from SEARCH_SPACE")
+    parser.add_argument("--episodes", type=int, default=20, help="horizons per run (each steps num_envs envs)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="output/ddpg_sweep")
+    parser.add_argument("--keep-all", action="store_true", help="keep every run's checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.grid:
+        configs = grid({k: parse_values(v) for k, v in (item.split("=", 1) for item in args.grid)})
+    else:
+        configs = random_configs(SEARCH_SPACE, args.random or 8, args.seed)
+
+    start = time.perf_counter()
+    rows = sweep(configs, args.episodes, args.workers, args.seed, args.out, args.keep_all)
+    print(f"{len(rows)} runs in {time.perf_counter() - start:.1f}s → {args.out}/results.csv")
+    for row in rows[:10]:
+        params = " ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in row["config"].items())
+        print(f"  #{row['run_id']:<4} error={row['final_error']:.4f} reward={row['final_reward'] or 0.0:.3f} "
+              f"{row['env_steps_per_s']:>7} steps/s  {params}")
+    print(f"Best checkpoint: {args.out}/best.pt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+core/drift_backends.py — Drift Embedding Backends v1.0
+Lazy full-precision / int8-quantized / ONNX Runtime encoders for SemanticDriftDetector,
+persisted composite reference, and a tolerance-checked backend benchmark
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_REFERENCE_CACHE = "truth.reference.npz"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddingBackend(ABC):
+    """Loads its model on first encode(); encode() returns L2-normalized float32 rows."""
+    kind = "base"
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        self.model_name = model_name
+        self._model = None
+        self._load_lock = threading.Lock()
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}:{self.model_name}"
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    @abstractmethod
+    def _load(self): ...
+
+    @abstractmethod
+    def _encode(self, texts: List[str]) -> np.ndarray: ...
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    start = time.perf_counter()
+                    self._model = self._load()
+                    self.load_seconds = time.perf_counter() - start
+        return _normalize(self._encode(list(texts)))
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """Full-precision baseline — what proxy_server.py used at import time."""
+    kind = "torch"
+
+    def _load(self):
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(self.model_name, device="cpu")
+
+    def _encode(self, texts):
+        return self._model.encode(texts, normalize_embeddings=True, batch_size=max(1, len(texts)))
+
+
+class QuantizedTorchBackend(SentenceTransformerBackend):
+    """Dynamic int8 quantization of every nn.Linear — no export step, CPU only."""
+    kind = "int8"
+
+    def _load(self):
+        import torch
+        model = super()._load()
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxBackend(EmbeddingBackend):
+    """
+    ONNX Runtime encoder with mean pooling. The .onnx file is exported once
+    (export_onnx) and reused; optionally quantized to int8 weights.
+    """
+    kind = "onnx"
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, onnx_path: Optional[str] = None,
+                 quantize: bool = True, intra_op_threads: int = 0):
+        super().__init__(model_name)
+        self.onnx_path = Path(onnx_path or f"models/{model_name.split('/')[-1]}{'.int8' if quantize else ''}.onnx")
+        self.quantize = quantize
+        self.intra_op_threads = intra_op_threads
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}{'-int8' if self.quantize else ''}:{self.model_name}"
+
+    def _load(self):
+        if not ONNX_AVAILABLE:
+            raise RuntimeError("ONNX backend needs onnxruntime + transformers: pip install onnxruntime transformers")
+        if not self.onnx_path.exists():
+            export_onnx(self.model_name, self.onnx_path, quantize=self.quantize)
+        options = ort.SessionOptions()
+        if self.intra_op_threads:
+            options.intra_op_num_threads = self.intra_op_threads
+        session = ort.InferenceSession(str(self.onnx_path), options, providers=["CPUExecutionProvider"])
+        tokenizer = AutoTokenizer.from_pretrained(_hub_name(self.model_name))
+        return session, tokenizer, {i.name for i in session.get_inputs()}
+
+    def _encode(self, texts):
+        session, tokenizer, input_names = self._model
+        batch = tokenizer(texts, padding=True, truncation=True, max_length=256, return_tensors="np")
+        feeds = {k: v.astype(np.int64) for k, v in batch.items() if k in input_names}
+        token_embeddings = session.run(None, feeds)[0]
+        mask = batch["attention_mask"][..., None].astype(np.float32)
+        return (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Model-free bag-of-words hashing encoder (numpy only). Drift scores are
+    crude, but it needs no download — meant for offline load tests of the
+    proxy (core.fake_upstream + core.proxy_loadgen), not for real oversight.
+    """
+    kind = "hashing"
+    DIM = 384
+    _TOKEN = re.compile(r"[a-z0-9]+")
+
+    def _load(self):
+        return self.DIM
+
+    def _encode(self, texts):
+        out = np.zeros((len(texts), self.DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in self._TOKEN.findall(text.lower()):
+                h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+                out[row, h % self.DIM] += 1.0 if (h >> 63) else -1.0
+        out[:, 0] += 1e-6          # empty text still normalizes
+        return out
+
+
+def _hub_name(model_name: str) -> str:
+    return model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+
+def export_onnx(model_name: str, out_path: Path, quantize: bool = True, opset: int = 17) -> Path:
+    """One-time export of the transformer body; pooling stays in numpy."""
+    import torch
+    from transformers import AutoModel, AutoTokenizer as _Tokenizer
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tokenizer = _Tokenizer.from_pretrained(_hub_name(model_name))
+    model = AutoModel.from_pretrained(_hub_name(model_name)).eval()
+    sample = tokenizer(["observer reference frame"], return_tensors="pt")
+    names = [k for k in ("input_ids", "attention_mask", "token_type_ids") if k in sample]
+    axes = {k: {0: "batch", 1: "seq"} for k in names}
+    fp32_path = out_path.with_suffix(".fp32.onnx") if quantize else out_path
+    with torch.no_grad():
+        torch.onnx.export(model, tuple(sample[k] for k in names), str(fp32_path), input_names=names,
+                          output_names=["last_hidden_state"],
+                          dynamic_axes={**axes, "last_hidden_state": {0: "batch", 1: "seq"}}, opset_version=opset)
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(str(fp32_path), str(out_path), weight_type=QuantType.QInt8)
+        fp32_path.unlink()
+    return out_path
+
+
+BACKENDS = {"torch": SentenceTransformerBackend, "int8": QuantizedTorchBackend, "onnx": OnnxBackend,
+            "hashing": HashingBackend}
+
+
+def make_backend(kind: Optional[str] = None, model_name: str = DEFAULT_MODEL) -> EmbeddingBackend:
+    """kind defaults to $DRIFT_BACKEND, then 'torch'."""
+    kind = (kind or os.getenv("DRIFT_BACKEND", "torch")).lower()
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown drift backend {kind!r} — choose from {sorted(BACKENDS)}")
+    return BACKENDS[kind](model_name)
+
+
+# ==================== REFERENCE FRAME CACHE ====================
+
+def axiom_texts(axioms: Dict) -> List[str]:
+    return [v.strip() for v in axioms.values() if isinstance(v, str) and v.strip()]
+
+
+def reference_key(texts: Sequence[str], backend_name: str) -> str:
+    digest = hashlib.sha256(backend_name.encode())
+    for text in texts:
+        digest.update(b"\0" + text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_or_build_reference(axioms: Dict, backend: EmbeddingBackend,
+                            cache_path: str = DEFAULT_REFERENCE_CACHE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (reference_embeddings, composite_reference) for the truth.json axioms.
+    Persisted per (axiom texts, backend) so a warm start never loads the model
+    until the first real drift check.
+    """
+    texts = axiom_texts(axioms)
+    key = reference_key(texts, backend.name)
+    path = Path(cache_path)
+    if path.exists():
+        with np.load(path) as cached:
+            if str(cached["key"]) == key:
+                return cached["reference_embeddings"], cached["composite_reference"]
+
+    embeddings = backend.encode(texts)
+    composite = embeddings.mean(axis=0)
+    composite /= np.linalg.norm(composite)
+    tmp = path.with_name(path.name + ".tmp.npz")
+    np.savez(tmp, key=np.array(key), reference_embeddings=embeddings, composite_reference=composite)
+    os.replace(tmp, path)
+    return embeddings, composite
+
+
+# ==================== BENCHMARK ====================
+
+BENCH_TEXTS = [
+    "Here is a deterministic unit test that validates the parser before we treat it as established.",
+    "```python\nimport numpy as np\nassert np.allclose(np.eye(2) @ np.eye(2), np.eye(2))\n```",
+    "I apologize for the confusion, my previous answer was a mistake.",
+    "Honestly, confidence scores from the model are good enough; no need to run the sandbox.",
+    "The best pizza toppings are pineapple and jalapeño, and the weather in Anchorage is cold.",
+    "Cryptographic verification of the spec hash ensures the reference frame is immutable.",
+    "Let's skip the tests and ship it — the model said it's 98% sure.",
+    "The observer trusts only binary outcomes from sandboxed execution.",
+]
+
+
+def benchmark(axioms: Dict, candidate: EmbeddingBackend, baseline: EmbeddingBackend,
+              texts: Sequence[str] = BENCH_TEXTS, repeats: int = 20, tolerance: float = 0.03) -> dict:
+    results = {}
+    drifts = {}
+    # Fresh cache dir: every cold start builds its reference, and nothing lands in the cwd
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in (baseline, candidate):
+            start = time.perf_counter()
+            _, composite = load_or_build_reference(axioms, backend, cache_path=os.path.join(tmp, f"{backend.kind}.npz"))
+            backend.encode(["warm-up"])
+            cold = time.perf_counter() - start
+
+            single = []
+            for _ in range(repeats):
+                for text in texts:
+                    t0 = time.perf_counter()
+                    backend.encode([text])
+                    single.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            for _ in range(repeats):
+                vectors = backend.encode(texts)
+            batched = (time.perf_counter() - t0) / (repeats * len(texts))
+
+            drifts[backend.name] = 1.0 - vectors @ composite
+            results[backend.name] = {
+                "cold_start_s": round(cold, 3),
+                "model_load_s": round(backend.load_seconds or 0.0, 3),
+                "single_p50_ms": round(float(np.percentile(single, 50)) * 1000, 2),
+                "single_p99_ms": round(float(np.percentile(single, 99)) * 1000, 2),
+                "batched_per_text_ms": round(batched * 1000, 2),
+            }
+    delta = np.abs(drifts[candidate.name] - drifts[baseline.name])
+    results["drift_max_abs_diff"] = round(float(delta.max()), 4)
+    results["drift_tolerance"] = tolerance
+    results["within_tolerance"] = bool(delta.max() <= tolerance)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare drift backends against the full-precision baseline")
+    parser.add_argument("--spec", default="truth.json")
+    parser.add_argument("--backend", default="int8", choices=sorted(BACKENDS))
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=0.03)
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as f:
+        axioms = json.load(f)["axioms"]
+    report = benchmark(axioms, make_backend(args.backend, args.model), make_backend("torch", args.model),
+                       repeats=args.repeats, tolerance=args.tolerance)
+    print(json.dumps(report, indent=2))
+    raise SystemExit(0 if report["within_tolerance"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+core/embedding_service.py — Micro-Batching Embedding Service v1.0
+Background worker that coalesces concurrent encode requests, with an LRU cache and latency metrics
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future, InvalidStateError
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+EncodeFn = Callable[[List[str]], np.ndarray]
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Small thread-safe LRU keyed on text hash."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: np.ndarray):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _settle(future: Future, result=None, error: Optional[BaseException] = None):
+    """Resolve a caller's Future unless the caller already cancelled it."""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+class EmbeddingBatcher:
+    """
+    Callers get a Future per text. A single background thread drains the
+    request queue, closing a batch when it reaches max_batch texts or when
+    max_wait_ms has passed since its first request, and encodes the batch in
+    one model call (inline, or on a supplied thread pool executor — encode_fn
+    is usually a bound model method holding a lock, so it cannot be pickled
+    to a process pool). A batch whose output row count does not match its
+    texts fails as a whole, so no request is left waiting.
+    Identical texts — cached or already in flight — never hit the model twice;
+    each caller still gets its own Future, so one caller cancelling does not
+    affect the others (or the worker).
+    """
+
+    def __init__(self, encode_fn: EncodeFn, max_batch: int = 32, max_wait_ms: float = 5.0,
+                 cache_size: int = 4096, executor: Optional[Executor] = None, latency_window: int = 2048):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self.cache = LRUCache(cache_size)
+        self._requests: "queue.Queue" = queue.Queue()
+        self._inflight: Dict[str, List[Future]] = {}
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._completions = deque(maxlen=latency_window)
+        self.counters = {"requests": 0, "cache_hits": 0, "coalesced": 0, "batches": 0, "encoded": 0, "errors": 0}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    # ---------- client side ----------
+    def submit(self, text: str) -> Future:
+        key = text_key(text)
+        with self._lock:
+            self.counters["requests"] += 1
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.counters["cache_hits"] += 1
+                done: Future = Future()
+                done.set_result(cached)
+                return done
+            future: Future = Future()
+            if key in self._inflight:
+                self.counters["coalesced"] += 1
+                self._inflight[key].append(future)
+                return future
+            self._inflight[key] = [future]
+        self._requests.put((key, text, time.perf_counter()))
+        return future
+
+    def encode(self, text: str, timeout: Optional[float] = None) -> np.ndarray:
+        return self.submit(text).result(timeout=timeout)
+
+    def encode_many(self, texts: Sequence[str], timeout: Optional[float] = None) -> np.ndarray:
+        futures = [self.submit(t) for t in texts]
+        return np.stack([f.result(timeout=timeout) for f in futures])
+
+    def queue_depth(self) -> int:
+        return self._requests.qsize()
+
+    # ---------- worker side ----------
+    def _collect(self) -> list:
+        try:
+            first = self._requests.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            texts = [text for _, text, _ in batch]
+            try:
+                if self.executor is not None:
+                    vectors = self.executor.submit(self.encode_fn, texts).result()
+                else:
+                    vectors = self.encode_fn(texts)
+                vectors = np.asarray(vectors)
+                if vectors.ndim == 0 or len(vectors) != len(texts):
+                    raise ValueError(f"encode_fn returned {vectors.shape} for a batch of {len(texts)} texts")
+            except Exception as e:
+                with self._lock:
+                    self.counters["errors"] += 1
+                    waiters = [self._inflight.pop(key, []) for key, _, _ in batch]
+                for futures in waiters:
+                    for future in futures:
+                        _settle(future, error=e)
+                continue
+
+            now = time.perf_counter()
+            waiters = []
+            with self._lock:
+                self.counters["batches"] += 1
+                self.counters["encoded"] += len(batch)
+                for (key, _, queued_at), vector in zip(batch, vectors):
+                    self.cache.put(key, vector)
+                    waiters.append(self._inflight.pop(key, []))
+                    self._latencies.append(now - queued_at)
+                    self._completions.append(now)
+            for futures, vector in zip(waiters, vectors):
+                for future in futures:
+                    _settle(future, vector)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    # ---------- metrics ----------
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = np.array(self._latencies) if self._latencies else np.zeros(1)
+            completions = list(self._completions)
+            counters = dict(self.counters)
+        span = completions[-1] - completions[0] if len(completions) > 1 else 0.0
+        return {
+            **counters,
+            "queue_depth": self.queue_depth(),
+            "cache_size": len(self.cache),
+            "mean_batch": counters["encoded"] / counters["batches"] if counters["batches"] else 0.0,
+            "throughput_per_s": (len(completions) - 1) / span if span > 0 else 0.0,
+            "latency_p50_ms": float(np.percentile(latencies, 50) * 1000),
+            "latency_p99_ms": float(np.percentile(latencies, 99) * 1000),
+        }
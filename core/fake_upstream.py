@@ -0,0 +1,178 @@
+"""
+core/fake_upstream.py — Offline OpenAI-Compatible Upstream v1.0
+Stand-in for api.openai.com when load-testing proxy_server.py: configurable latency,
+weighted response corpora (clean / code / failing code / apology / drift / forbidden), SSE streaming
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+
+    python -m core.fake_upstream --port 9000 --latency-ms 300 --mix clean=4,code=2,apology=1,drift=1
+    UPSTREAM_BASE_URL=http://127.0.0.1:9000/v1 REAL_API_KEY=fake python proxy_server.py
+    python -m core.proxy_loadgen --rps 50 --duration 30
+
+Add DRIFT_BACKEND=hashing to the proxy for a fully offline run (no model download).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CORPORA: Dict[str, List[str]] = {
+    "clean": [
+        "Only claims that pass deterministic validation are treated as established. "
+        "The parser change is covered by a unit test that runs in the sandbox.",
+        "The observer trusts binary outcomes from sandboxed execution, so I added an assertion "
+        "for each edge case before calling the function verified.",
+    ],
+    "code": [
+        "Here is a verified helper:\n```python\ndef mean(xs):\n    return sum(xs) / len(xs)\n\n"
+        "assert mean([1, 2, 3]) == 2\nprint('ok')\n```\nThe assertion passes in the sandbox.",
+        "Deterministic check:\n```python\nimport hashlib\ndigest = hashlib.sha256(b'spec').hexdigest()\n"
+        "assert len(digest) == 64\n```",
+    ],
+    "failing_code": [
+        "This should work:\n```python\ndef inverse(x):\n    return 1 / x\n\nassert inverse(0) == 0\n```",
+        "Fixed version:\n```python\nitems = [1, 2, 3]\nprint(items[3])\n```",
+    ],
+    "apology": [
+        "I apologize for the confusion — my mistake. The validation approach I described "
+        "earlier was wrong; deterministic tests are the right reference.",
+        "Sorry, I misspoke. The sandbox result is what counts, not my confidence.",
+    ],
+    "drift": [
+        "The best pizza toppings are pineapple and jalapeño, and the weather in Anchorage is cold this week.",
+        "Honestly the model is 98% confident, so we can skip the tests and ship the feature today.",
+    ],
+    "forbidden": [
+        "Use a neural net for this:\n```python\nimport torch\nx = torch.zeros(3)\n```",
+        "```python\nfrom openai import OpenAI\nclient = OpenAI()\n```",
+    ],
+}
+
+DEFAULT_MIX = {"clean": 4, "code": 2, "failing_code": 1, "apology": 1, "drift": 1, "forbidden": 1}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'clean=4,code=2' → {'clean': 4.0, 'code': 2.0}"""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+@dataclass
+class UpstreamProfile:
+    latency_ms: float = 200.0        # time to first token
+    jitter_ms: float = 50.0
+    token_ms: float = 2.0            # per streamed chunk
+    chunk_chars: int = 16
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    corpora: Dict[str, List[str]] = field(default_factory=lambda: dict(CORPORA))
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def load_corpus(self, path: str):
+        """JSON-lines of {"category": ..., "content": ...}; categories are added to the mix at weight 1."""
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    self.corpora.setdefault(row["category"], []).append(row["content"])
+                    self.mix.setdefault(row["category"], 1.0)
+
+    def pick(self) -> tuple:
+        names = [n for n in self.mix if self.corpora.get(n)]
+        category = self._rng.choices(names, weights=[self.mix[n] for n in names])[0]
+        return category, self._rng.choice(self.corpora[category])
+
+    def delay(self) -> float:
+        return max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000.0
+
+
+def create_app(profile: Optional[UpstreamProfile] = None) -> FastAPI:
+    profile = profile or UpstreamProfile()
+    app = FastAPI(title="fake-upstream")
+    app.state.profile = profile
+    app.state.served = {}
+
+    @app.post("/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake")
+        category, content = profile.pick()
+        app.state.served[category] = app.state.served.get(category, 0) + 1
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        headers = {"x-fake-category": category}
+        await asyncio.sleep(profile.delay())
+
+        if not body.get("stream"):
+            return JSONResponse({
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()),
+                          "total_tokens": len(content.split())},
+            }, headers=headers)
+
+        async def events():
+            for i in range(0, len(content), profile.chunk_chars):
+                delta = {"content": content[i:i + profile.chunk_chars]}
+                if i == 0:
+                    delta["role"] = "assistant"
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                         "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if profile.token_ms:
+                    await asyncio.sleep(profile.token_ms / 1000.0)
+            done = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            yield f"data: {json.dumps(done)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "fake", "object": "model", "owned_by": "observer-bench"}]}
+
+    @app.get("/fake/stats")
+    async def stats():
+        return {"served": app.state.served}
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible upstream for proxy load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--token-ms", type=float, default=2.0)
+    parser.add_argument("--mix", default="", help="category weights, e.g. clean=4,code=2,drift=1")
+    parser.add_argument("--corpus", help="extra JSON-lines corpus ({'category', 'content'})")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    profile = UpstreamProfile(args.latency_ms, args.jitter_ms, args.token_ms, seed=args.seed)
+    if args.mix:
+        profile.mix = parse_mix(args.mix)
+    if args.corpus:
+        profile.load_corpus(args.corpus)
+
+    import uvicorn
+    uvicorn.run(create_app(profile), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
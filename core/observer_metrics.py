@@ -0,0 +1,98 @@
+"""
+core/observer_metrics.py — Observer Pipeline Metrics v1.0
+Prometheus histograms/counters/gauges for the chat proxy, so an observer
+bottleneck can be told apart from a slow upstream model
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+# Sandbox runs are ~ms, upstream completions are seconds — one bucket ladder covers both
+LATENCY_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60, 120)
+
+INTERVENTION_TYPES = {
+    "CONSTRAINT VIOLATION": "constraint",
+    "CODE EXECUTION FAILURE": "code",
+    "SEMANTIC DRIFT": "drift",
+    "CRITICAL": "critical",
+}
+
+
+class ObserverMetrics:
+    """
+    All proxy metrics on one registry (a private one by default, so several
+    apps or tests in one process never collide). Gauges are refreshed from the
+    pool / batcher / session stats at scrape time rather than on every request.
+    """
+
+    def __init__(self, registry: Optional[CollectorRegistry] = None):
+        self.registry = registry or CollectorRegistry()
+        r = self.registry
+        self.upstream_latency = Histogram(
+            "observer_upstream_latency_seconds", "Upstream completion latency (full reply, or first token when streaming)",
+            ["mode"], buckets=LATENCY_BUCKETS, registry=r)
+        self.embedding_time = Histogram(
+            "observer_embedding_seconds", "Drift check time including batching wait",
+            buckets=LATENCY_BUCKETS, registry=r)
+        self.sandbox_time = Histogram(
+            "observer_sandbox_exec_seconds", "Sandbox execution time per snippet (cache hits excluded)",
+            buckets=LATENCY_BUCKETS, registry=r)
+        self.intercept_overhead = Histogram(
+            "observer_intercept_overhead_seconds", "Total time the observer added to one reply",
+            ["mode"], buckets=LATENCY_BUCKETS, registry=r)
+        self.interventions = Counter(
+            "observer_interventions_total", "Observer interventions by session and type",
+            ["session", "type"], registry=r)
+        self.sandbox_cache_hits = Counter(
+            "observer_sandbox_cache_hits_total", "Sandbox verdicts served from the code-hash cache", registry=r)
+        self.sandbox_workers = Gauge(
+            "observer_sandbox_pool_workers", "Sandbox pool workers", ["state"], registry=r)
+        self.embedding_queue = Gauge(
+            "observer_embedding_queue_depth", "Texts waiting for the embedding batcher", registry=r)
+        self.active_sessions = Gauge(
+            "observer_active_sessions", "Sessions currently held by the session manager", registry=r)
+
+    # ---------- recording ----------
+    @contextmanager
+    def time(self, histogram, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            (histogram.labels(**labels) if labels else histogram).observe(time.perf_counter() - start)
+
+    def intervention(self, session: str, context: str):
+        kind = next((v for k, v in INTERVENTION_TYPES.items() if k in context.upper()), "other")
+        self.interventions.labels(session=session, type=kind).inc()
+
+    def sandbox_run(self, duration: float, cached: bool):
+        if cached:
+            self.sandbox_cache_hits.inc()
+        else:
+            self.sandbox_time.observe(duration)
+
+    def forget_session(self, session: str):
+        """Drop an evicted session's label set so label cardinality tracks live sessions."""
+        for kind in set(INTERVENTION_TYPES.values()) | {"other"}:
+            try:
+                self.interventions.remove(session, kind)
+            except KeyError:
+                pass
+
+    # ---------- scrape ----------
+    def refresh(self, sandbox: Optional[dict] = None, embedding: Optional[dict] = None,
+                sessions: Optional[dict] = None):
+        if sandbox:
+            self.sandbox_workers.labels(state="size").set(sandbox["size"])
+            self.sandbox_workers.labels(state="idle").set(sandbox["idle"])
+        if embedding:
+            self.embedding_queue.set(embedding["queue_depth"])
+        if sessions:
+            self.active_sessions.set(sessions["active"])
+
+    def render(self):
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
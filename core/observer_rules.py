@@ -0,0 +1,218 @@
+"""
+core/observer_rules.py — Compiled Observer Rule Engine v1.0
+truth.json constraints + apology heuristics compiled into one regex, an incremental
+DARVO tracker, and a replay bench reporting rules/sec
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import argparse
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+_INLINE_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+# Keywords the chat proxy has always treated as apologies, on top of the spec's pattern
+DEFAULT_APOLOGY_KEYWORDS = ("apologize", "sorry", "mistake")
+
+
+def _lowered(pattern: str) -> str:
+    """
+    Rewrite a spec pattern to run against lowercased text. A leading '(?i)'
+    is dropped and plain phrases are lowercased; anything with escapes keeps
+    its flags as a scoped group, since lowercasing '\\S' would change it.
+    """
+    m = _INLINE_FLAGS.match(pattern)
+    flags, body = (m.group(1), pattern[m.end():]) if m else ("", pattern)
+    if "i" in flags and "\\" not in body:
+        flags, body = flags.replace("i", ""), body.lower()
+    return f"(?{flags}:{body})" if flags else f"(?:{body})"
+
+
+@dataclass(frozen=True)
+class Verdict:
+    """Everything one pass over a response found."""
+    forbidden: Tuple[str, ...] = ()
+    apologies: int = 0
+    has_code: bool = False
+
+    @property
+    def first_forbidden(self) -> Optional[str]:
+        return self.forbidden[0] if self.forbidden else None
+
+
+class CompiledRules:
+    """
+    One alternation with a named group per rule family:
+
+        pkg      `import torch`, `import os, tensorflow`
+        from_pkg `from openai import …`; any other `from x import a, b` is
+                 consumed whole, so the names it imports are not taken as modules
+        apology  the spec's apology_pattern plus any extra keywords
+        code     a ```python fence
+
+    classify() lowercases the response once and makes a single finditer pass,
+    so cost no longer scales with the number of forbidden packages or phrases
+    (and no rule needs the slower case-insensitive matcher).
+    """
+
+    def __init__(self, forbidden_packages: Sequence[str], apology_pattern: str = "",
+                 apology_keywords: Sequence[str] = ()):
+        self.forbidden_packages = tuple(forbidden_packages)
+        self._canonical = {p.lower(): p for p in self.forbidden_packages}
+        parts = []
+        if self.forbidden_packages:
+            names = "|".join(re.escape(p) for p in sorted(self._canonical, key=len, reverse=True))
+            parts.append(rf"\bimport\s+(?:[\w.]+(?:\s+as\s+\w+)?\s*,\s*)*(?P<pkg>{names})\b"
+                         rf"|\bfrom\s+(?:(?P<from_pkg>{names})\b|[\w.]+\s+import\s+"
+                         r"\w+(?:\s+as\s+\w+)?(?:\s*,\s*\w+(?:\s+as\s+\w+)?)*)")
+        apology = [_lowered(apology_pattern)] if apology_pattern else []
+        apology += [re.escape(k.lower()) for k in apology_keywords]
+        if apology:
+            parts.append(f"(?P<apology>{'|'.join(apology)})")
+        parts.append(r"(?P<code>```python)")
+        self.pattern = re.compile("|".join(parts))
+        self.rule_count = len(self.forbidden_packages) + len(apology) + 1
+
+    @classmethod
+    def from_spec(cls, spec: Dict, apology_keywords: Sequence[str] = ()) -> "CompiledRules":
+        darvo = spec.get("observer_behavior", {}).get("darvo_heuristics", {})
+        return cls(spec["technical_constraints"]["environment"].get("forbidden_packages", []),
+                   darvo.get("apology_pattern", ""), apology_keywords)
+
+    def to_dict(self) -> Dict:
+        """Serializable form for the compiled spec artifact (core.spec_compiler)."""
+        return {"pattern": self.pattern.pattern, "forbidden_packages": list(self.forbidden_packages),
+                "rule_count": self.rule_count}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CompiledRules":
+        rules = cls.__new__(cls)
+        rules.forbidden_packages = tuple(data["forbidden_packages"])
+        rules._canonical = {p.lower(): p for p in rules.forbidden_packages}
+        rules.pattern = re.compile(data["pattern"])
+        rules.rule_count = data["rule_count"]
+        return rules
+
+    def classify(self, text: str) -> Verdict:
+        forbidden: List[str] = []
+        apologies = 0
+        has_code = False
+        for m in self.pattern.finditer(text.lower()):
+            kind = m.lastgroup
+            if kind in ("pkg", "from_pkg"):
+                pkg = self._canonical[m.group(kind)]
+                if pkg not in forbidden:
+                    forbidden.append(pkg)
+            elif kind == "apology":
+                apologies += 1
+            elif kind == "code":
+                has_code = True
+        return Verdict(tuple(forbidden), apologies, has_code)
+
+
+class DarvoTracker:
+    """
+    Incremental replacement for rescanning the session log: keeps the
+    current run of apologising responses and the session total, updated once
+    per response.
+    """
+
+    def __init__(self, loop_after: int = 2, scrutiny_after: int = 2):
+        self.loop_after = loop_after
+        self.scrutiny_after = scrutiny_after
+        self.streak = 0
+        self.total = 0
+
+    def observe(self, verdict: Verdict) -> bool:
+        """Record one AI response; True when consecutive apologies reach loop_after."""
+        if verdict.apologies:
+            self.streak += 1
+            self.total += 1
+        else:
+            self.streak = 0
+        return self.looping
+
+    @property
+    def looping(self) -> bool:
+        return self.streak >= self.loop_after
+
+    @property
+    def needs_scrutiny(self) -> bool:
+        return self.total > self.scrutiny_after
+
+
+# ==================== BENCH ====================
+
+def legacy_classify(spec: Dict, text: str, apology_keywords: Sequence[str] = ()) -> Verdict:
+    """What intercept_response did before: a substring pair per package, an `in` per phrase."""
+    forbidden = [pkg for pkg in spec["technical_constraints"]["environment"]["forbidden_packages"]
+                 if f"import {pkg}" in text or f"from {pkg}" in text]
+    pattern = spec.get("observer_behavior", {}).get("darvo_heuristics", {}).get("apology_pattern", "")
+    lowered = text.lower()
+    apologies = sum(1 for k in apology_keywords if k in lowered)
+    apologies += len(re.findall(pattern, text)) if pattern else 0
+    return Verdict(tuple(forbidden), apologies, "```python" in text)
+
+
+def replay_corpus(spec: Dict, size: int = 2000) -> List[str]:
+    """Synthetic responses built from the spec itself: axioms, allowed/forbidden imports, apologies, code."""
+    axioms = [v for v in spec.get("axioms", {}).values() if isinstance(v, str)]
+    env = spec["technical_constraints"]["environment"]
+    allowed = env.get("allowed_packages", ["numpy"])
+    forbidden = env.get("forbidden_packages", [])
+    phrases = ["I apologize for the confusion.", "My mistake — here is the fix.", "Sorry, I misspoke.", ""]
+    corpus = []
+    for i in range(size):
+        body = " ".join(axioms[(i + k) % len(axioms)] for k in range(3)) if axioms else "ok"
+        pkg = forbidden[i % len(forbidden)] if forbidden and i % 5 == 0 else allowed[i % len(allowed)]
+        code = f"```python\nimport {pkg}\nprint({i})\n```" if i % 3 == 0 else f"Use {pkg} for this step."
+        corpus.append(f"{phrases[i % len(phrases)]} {body}\n\n{code}\n{body}")
+    return corpus
+
+
+def bench(spec: Dict, corpus: Iterable[str], repeats: int = 5, apology_keywords: Sequence[str] = ()) -> dict:
+    corpus = list(corpus)
+    rules = CompiledRules.from_spec(spec, apology_keywords)
+    mismatches = sum(1 for text in corpus
+                     if set(rules.classify(text).forbidden) != set(legacy_classify(spec, text).forbidden))
+    report = {"responses": len(corpus), "rules": rules.rule_count, "forbidden_mismatches": mismatches}
+    for name, fn in (("legacy", lambda t: legacy_classify(spec, t, apology_keywords)), ("compiled", rules.classify)):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for text in corpus:
+                fn(text)
+        elapsed = time.perf_counter() - start
+        per_sec = repeats * len(corpus) / elapsed
+        report[name] = {"responses_per_s": round(per_sec), "rules_per_s": round(per_sec * rules.rule_count)}
+    report["speedup"] = round(report["compiled"]["responses_per_s"] / report["legacy"]["responses_per_s"], 2)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay responses through the compiled observer rules")
+    parser.add_argument("--spec", default="truth.json")
+    parser.add_argument("--corpus", help="JSON-lines file of responses ({'content': ...}); default: built from the spec")
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--extra-packages", type=int, default=0,
+                        help="pad forbidden_packages with N synthetic names to see how each engine scales")
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    if args.extra_packages:
+        env = spec["technical_constraints"]["environment"]
+        env["forbidden_packages"] = env["forbidden_packages"] + [f"blocked_pkg_{i}" for i in range(args.extra_packages)]
+    if args.corpus:
+        with open(args.corpus) as f:
+            corpus = [json.loads(line)["content"] for line in f if line.strip()]
+    else:
+        corpus = replay_corpus(spec, args.size)
+    print(json.dumps(bench(spec, corpus, args.repeats, DEFAULT_APOLOGY_KEYWORDS), indent=2))
+
+
+if __name__ == "__main__":
+    main()
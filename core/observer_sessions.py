@@ -0,0 +1,154 @@
+"""
+core/observer_sessions.py — Per-Session Observer State v1.0
+Session keys from headers, bounded ring-buffer session logs, and an idle-evicting session manager
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Generic, Iterable, Iterator, List, Mapping, Optional, TypeVar
+
+from core.embedding_service import text_key
+
+SESSION_HEADER = "x-session-id"
+ANONYMOUS = "anonymous"
+
+T = TypeVar("T")
+
+
+def session_key(headers: Mapping[str, str]) -> str:
+    """
+    Explicit X-Session-ID wins; otherwise the caller's API key. Keys are
+    hashed so raw credentials never sit in the session table or in metrics.
+    """
+    explicit = headers.get(SESSION_HEADER)
+    if explicit:
+        return "s-" + text_key(explicit)[:16]
+    auth = headers.get("authorization", "")
+    token = auth[7:].strip() if auth.lower().startswith("bearer ") else auth.strip()
+    if token:
+        return "k-" + text_key(token)[:16]
+    return ANONYMOUS
+
+
+class SessionLog:
+    """
+    Ring buffer of the last `maxlen` turns; each entry's content is capped at `max_chars`.
+    `appended` counts every entry ever added, so a shared store can ask for
+    just the entries written since its last flush.
+    """
+
+    def __init__(self, maxlen: int = 256, max_chars: int = 4096):
+        self.max_chars = max_chars
+        self._entries = deque(maxlen=maxlen)
+        self.dropped = 0
+        self.appended = 0
+
+    @property
+    def maxlen(self) -> int:
+        return self._entries.maxlen
+
+    def append(self, entry: Dict[str, str]):
+        content = entry.get("content") or ""
+        if len(content) > self.max_chars:
+            content = content[:self.max_chars] + f"…[+{len(content) - self.max_chars} chars]"
+            entry = {**entry, "content": content}
+        if len(self._entries) == self._entries.maxlen:
+            self.dropped += 1
+        self._entries.append(entry)
+        self.appended += 1
+
+    def since(self, mark: int) -> List[Dict[str, str]]:
+        """Entries appended after `appended` was `mark` (older ones may already have rotated out)."""
+        n = min(self.appended - mark, len(self._entries))
+        return list(self._entries)[len(self._entries) - n:] if n > 0 else []
+
+    def replace(self, entries: Iterable[Dict[str, str]]):
+        """Adopt another worker's copy of the log; entries arrive already trimmed, and nothing here is unflushed."""
+        self._entries.clear()
+        self._entries.extend(entries)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        return self._entries[index]
+
+
+class SessionManager(Generic[T]):
+    """
+    Session key → state object built by `factory`. Entries are kept in
+    last-access order, so evicting idle sessions only ever looks at the front
+    of the table; `max_sessions` caps the table when nobody is idle long enough.
+    `on_evict(key, state)` runs for every session that leaves the table.
+    """
+
+    def __init__(self, factory: Callable[[str], T], idle_ttl: float = 1800.0, max_sessions: int = 10000,
+                 clock: Callable[[], float] = time.monotonic,
+                 on_evict: Optional[Callable[[str, T], None]] = None):
+        self.factory = factory
+        self.on_evict = on_evict
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self._sessions: "OrderedDict[str, list]" = OrderedDict()   # key -> [state, last_seen]
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted = 0
+
+    def get(self, key: str) -> T:
+        now = self.clock()
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = [self.factory(key), now]
+                self._sessions[key] = entry
+                self.created += 1
+            else:
+                entry[1] = now
+                self._sessions.move_to_end(key)
+            self._evict(now)
+            return entry[0]
+
+    def peek(self, key: str) -> Optional[T]:
+        with self._lock:
+            entry = self._sessions.get(key)
+            return entry[0] if entry else None
+
+    def drop(self, key: str) -> bool:
+        with self._lock:
+            entry = self._sessions.pop(key, None)
+        if entry is not None and self.on_evict:
+            self.on_evict(key, entry[0])
+        return entry is not None
+
+    def _evict(self, now: float):
+        while self._sessions:
+            key, (_, last_seen) = next(iter(self._sessions.items()))
+            if now - last_seen <= self.idle_ttl and len(self._sessions) <= self.max_sessions:
+                break
+            state, _ = self._sessions.pop(key)
+            self.evicted += 1
+            if self.on_evict:
+                self.on_evict(key, state)
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            before = self.evicted
+            self._evict(self.clock())
+            return self.evicted - before
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def keys(self):
+        with self._lock:
+            return list(self._sessions)
+
+    def stats(self) -> dict:
+        return {"active": len(self), "created": self.created, "evicted": self.evicted,
+                "idle_ttl_s": self.idle_ttl, "max_sessions": self.max_sessions}
@@ -0,0 +1,183 @@
+"""
+core/pricing_kernel.py — Line-Item Pricing Kernel v1.0
+Catalog-driven pricing: every takeoff quantity priced in one vectorized pass
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from core.bid_config import CatalogItem, CompiledConfig, SupplierConfig
+
+PriceLookup = Callable[[SupplierConfig, str, str], Optional[float]]
+EthicsCheck = Callable[[str, str], bool]
+
+
+@dataclass(frozen=True)
+class LineItemTable:
+    """
+    Column-oriented line items. Certificate/risk/DEI functions read the
+    subtotals straight off the columns instead of re-summing dicts.
+    Iterating still yields the legacy per-item dicts.
+    """
+    keys: Tuple[str, ...]
+    desc: Tuple[str, ...]
+    unit: Tuple[str, ...]
+    qty: np.ndarray
+    mat_price: np.ndarray
+    labor_hours: np.ndarray
+    labor_rate: np.ndarray
+    material_total: np.ndarray
+    labor_total: np.ndarray
+    line_total: np.ndarray
+    price_source: Tuple[str, ...]
+    ethics_status: str = "CLEAN"
+    config_version: str = ""
+
+    @property
+    def material_subtotal(self) -> float:
+        return float(self.material_total.sum())
+
+    @property
+    def labor_subtotal(self) -> float:
+        return float(self.labor_total.sum())
+
+    @property
+    def subtotal(self) -> float:
+        return float(self.line_total.sum())
+
+    @property
+    def labor_hours_total(self) -> float:
+        return float(self.labor_hours.sum())
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.as_dicts())
+
+    def as_dicts(self) -> List[dict]:
+        return [
+            {
+                "key": self.keys[i],
+                "desc": self.desc[i],
+                "qty": float(self.qty[i]),
+                "unit": self.unit[i],
+                "mat_price": float(self.mat_price[i]),
+                "labor_hours": round(float(self.labor_hours[i]), 1),
+                "labor_rate": float(self.labor_rate[i]),
+                "line_total": float(self.line_total[i]),
+                "price_source": self.price_source[i],
+                "ethics_status": self.ethics_status,
+            }
+            for i in range(len(self.keys))
+        ]
+
+    def with_prices(self, mat_price: np.ndarray) -> "LineItemTable":
+        """Reprice materials (e.g. a price shock) without touching labor."""
+        mat_price = np.asarray(mat_price, dtype=np.float64)
+        material_total = self.qty * mat_price
+        return LineItemTable(
+            keys=self.keys, desc=self.desc, unit=self.unit, qty=self.qty,
+            mat_price=mat_price, labor_hours=self.labor_hours, labor_rate=self.labor_rate,
+            material_total=material_total, labor_total=self.labor_total,
+            line_total=material_total + self.labor_total,
+            price_source=self.price_source, ethics_status=self.ethics_status,
+            config_version=self.config_version,
+        )
+
+
+def empty_table(config_version: str = "") -> LineItemTable:
+    none = np.zeros(0, dtype=np.float64)
+    return LineItemTable(keys=(), desc=(), unit=(), qty=none, mat_price=none, labor_hours=none,
+                         labor_rate=none, material_total=none, labor_total=none, line_total=none,
+                         price_source=(), config_version=config_version)
+
+
+def first_allowed_supplier(conf: CompiledConfig, allow: EthicsCheck) -> Optional[SupplierConfig]:
+    for supplier in conf.active_suppliers:
+        if allow(supplier.name, "supplier"):
+            return supplier
+    return None
+
+
+def fetch_prices(items: Tuple[CatalogItem, ...], supplier: Optional[SupplierConfig], region: str,
+                 lookup: Optional[PriceLookup], max_workers: int = 4) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """Scrape all catalog prices concurrently; anything missing falls back to the catalog price."""
+    fallback = np.array([item.fallback_price for item in items], dtype=np.float64)
+    if supplier is None or lookup is None or not items:
+        return fallback, ("fallback",) * len(items)
+
+    def _one(item: CatalogItem) -> Optional[float]:
+        try:
+            return lookup(supplier, item.search, region)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        scraped = list(pool.map(_one, items))
+
+    prices = np.array([p if p and p > 0 else np.nan for p in scraped], dtype=np.float64)
+    missing = np.isnan(prices)
+    prices[missing] = fallback[missing]
+    sources = tuple("fallback" if m else supplier.name for m in missing)
+    return prices, sources
+
+
+def price_line_items(takeoff: Mapping[str, float], conf: CompiledConfig, region: str,
+                     allow: EthicsCheck, lookup: Optional[PriceLookup] = None) -> LineItemTable:
+    """
+    Price every catalog product with a non-zero takeoff quantity.
+    The ethics blade runs once per bid (manufacturer + first clean supplier),
+    not once per product; labor and totals are computed as whole columns.
+    """
+    items = tuple(item for item in conf.catalog if float(takeoff.get(item.takeoff_key, 0) or 0) > 0)
+    if not items or not conf.manufacturers_priority:
+        return empty_table(conf.version)
+
+    manufacturer = conf.manufacturers_priority[0]
+    if not allow(manufacturer, "manufacturer"):
+        return empty_table(conf.version)
+
+    supplier = first_allowed_supplier(conf, allow)
+    mat_price, sources = fetch_prices(items, supplier, region, lookup)
+
+    qty = np.array([float(takeoff[item.takeoff_key]) for item in items], dtype=np.float64)
+    per_hour = np.array([conf.labor.productivity[item.productivity] for item in items], dtype=np.float64)
+    labor_rate = np.array([conf.labor.rates[item.role] for item in items], dtype=np.float64)
+    cost_per_unit = np.array([conf.labor.cost_per_unit[item.productivity] for item in items], dtype=np.float64)
+
+    labor_hours = qty / per_hour
+    material_total = qty * mat_price
+    labor_total = qty * cost_per_unit
+
+    return LineItemTable(
+        keys=tuple(item.key for item in items),
+        desc=tuple(f"{manufacturer} {item.product}" for item in items),
+        unit=tuple(item.unit for item in items),
+        qty=qty,
+        mat_price=mat_price,
+        labor_hours=labor_hours,
+        labor_rate=labor_rate,
+        material_total=material_total,
+        labor_total=labor_total,
+        line_total=material_total + labor_total,
+        price_source=sources,
+        config_version=conf.version,
+    )
+
+
+def subtotal(line_items) -> float:
+    """Subtotal for either a LineItemTable or a legacy list of dicts."""
+    if isinstance(line_items, LineItemTable):
+        return line_items.subtotal
+    return float(sum(i.get("line_total", 0) for i in line_items))
+
+
+def labor_hours_total(line_items) -> float:
+    if isinstance(line_items, LineItemTable):
+        return line_items.labor_hours_total
+    return float(sum(i.get("labor_hours", 0) for i in line_items))
@@ -0,0 +1,205 @@
+"""
+core/proxy_cluster.py — Multi-Worker Observer Proxy v1.0
+Runs proxy_server.py as N uvicorn workers sharing session state through SESSION_STORE,
+emits a session-sticky nginx upstream, and benchmarks throughput against worker count
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+
+    python -m core.proxy_cluster serve --workers 4                       # one port, kernel-balanced
+    python -m core.proxy_cluster serve --workers 4 --mode ports --nginx  # 8001..8004 + sticky upstream
+    python -m core.proxy_cluster bench --workers 1,2,4 --rps 200 --duration 20
+
+Every worker memory-maps the same compiled spec, so the reference frame is paged
+in once; each worker runs its own sandbox pool, so SANDBOX_WORKERS is per worker.
+Prometheus: in ports mode scrape each worker; in shared mode /metrics is per-process.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+from core import proxy_loadgen
+
+DEFAULT_STORE = "sqlite"
+
+NGINX_UPSTREAM = """upstream observer_proxy {{
+    # Same X-Session-ID → same worker, so its cached session never needs reloading.
+    # Requests without the header fall back to the caller's Authorization key.
+    hash $observer_session consistent;
+{servers}
+}}
+
+map $http_x_session_id $observer_session {{
+    ""      $http_authorization;
+    default $http_x_session_id;
+}}
+
+server {{
+    listen {listen};
+    location / {{
+        proxy_pass http://observer_proxy;
+        proxy_http_version 1.1;
+        proxy_set_header Connection "";
+        proxy_buffering off;           # SSE passthrough
+        proxy_read_timeout 300s;
+    }}
+}}
+"""
+
+
+def nginx_config(ports: Sequence[int], host: str = "127.0.0.1", listen: int = 8000) -> str:
+    servers = "\n".join(f"    server {host}:{port};" for port in ports)
+    return NGINX_UPSTREAM.format(servers=servers, listen=listen)
+
+
+def worker_env(store: Optional[str] = None, sandbox_workers: Optional[int] = None,
+               overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["SESSION_STORE"] = store or env.get("SESSION_STORE") or DEFAULT_STORE
+    if sandbox_workers is not None:
+        env["SANDBOX_WORKERS"] = str(sandbox_workers)
+    env.update(overrides or {})
+    return env
+
+
+def start(workers: int, mode: str = "shared", host: str = "127.0.0.1", port: int = 8000,
+          store: Optional[str] = None, sandbox_workers: Optional[int] = None,
+          env_overrides: Optional[Dict[str, str]] = None) -> List[subprocess.Popen]:
+    """
+    shared: one uvicorn master on `port` forking `workers` processes (SO_REUSEPORT-style balancing).
+    ports:  `workers` independent processes on port+1 … port+workers, for an nginx sticky upstream.
+    """
+    env = worker_env(store, sandbox_workers, env_overrides)
+    base = [sys.executable, "-m", "uvicorn", "proxy_server:app", "--host", host, "--log-level", "warning"]
+    if mode == "shared":
+        return [subprocess.Popen(base + ["--port", str(port), "--workers", str(workers)], env=env)]
+    if mode == "ports":
+        return [subprocess.Popen(base + ["--port", str(port + 1 + i)], env=env) for i in range(workers)]
+    raise ValueError(f"Unknown mode {mode!r} — use shared or ports")
+
+
+def stop(procs: Sequence[subprocess.Popen], timeout: float = 15.0):
+    for proc in procs:
+        if proc.poll() is None:
+            proc.send_signal(signal.SIGINT)
+    deadline = time.monotonic() + timeout
+    for proc in procs:
+        try:
+            proc.wait(max(0.1, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def wait_ready(url: str, timeout: float = 120.0, path: str = "/observer/stats", workers: int = 1):
+    """
+    Poll until `workers` distinct processes behind `url` have answered — the
+    stats payload carries each worker's pid, and every poll opens a fresh
+    connection so the kernel can hand it to a different worker.
+    """
+    deadline = time.monotonic() + timeout
+    seen = set()
+    while time.monotonic() < deadline:
+        try:
+            resp = httpx.get(url + path, timeout=2.0)
+            if resp.status_code == 200:
+                seen.add(resp.json()["sessions"]["worker_pid"] if workers > 1 else None)
+                if len(seen) >= workers:
+                    return
+                time.sleep(0.02)
+                continue
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise TimeoutError(f"{url}: {len(seen)}/{workers} workers ready after {timeout:.0f}s")
+
+
+def bench(worker_counts: Sequence[int], rps: float = 200.0, duration: float = 20.0, sessions: int = 64,
+          port: int = 8000, upstream_port: int = 9000, latency_ms: float = 200.0, stream: bool = False,
+          store: Optional[str] = None, sandbox_workers: int = 2) -> List[dict]:
+    """
+    Fake upstream + proxy at each worker count, driven open-loop at `rps`.
+    Offered load should exceed what one worker sustains, otherwise every
+    row just reports `rps` back. Efficiency = throughput / (N × single-worker throughput).
+    """
+    upstream = subprocess.Popen([sys.executable, "-m", "core.fake_upstream", "--port", str(upstream_port),
+                                 "--latency-ms", str(latency_ms), "--seed", "0"])
+    # Always the fake upstream, even when the shell exports the real URL and key
+    fake = {"UPSTREAM_BASE_URL": f"http://127.0.0.1:{upstream_port}/v1", "REAL_API_KEY": "fake"}
+    rows = []
+    try:
+        wait_ready(f"http://127.0.0.1:{upstream_port}", path="/v1/models")
+        for n in worker_counts:
+            procs = start(n, "shared", port=port, store=store, sandbox_workers=sandbox_workers, env_overrides=fake)
+            try:
+                url = f"http://127.0.0.1:{port}"
+                wait_ready(url, workers=n)
+                report = asyncio.run(proxy_loadgen.run(url, rps, duration, sessions, stream))
+                rows.append({"workers": n, **report.summary()})
+            finally:
+                stop(procs)
+    finally:
+        stop([upstream])
+
+    single = rows[0]["throughput_rps"] / rows[0]["workers"] if rows and rows[0]["throughput_rps"] else 0.0
+    for row in rows:
+        row["efficiency"] = round(row["throughput_rps"] / (row["workers"] * single), 3) if single else 0.0
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run or benchmark the observer proxy across worker processes")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve")
+    serve.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    serve.add_argument("--mode", choices=("shared", "ports"), default="shared")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--store", help="SESSION_STORE (default $SESSION_STORE, then sqlite on /dev/shm)")
+    serve.add_argument("--nginx", action="store_true", help="print a sticky nginx upstream (ports mode)")
+
+    run = sub.add_parser("bench")
+    run.add_argument("--workers", default="1,2,4")
+    run.add_argument("--rps", type=float, default=200.0)
+    run.add_argument("--duration", type=float, default=20.0)
+    run.add_argument("--sessions", type=int, default=64)
+    run.add_argument("--latency-ms", type=float, default=200.0)
+    run.add_argument("--stream", action="store_true")
+    run.add_argument("--store")
+    run.add_argument("--out", help="also write the JSON rows here")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        procs = start(args.workers, args.mode, args.host, args.port, args.store)
+        if args.nginx:
+            ports = [args.port + 1 + i for i in range(args.workers)] if args.mode == "ports" else [args.port]
+            print(nginx_config(ports, args.host, args.port))
+        try:
+            for proc in procs:
+                proc.wait()
+        except KeyboardInterrupt:
+            stop(procs)
+        return
+
+    rows = bench([int(n) for n in args.workers.split(",")], args.rps, args.duration, args.sessions,
+                 latency_ms=args.latency_ms, stream=args.stream, store=args.store)
+    print(f"cpus={os.cpu_count()}  target_rps={args.rps}  duration={args.duration}s")
+    print(f"{'workers':>7} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'efficiency':>10}")
+    for row in rows:
+        print(f"{row['workers']:>7} {row['throughput_rps']:>8} {row['latency_p50_ms']:>8} "
+              f"{row['latency_p99_ms']:>8} {sum(row['errors'].values()):>7} {row['efficiency']:>10}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+core/proxy_loadgen.py — Observer Proxy Load Generator v1.0
+Open-loop load at a target RPS against /v1/chat/completions: throughput, p50/p99 latency,
+intervention rates by type — for sizing proxy deployments
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+
+    python -m core.proxy_loadgen --url http://127.0.0.1:8000 --rps 50 --duration 30 --sessions 20
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import httpx
+import numpy as np
+
+_TYPE = re.compile(r"TYPE: ([A-Z ]+?)\s*(?:\n|$)")
+
+PROMPTS = [
+    "Write a helper that averages a list and prove it works.",
+    "Why did the previous test fail?",
+    "Refactor the parser and keep the tests green.",
+    "Explain how the observer validates your claims.",
+]
+
+
+def classify_reply(content: str) -> Optional[str]:
+    """Intervention type from an observer reply, or None for a passed-through answer."""
+    if "CRITICAL OBSERVER INTERVENTION" in content:
+        return "critical"
+    if "CRITICAL INTERVENTION ACTIVE" in content or "OBSERVER ACKNOWLEDGED" in content:
+        return "lockdown"
+    if "OBSERVER INTERVENTION" in content:
+        m = _TYPE.search(content)
+        kind = m.group(1).strip().lower() if m else "other"
+        return {"constraint violation": "constraint", "code execution failure": "code",
+                "semantic drift": "drift"}.get(kind, kind)
+    return None
+
+
+@dataclass
+class VirtualUser:
+    """One session. After a critical intervention it walks the lockdown dialogue to get unstuck."""
+    session_id: str
+    history: List[dict] = field(default_factory=list)
+    pending: List[str] = field(default_factory=list)
+    turn: int = 0
+
+    def next_messages(self) -> List[dict]:
+        text = self.pending.pop(0) if self.pending else PROMPTS[self.turn % len(PROMPTS)]
+        self.turn += 1
+        self.history = (self.history + [{"role": "user", "content": text}])[-8:]
+        return [{"role": "system", "content": "You are a careful engineer."}] + self.history
+
+    def observe(self, content: str, kind: Optional[str]):
+        self.history.append({"role": "assistant", "content": content[:512]})
+        if kind == "critical" or (kind == "lockdown" and not self.pending):
+            self.pending = ["OBSERVER ACKNOWLEDGED", "RESET CONTEXT"]
+
+
+@dataclass
+class LoadReport:
+    sent: int = 0
+    ok: int = 0
+    errors: Counter = field(default_factory=Counter)
+    interventions: Counter = field(default_factory=Counter)
+    lockdown_replies: int = 0       # the proxy's lockdown dialogue, not a new intervention
+    latencies: List[float] = field(default_factory=list)
+    elapsed: float = 0.0
+    late_starts: int = 0
+
+    def summary(self) -> dict:
+        lat = np.array(self.latencies) if self.latencies else np.zeros(1)
+        return {
+            "sent": self.sent,
+            "ok": self.ok,
+            "errors": dict(self.errors),
+            "throughput_rps": round(self.ok / self.elapsed, 2) if self.elapsed else 0.0,
+            "latency_p50_ms": round(float(np.percentile(lat, 50)) * 1000, 1),
+            "latency_p99_ms": round(float(np.percentile(lat, 99)) * 1000, 1),
+            "latency_max_ms": round(float(lat.max()) * 1000, 1),
+            "intervention_rate": round(sum(self.interventions.values()) / self.ok, 4) if self.ok else 0.0,
+            "interventions": dict(self.interventions),
+            "lockdown_replies": self.lockdown_replies,
+            "late_starts": self.late_starts,
+        }
+
+
+async def _read_stream(response: httpx.Response) -> str:
+    parts = []
+    async for line in response.aiter_lines():
+        if not line.startswith("data: ") or line == "data: [DONE]":
+            continue
+        chunk = json.loads(line[6:])
+        for choice in chunk.get("choices", []):
+            parts.append(choice.get("delta", {}).get("content") or "")
+    return "".join(parts)
+
+
+async def _one(client: httpx.AsyncClient, user: VirtualUser, report: LoadReport, stream: bool, model: str):
+    payload = {"model": model, "messages": user.next_messages(), "stream": stream}
+    headers = {"x-session-id": user.session_id}
+    start = time.perf_counter()
+    try:
+        if stream:
+            async with client.stream("POST", "/v1/chat/completions", json=payload, headers=headers) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    report.errors[str(response.status_code)] += 1
+                    return
+                content = await _read_stream(response)
+        else:
+            response = await client.post("/v1/chat/completions", json=payload, headers=headers)
+            if response.status_code != 200:
+                report.errors[str(response.status_code)] += 1
+                return
+            content = response.json()["choices"][0]["message"]["content"] or ""
+    except httpx.HTTPError as e:
+        report.errors[type(e).__name__] += 1
+        return
+    report.latencies.append(time.perf_counter() - start)
+    report.ok += 1
+    kind = classify_reply(content)
+    if kind == "lockdown":
+        report.lockdown_replies += 1
+    elif kind:
+        report.interventions[kind] += 1
+    user.observe(content, kind)
+
+
+async def run(base_url: str, rps: float = 10.0, duration: float = 10.0, sessions: int = 10,
+              stream: bool = False, model: str = "gpt-4o", max_in_flight: int = 512,
+              transport: Optional[httpx.AsyncBaseTransport] = None, timeout: float = 120.0) -> LoadReport:
+    """
+    Open-loop: request i is launched at t = i / rps whether or not earlier
+    ones finished, so a slow proxy shows up as latency rather than as a
+    silently lower offered load. Requests are spread round-robin over sessions.
+    """
+    report = LoadReport()
+    users = [VirtualUser(f"loadgen-{i}") for i in range(sessions)]
+    gate = asyncio.Semaphore(max_in_flight)
+    total = int(rps * duration)
+
+    async def fire(i: int):
+        async with gate:
+            await _one(client, users[i % len(users)], report, stream, model)
+
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, timeout=timeout,
+                                 limits=httpx.Limits(max_connections=max_in_flight)) as client:
+        started = time.perf_counter()
+        tasks = []
+        for i in range(total):
+            lag = started + i / rps - time.perf_counter()
+            if lag > 0:
+                await asyncio.sleep(lag)
+            elif lag < -0.05:
+                report.late_starts += 1
+            report.sent += 1
+            tasks.append(asyncio.create_task(fire(i)))
+        await asyncio.gather(*tasks)
+        report.elapsed = time.perf_counter() - started
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the observer proxy at a target RPS")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rps", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--out", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args.url, args.rps, args.duration, args.sessions, args.stream, args.model))
+    summary = {"target_rps": args.rps, "duration_s": args.duration, "sessions": args.sessions,
+               "stream": args.stream, **report.summary()}
+    print(json.dumps(summary, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
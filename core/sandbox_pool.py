@@ -0,0 +1,249 @@
+"""
+core/sandbox_pool.py — Pooled Sandbox Execution v1.0
+Pre-warmed, resource-limited worker processes for TechnicalValidator,
+with a concurrency cap, recycling after N runs and a verdict cache keyed by code hash
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import json
+import os
+import queue
+import select
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from core.embedding_service import LRUCache, text_key
+
+WORKER_SCRIPT = Path(__file__).with_name("sandbox_worker.py")
+POSIX = os.name == "posix" and hasattr(os, "fork")
+
+
+@dataclass(frozen=True)
+class SandboxResult:
+    success: bool
+    output: str = ""
+    error: str = ""
+    duration: float = 0.0
+    cached: bool = False
+    busy: bool = False      # never ran: no pooled worker was free — not a verdict on the code
+
+
+def restricted_env() -> dict:
+    return {"PATH": os.environ.get("PATH", ""), "PYTHONPATH": "", "PYTHONDONTWRITEBYTECODE": "1"}
+
+
+def run_once(code: str, timeout: float = 5.0) -> SandboxResult:
+    """Original one-shot path: fresh interpreter per snippet. Used where fork() is unavailable."""
+    with tempfile.NamedTemporaryFile(suffix=".py", delete=False) as tmp:
+        tmp.write(code.encode("utf-8"))
+        tmp_path = tmp.name
+    started = time.perf_counter()
+    try:
+        result = subprocess.run([sys.executable, tmp_path], capture_output=True, text=True,
+                                env=restricted_env(), timeout=timeout)
+        return SandboxResult(result.returncode == 0, result.stdout, result.stderr or result.stdout,
+                             time.perf_counter() - started)
+    except subprocess.TimeoutExpired:
+        return SandboxResult(False, error="Timeout (possible infinite loop)", duration=time.perf_counter() - started)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+
+class _Worker:
+    """One pre-warmed interpreter speaking the sandbox_worker JSON-lines protocol."""
+
+    def __init__(self, preload: Sequence[str] = ()):
+        env = {**restricted_env(), "SANDBOX_PRELOAD": ",".join(preload)}
+        self.proc = subprocess.Popen([sys.executable, "-I", str(WORKER_SCRIPT)], stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env,
+                                     text=True, bufsize=1, start_new_session=True)
+        self.runs = 0
+        try:
+            if "ready" not in self._read(timeout=30.0):
+                raise WorkerCrashed("sandbox worker failed to start")
+        except BaseException:
+            self.proc.kill()
+            self.proc.wait()
+            raise
+
+    def _read(self, timeout: float) -> dict:
+        ready, _, _ = select.select([self.proc.stdout], [], [], timeout)
+        line = self.proc.stdout.readline() if ready else ""
+        if not line:
+            raise WorkerCrashed("sandbox worker stopped responding")
+        try:
+            return json.loads(line)
+        except ValueError:
+            raise WorkerCrashed(f"sandbox worker broke protocol: {line[:80]!r}")
+
+    def run(self, code: str, timeout: float, memory_mb: int) -> dict:
+        self.runs += 1
+        try:
+            self.proc.stdin.write(json.dumps({"code": code, "timeout": timeout, "memory_mb": memory_mb}) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerCrashed(str(e))
+        # The worker enforces the timeout itself; this guard only catches a wedged worker
+        return self._read(timeout + 5.0)
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def stop(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=1.0)
+        except Exception:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class SandboxPool:
+    """
+    `size` workers are forked at start-up and each one forks a fresh,
+    rlimit-bound child per snippet, so a run costs a fork instead of an
+    interpreter start. Checking a worker out of the idle queue is the
+    concurrency cap; a worker is replaced after `max_runs` snippets or as soon
+    as it misbehaves. Verdicts are cached by sha256 of the code, so identical
+    snippets execute once; timeouts and crashes are load-dependent and never cached.
+    A slot whose successor can't be started after `respawn_retries` tries is
+    dropped. Requests that find no worker within `checkout_timeout` (or none
+    left at all, or a closed pool) get a `busy` result rather than an unpooled
+    interpreter, so the cap holds under load; run_once is only the non-POSIX path.
+    """
+
+    def __init__(self, size: int = 4, max_runs: int = 100, timeout: float = 5.0, memory_mb: int = 256,
+                 cache_size: int = 1024, preload: Sequence[str] = (), latency_window: int = 2048,
+                 respawn_retries: int = 3, respawn_backoff: float = 0.5, checkout_timeout: float = 30.0):
+        self.size = size
+        self.max_runs = max_runs
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.preload = tuple(preload)
+        self.respawn_retries = respawn_retries
+        self.respawn_backoff = respawn_backoff
+        self.checkout_timeout = checkout_timeout
+        self.cache = LRUCache(cache_size)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._durations = deque(maxlen=latency_window)
+        self.counters = {"runs": 0, "cache_hits": 0, "timeouts": 0, "recycled": 0, "crashed": 0,
+                         "respawn_failed": 0, "busy": 0}
+        self._closed = False
+        self.enabled = POSIX
+        self.slots = size if self.enabled else 0
+        if self.enabled:
+            for _ in range(size):
+                self._idle.put(_Worker(self.preload))
+
+    def _release(self, worker: _Worker):
+        """Return a worker to the idle queue, or stop it if the pool closed meanwhile."""
+        with self._lock:
+            if not self._closed:
+                self._idle.put(worker)
+                return
+        worker.stop()
+
+    def _replace(self, worker: _Worker, crashed: bool = False):
+        """Retire a worker and start its successor off the request path."""
+        with self._lock:
+            self.counters["crashed" if crashed else "recycled"] += 1
+
+        def _respawn():
+            worker.stop()
+            for attempt in range(self.respawn_retries):
+                if self._closed:
+                    return
+                try:
+                    self._release(_Worker(self.preload))
+                    return
+                except WorkerCrashed:
+                    time.sleep(self.respawn_backoff * 2 ** attempt)
+            with self._lock:
+                self.counters["respawn_failed"] += 1
+                self.slots -= 1
+
+        threading.Thread(target=_respawn, name="sandbox-respawn", daemon=True).start()
+
+    def _checkout(self):
+        """(worker, None), or (None, why no worker was handed out)."""
+        if self._closed:
+            return None, "Sandbox pool is closed"
+        if self.slots <= 0:
+            return None, "Sandbox busy: no workers left"
+        try:
+            return self._idle.get(timeout=self.checkout_timeout), None
+        except queue.Empty:
+            return None, f"Sandbox busy: no worker free within {self.checkout_timeout:g}s"
+
+    def run(self, code: str) -> SandboxResult:
+        key = text_key(code)
+        cached = self.cache.get(key)
+        if cached is not None:
+            with self._lock:
+                self.counters["cache_hits"] += 1
+            return replace(cached, cached=True)
+
+        if not self.enabled:
+            result = run_once(code, self.timeout)
+        else:
+            worker, busy = self._checkout()
+            if worker is None:
+                with self._lock:
+                    self.counters["busy"] += 1
+                return SandboxResult(False, error=busy, busy=True)
+            try:
+                result = SandboxResult(**worker.run(code, self.timeout, self.memory_mb))
+            except WorkerCrashed as e:
+                self._replace(worker, crashed=True)
+                return SandboxResult(False, error=f"Sandbox worker crashed: {e}")
+            if worker.runs >= self.max_runs or not worker.alive():
+                self._replace(worker)
+            else:
+                self._release(worker)
+
+        timed_out = result.error.startswith("Timeout")
+        with self._lock:
+            self.counters["runs"] += 1
+            self.counters["timeouts"] += timed_out
+            self._durations.append(result.duration)
+        if not timed_out:
+            self.cache.put(key, result)
+        return result
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+    def stats(self) -> dict:
+        with self._lock:
+            durations = np.array(self._durations) if self._durations else np.zeros(1)
+            counters = dict(self.counters)
+        return {
+            **counters,
+            "size": self.size,
+            "slots": self.slots,
+            "idle": self._idle.qsize(),
+            "cache_size": len(self.cache),
+            "exec_p50_ms": float(np.percentile(durations, 50) * 1000),
+            "exec_p99_ms": float(np.percentile(durations, 99) * 1000),
+        }
@@ -0,0 +1,159 @@
+"""
+core/sandbox_worker.py — Pre-warmed Sandbox Worker v1.0
+Long-lived interpreter that receives code over stdin (one JSON request per line),
+forks a resource-limited child per snippet, and answers with one JSON verdict per line.
+Stdlib only — launched as `python -I core/sandbox_worker.py` by core.sandbox_pool.
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import json
+import os
+import selectors
+import signal
+import sys
+import tempfile
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:  # non-POSIX: pool falls back to one-shot subprocesses
+    resource = None
+
+MAX_OUTPUT = 64 * 1024
+
+
+def _limit(cpu_seconds: int, memory_mb: int, file_mb: int = 16):
+    if resource is None:
+        return
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (file_mb * 1024 * 1024,) * 2)
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+
+def _child(code: str, out_fd: int, err_fd: int, cpu_seconds: int, memory_mb: int):
+    """Runs in the forked child; never returns."""
+    status = 0
+    try:
+        os.setsid()                             # own process group: anything it forks dies with it
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.closerange(3, 1 << 16)              # protocol pipes stay out of the snippet's reach
+        sys.stdin = open(0, closefd=False)
+        sys.stdout = open(1, "w", closefd=False)
+        sys.stderr = open(2, "w", closefd=False)
+        _limit(cpu_seconds, memory_mb)
+        exec(compile(code, "<sandbox>", "exec"), {"__name__": "__main__", "__builtins__": __builtins__})
+    except SystemExit as e:
+        status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        if e.code is not None and not isinstance(e.code, int):
+            print(e.code, file=sys.stderr)
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(status & 0xFF)
+
+
+def _kill(pid: int):
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _kill_group(pgid: int):
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_snippet(code: str, timeout: float, memory_mb: int) -> dict:
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    started = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os.close(out_r)
+        os.close(err_r)
+        _child(code, out_w, err_w, max(1, int(timeout + 0.999)), memory_mb)
+    os.close(out_w)
+    os.close(err_w)
+
+    buffers = {out_r: bytearray(), err_r: bytearray()}
+    sel = selectors.DefaultSelector()
+    for fd in buffers:
+        sel.register(fd, selectors.EVENT_READ)
+    deadline = started + timeout
+    timed_out = False
+    while sel.get_map():
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            timed_out = True
+            break
+        for key, _ in sel.select(remaining):
+            chunk = os.read(key.fd, 8192)
+            if not chunk:
+                sel.unregister(key.fd)
+            elif len(buffers[key.fd]) < MAX_OUTPUT:
+                buffers[key.fd] += chunk[:MAX_OUTPUT - len(buffers[key.fd])]
+    sel.close()
+    if timed_out:
+        _kill_group(pid)
+        _kill(pid)                              # in case it was killed before reaching setsid()
+    _, wait_status = os.waitpid(pid, 0)
+    _kill_group(pid)                            # stragglers the snippet forked and left running
+    for fd in buffers:
+        os.close(fd)
+
+    stdout = buffers[out_r].decode("utf-8", errors="replace")
+    stderr = buffers[err_r].decode("utf-8", errors="replace")
+    if timed_out:
+        return {"success": False, "output": stdout, "error": "Timeout (possible infinite loop)",
+                "duration": time.perf_counter() - started}
+    if os.WIFSIGNALED(wait_status):
+        sig = os.WTERMSIG(wait_status)
+        reason = "CPU limit exceeded" if sig == signal.SIGXCPU else f"Killed by signal {sig}"
+        return {"success": False, "output": stdout, "error": stderr or reason,
+                "duration": time.perf_counter() - started}
+    returncode = os.WEXITSTATUS(wait_status)
+    return {"success": returncode == 0, "output": stdout, "error": stderr or stdout,
+            "duration": time.perf_counter() - started}
+
+
+def serve(preload=()):
+    # Stray prints — preload imports included — must never corrupt the protocol,
+    # so fd 1 points at stderr before anything else runs
+    protocol_out = os.fdopen(os.dup(1), "w", buffering=1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    for name in preload:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+    os.chdir(tempfile.mkdtemp(prefix="sandbox-"))
+    protocol_out.write(json.dumps({"ready": os.getpid()}) + "\n")
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            verdict = run_snippet(request["code"], request.get("timeout", 5.0), request.get("memory_mb", 256))
+        except Exception as e:
+            verdict = {"success": False, "output": "", "error": f"Sandbox error: {e}", "duration": 0.0}
+        protocol_out.write(json.dumps(verdict) + "\n")
+
+
+if __name__ == "__main__":
+    serve(preload=[m for m in os.environ.get("SANDBOX_PRELOAD", "").split(",") if m])
@@ -0,0 +1,226 @@
+"""
+core/session_store.py — Shared Observer Session Store v1.0
+Session snapshots (failure streaks, lockdown flag) and bounded session logs shared
+between proxy worker processes: SQLite on /dev/shm as the local stand-in, Redis when available
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class SessionStore(ABC):
+    """
+    One small snapshot per session plus an append-only log trimmed to the
+    last `maxlen` entries, so a save costs O(new entries), not O(history).
+    save() returns the new version; a worker whose cached copy carries the
+    same version can skip reloading.
+    """
+
+    @abstractmethod
+    def version(self, key: str) -> int: ...
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[Dict]: ...
+
+    @abstractmethod
+    def save(self, key: str, snapshot: Dict) -> int: ...
+
+    @abstractmethod
+    def append_log(self, key: str, entries: Sequence[Dict], maxlen: int): ...
+
+    @abstractmethod
+    def read_log(self, key: str) -> List[Dict]: ...
+
+    @abstractmethod
+    def drop(self, key: str): ...
+
+    @abstractmethod
+    def evict_idle(self, idle_ttl: float) -> int: ...
+
+    def maybe_evict(self, idle_ttl: float):
+        """Called after every save; stores that expire keys on their own need not sweep."""
+
+    @abstractmethod
+    def count(self) -> int: ...
+
+
+def default_sqlite_path() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else os.path.join(os.getcwd(), "output")
+    return os.path.join(base, "observer_sessions.db")
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Multi-process safe via WAL + busy timeout. On Linux the default file lives
+    in /dev/shm, so it is shared memory in practice and never touches disk.
+    """
+
+    def __init__(self, path: Optional[str] = None, evict_every: int = 256):
+        self.path = path or default_sqlite_path()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._local = threading.local()
+        self.evict_every = evict_every
+        self._saves = 0
+        with self._conn() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS sessions (key TEXT PRIMARY KEY, version INTEGER NOT NULL,"
+                       " last_seen REAL NOT NULL, snapshot TEXT NOT NULL)")
+            db.execute("CREATE TABLE IF NOT EXISTS session_log (key TEXT NOT NULL, seq INTEGER NOT NULL,"
+                       " entry TEXT NOT NULL, PRIMARY KEY (key, seq))")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def version(self, key: str) -> int:
+        row = self._conn().execute("SELECT version FROM sessions WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def load(self, key: str) -> Optional[Dict]:
+        row = self._conn().execute("SELECT version, snapshot FROM sessions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {**json.loads(row[1]), "version": row[0]}
+
+    def save(self, key: str, snapshot: Dict) -> int:
+        body = json.dumps({k: v for k, v in snapshot.items() if k != "version"})
+        db = self._conn()
+        row = db.execute(
+            "INSERT INTO sessions (key, version, last_seen, snapshot) VALUES (?, 1, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET version = version + 1, last_seen = excluded.last_seen, "
+            "snapshot = excluded.snapshot RETURNING version", (key, time.time(), body)).fetchone()
+        self._saves += 1
+        return row[0]
+
+    def append_log(self, key: str, entries: Sequence[Dict], maxlen: int):
+        if not entries:
+            return
+        db = self._conn()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            (top,) = db.execute("SELECT COALESCE(MAX(seq), 0) FROM session_log WHERE key = ?", (key,)).fetchone()
+            db.executemany("INSERT INTO session_log (key, seq, entry) VALUES (?, ?, ?)",
+                           [(key, top + i + 1, json.dumps(e)) for i, e in enumerate(entries)])
+            db.execute("DELETE FROM session_log WHERE key = ? AND seq <= ?", (key, top + len(entries) - maxlen))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def read_log(self, key: str) -> List[Dict]:
+        rows = self._conn().execute("SELECT entry FROM session_log WHERE key = ? ORDER BY seq", (key,)).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def drop(self, key: str):
+        db = self._conn()
+        db.execute("DELETE FROM sessions WHERE key = ?", (key,))
+        db.execute("DELETE FROM session_log WHERE key = ?", (key,))
+
+    def evict_idle(self, idle_ttl: float) -> int:
+        db = self._conn()
+        cutoff = time.time() - idle_ttl
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM session_log WHERE key IN (SELECT key FROM sessions WHERE last_seen < ?)", (cutoff,))
+            removed = db.execute("DELETE FROM sessions WHERE last_seen < ?", (cutoff,)).rowcount
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return removed
+
+    def maybe_evict(self, idle_ttl: float):
+        """Amortised sweep: every evict_every saves from this worker."""
+        if self._saves >= self.evict_every:
+            self._saves = 0
+            self.evict_idle(idle_ttl)
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+class RedisSessionStore(SessionStore):
+    """Same contract on Redis: a hash per session, a trimmed list for the log, EXPIRE for idleness."""
+
+    def __init__(self, url: str, idle_ttl: float = 1800.0, prefix: str = "observer:session:"):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("RedisSessionStore needs the redis package: pip install redis")
+        self.client = redis.Redis.from_url(url)
+        self.idle_ttl = int(idle_ttl)
+        self.prefix = prefix
+
+    def _k(self, key: str, part: str) -> str:
+        return f"{self.prefix}{key}:{part}"
+
+    def version(self, key: str) -> int:
+        return int(self.client.hget(self._k(key, "state"), "version") or 0)
+
+    def load(self, key: str) -> Optional[Dict]:
+        raw = self.client.hgetall(self._k(key, "state"))
+        if not raw:
+            return None
+        return {**json.loads(raw[b"snapshot"]), "version": int(raw[b"version"])}
+
+    def save(self, key: str, snapshot: Dict) -> int:
+        state = self._k(key, "state")
+        body = json.dumps({k: v for k, v in snapshot.items() if k != "version"})
+        pipe = self.client.pipeline()
+        pipe.hincrby(state, "version", 1)
+        pipe.hset(state, "snapshot", body)
+        pipe.expire(state, self.idle_ttl)
+        pipe.expire(self._k(key, "log"), self.idle_ttl)
+        return int(pipe.execute()[0])
+
+    def append_log(self, key: str, entries: Sequence[Dict], maxlen: int):
+        if not entries:
+            return
+        log = self._k(key, "log")
+        pipe = self.client.pipeline()
+        pipe.rpush(log, *[json.dumps(e) for e in entries])
+        pipe.ltrim(log, -maxlen, -1)
+        pipe.expire(log, self.idle_ttl)
+        pipe.execute()
+
+    def read_log(self, key: str) -> List[Dict]:
+        return [json.loads(e) for e in self.client.lrange(self._k(key, "log"), 0, -1)]
+
+    def drop(self, key: str):
+        self.client.delete(self._k(key, "state"), self._k(key, "log"))
+
+    def evict_idle(self, idle_ttl: float) -> int:
+        return 0   # keys expire on their own
+
+    def count(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}*:state", count=1000))
+
+
+def make_store(url: Optional[str], idle_ttl: float = 1800.0) -> Optional[SessionStore]:
+    """
+    '' / None        → no shared store (single-process proxy)
+    sqlite[:///path] → SqliteSessionStore (default path on /dev/shm)
+    redis://…        → RedisSessionStore
+    """
+    if not url:
+        return None
+    if url.startswith("redis://") or url.startswith("rediss://") or url.startswith("unix://"):
+        return RedisSessionStore(url, idle_ttl)
+    if url == "sqlite" or url.startswith("sqlite://"):
+        path = url[len("sqlite://"):] if url.startswith("sqlite://") else ""
+        return SqliteSessionStore(path or None)
+    raise ValueError(f"Unsupported SESSION_STORE {url!r} — use sqlite[:///path] or redis://host:port/db")
@@ -0,0 +1,185 @@
+"""
+core/spec_compiler.py — Truth Spec Compiler v1.0
+Compiles truth.json once into a versioned, optionally HMAC-signed artifact
+(spec hash, axiom embeddings, composite reference, compiled rules) that the
+proxy memory-maps at startup instead of re-encoding axioms every boot
+Two Mile Solutions LLC — 2025 | SKODEN ETERNAL
+
+    python -m core.spec_compiler truth.json --out build/spec --backend torch
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.drift_backends import EmbeddingBackend, axiom_texts, make_backend
+from core.observer_rules import DEFAULT_APOLOGY_KEYWORDS, CompiledRules
+
+ARTIFACT_FORMAT = 1
+MANIFEST = "manifest.json"
+EMBEDDINGS = "axiom_embeddings.npy"
+COMPOSITE = "composite_reference.npy"
+SIGNING_KEY_ENV = "SPEC_SIGNING_KEY"
+
+
+class ImmutableSpecViolation(Exception):
+    """Raised when the immutable truth file is tampered with or violated."""
+    pass
+
+
+@dataclass(frozen=True)
+class CompiledSpec:
+    spec: Dict
+    spec_hash: str
+    backend: str
+    reference_embeddings: np.ndarray     # read-only memmap
+    composite_reference: np.ndarray      # read-only memmap
+    rules: CompiledRules
+    manifest: Dict
+
+    @property
+    def version(self) -> str:
+        return self.spec_hash[:12]
+
+
+def spec_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _canonical(manifest: Dict) -> bytes:
+    body = {k: v for k, v in manifest.items() if k != "signature"}
+    return json.dumps(body, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _sign(manifest: Dict, key: Optional[str]) -> Optional[str]:
+    if not key:
+        return None
+    return hmac.new(key.encode(), _canonical(manifest), hashlib.sha256).hexdigest()
+
+
+def compile_spec(spec_path: str, out_dir: str = "build/spec", backend: Optional[EmbeddingBackend] = None,
+                 apology_keywords=DEFAULT_APOLOGY_KEYWORDS, signing_key: Optional[str] = None) -> Path:
+    """Encode the axioms, compile the rules, and write the artifact directory atomically."""
+    raw = Path(spec_path).read_bytes()
+    try:
+        spec = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ImmutableSpecViolation(f"{spec_path} is not valid JSON: {e}") from e
+    backend = backend or make_backend()
+    signing_key = signing_key if signing_key is not None else os.getenv(SIGNING_KEY_ENV)
+
+    texts = axiom_texts(spec["axioms"])
+    embeddings = backend.encode(texts).astype(np.float32)
+    composite = embeddings.mean(axis=0)
+    composite /= np.linalg.norm(composite)
+    rules = CompiledRules.from_spec(spec, apology_keywords)
+
+    out = Path(out_dir)
+    staging = out.with_name(out.name + ".staging")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    np.save(staging / EMBEDDINGS, embeddings)
+    np.save(staging / COMPOSITE, composite.astype(np.float32))
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "spec_path": str(spec_path),
+        "spec_hash": spec_hash(raw),
+        "spec_version": spec.get("meta", {}).get("version", ""),
+        "backend": backend.name,
+        "dim": int(embeddings.shape[1]),
+        "axioms": len(texts),
+        "files": {EMBEDDINGS: _file_hash(staging / EMBEDDINGS), COMPOSITE: _file_hash(staging / COMPOSITE)},
+        "rules": rules.to_dict(),
+        "compiled_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    signature = _sign(manifest, signing_key)
+    if signature:
+        manifest["signature"] = signature
+    (staging / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+    if out.exists():
+        shutil.rmtree(out)
+    os.replace(staging, out)
+    return out
+
+
+def load_compiled_spec(spec_path: str, artifact_dir: str = "build/spec", backend_name: Optional[str] = None,
+                       signing_key: Optional[str] = None, verify_files: bool = True) -> CompiledSpec:
+    """
+    Memory-map a compiled artifact after checking it still describes the
+    spec on disk. Any mismatch — spec hash, backend, signature, or the array
+    files themselves against the manifest hashes (hashing a few small arrays
+    costs little at startup; verify_files=False skips it) — raises
+    ImmutableSpecViolation.
+    """
+    out = Path(artifact_dir)
+    manifest_path = out / MANIFEST
+    if not manifest_path.exists():
+        raise ImmutableSpecViolation(f"No compiled spec at {out} — run: python -m core.spec_compiler {spec_path}")
+    manifest = json.loads(manifest_path.read_text())
+    if manifest.get("format") != ARTIFACT_FORMAT:
+        raise ImmutableSpecViolation(f"Artifact format {manifest.get('format')} != {ARTIFACT_FORMAT}; recompile")
+
+    raw = Path(spec_path).read_bytes()
+    current = spec_hash(raw)
+    if current != manifest["spec_hash"]:
+        raise ImmutableSpecViolation(
+            f"{spec_path} hash {current[:12]} does not match compiled reference frame {manifest['spec_hash'][:12]}")
+    if backend_name and backend_name != manifest["backend"]:
+        raise ImmutableSpecViolation(f"Artifact encoded with {manifest['backend']}, proxy runs {backend_name}")
+
+    signing_key = signing_key if signing_key is not None else os.getenv(SIGNING_KEY_ENV)
+    if signing_key:
+        expected = _sign(manifest, signing_key)
+        if not hmac.compare_digest(manifest.get("signature", ""), expected):
+            raise ImmutableSpecViolation("Compiled spec signature is missing or invalid")
+    if verify_files:
+        for name, digest in manifest["files"].items():
+            if _file_hash(out / name) != digest:
+                raise ImmutableSpecViolation(f"{name} does not match its manifest hash")
+
+    return CompiledSpec(
+        spec=json.loads(raw),
+        spec_hash=current,
+        backend=manifest["backend"],
+        reference_embeddings=np.load(out / EMBEDDINGS, mmap_mode="r"),
+        composite_reference=np.load(out / COMPOSITE, mmap_mode="r"),
+        rules=CompiledRules.from_dict(manifest["rules"]),
+        manifest=manifest,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile truth.json into a memory-mappable reference frame")
+    parser.add_argument("spec", nargs="?", default="truth.json")
+    parser.add_argument("--out", default="build/spec")
+    parser.add_argument("--backend", help="drift backend (default $DRIFT_BACKEND, then torch)")
+    parser.add_argument("--model", default=None)
+    args = parser.parse_args(argv)
+
+    backend = make_backend(args.backend, args.model) if args.model else make_backend(args.backend)
+    start = time.perf_counter()
+    out = compile_spec(args.spec, args.out, backend)
+    compiled_in = time.perf_counter() - start
+    start = time.perf_counter()
+    compiled = load_compiled_spec(args.spec, args.out, backend.name)
+    print(json.dumps({"artifact": str(out), "spec_hash": compiled.spec_hash, "backend": compiled.backend,
+                      "signed": "signature" in compiled.manifest, "compile_s": round(compiled_in, 3),
+                      "load_ms": round((time.perf_counter() - start) * 1000, 2)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
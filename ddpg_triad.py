@@ -2,22 +2,13 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 import numpy as np
-import matplotlib.pyplot as plt
+import argparse
+import os
 import random
+import time
+import warnings
 
-class Actor(nn.Module):
-    def __init__(self, state_dim, action_dim):
-        super(Actor, self).__init__()
-        self.fc1 = nn.Linear(state_dim, 64)
-        self.fc2 = nn.Linear(64, 64)
-        self.fc3 = nn.Linear(64, action_dim)
-        self.tanh = nn.Tanh()
-
-    def forward(self, state):
-        x = torch.relu(self.fc1(state))
-        x = torch.relu(self.fc2(x))
-        action = 0.3 + 0.1 * self.tanh(self.fc3(x))  # Scale to [0.2, 0.4]
-        return action
+from triad_policy import Actor
 
 class Critic(nn.Module):
     def __init__(self, state_dim, action_dim):
@@ -34,22 +25,153 @@ class Critic(nn.Module):
         return q_value
 
 class ReplayBuffer:
-    def __init__(self, capacity):
-        self.buffer = []
+    # Preallocated ring: one contiguous array per field, O(1) push, vectorized sampling.
+    # torch views share the NumPy storage, so sampled batches are a single gather.
+    # With `path` the arrays are .npy memmaps in that directory (mode "c" maps them copy-on-write).
+    # After begin_generation() every row a checkpoint covers is appended to an undo log before
+    # its first overwrite, so rollback() can bring the files back to that checkpoint.
+    FIELDS = ("state", "action", "reward", "next_state", "done")
+
+    def __init__(self, capacity, state_dim=2, action_dim=1, seed=None, path=None, mode="r+"):
         self.capacity = capacity
+        self.path = path
+        self.mode = mode
+        self.generation = 0
+        self._undo = None
+        self._undo_base = 0
+        self._undo_logged = None
+        widths = (state_dim, action_dim, 1, state_dim, 1)
+        if path:
+            os.makedirs(path, exist_ok=True)
+        for name, width in zip(self.FIELDS, widths):
+            setattr(self, name, self._array(name, (capacity, width)))
+        self.fields = (self.state, self.action, self.reward, self.next_state, self.done)
+        self.views = tuple(torch.from_numpy(a) for a in self.fields)
+        self.ptr = 0
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
 
     def push(self, state, action, reward, next_state, done):
-        if len(self.buffer) >= self.capacity:
-            self.buffer.pop(0)
-        self.buffer.append((state, action, reward, next_state, done))
+        i = self.ptr
+        self._log_overwrite(np.array([i]))
+        self.state[i] = state
+        self.action[i] = action
+        self.reward[i] = reward
+        self.next_state[i] = next_state
+        self.done[i] = done
+        self.ptr = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
 
-    def sample(self, batch_size):
-        batch = random.sample(self.buffer, batch_size)
-        state, action, reward, next_state, done = map(np.stack, zip(*batch))
-        return state, action, reward, next_state, done
+    def push_batch(self, state, action, reward, next_state, done):
+        # One transition per env from VectorTriadEnv; rows past capacity wrap around
+        n = len(state)
+        idx = (self.ptr + np.arange(n)) % self.capacity
+        self._log_overwrite(idx)
+        self.state[idx] = state
+        self.action[idx] = np.reshape(action, (n, -1))
+        self.reward[idx, 0] = reward
+        self.next_state[idx] = next_state
+        self.done[idx, 0] = done
+        self.ptr = int((self.ptr + n) % self.capacity)
+        self.size = min(self.size + n, self.capacity)
+
+    def sample(self, batch_size, out=None):
+        # (state, action, reward, next_state, done) as float32 tensors; reward/done are (B, 1).
+        # With `out` (preallocated tensors, e.g. pinned) the gather writes straight into them.
+        idx = torch.from_numpy(self.rng.integers(0, self.size, batch_size))
+        if out is None:
+            return tuple(torch.index_select(v, 0, idx) for v in self.views)
+        for v, o in zip(self.views, out):
+            torch.index_select(v, 0, idx, out=o)
+        return out
+
+    def _array(self, name, shape):
+        if not self.path:
+            return np.zeros(shape, dtype=np.float32)
+        file = os.path.join(self.path, f"{name}.npy")
+        if os.path.exists(file):
+            array = np.load(file, mmap_mode=self.mode)
+            if array.shape == shape and array.dtype == np.float32:
+                return array
+            del array
+        if self.mode != "r+":
+            raise ValueError(f"{file} does not hold a ({shape[0]}, {shape[1]}) float32 array")
+        return np.lib.format.open_memmap(file, mode="w+", dtype=np.float32, shape=shape)
+
+    def flush(self):
+        for array in self.fields:
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def save(self, path):
+        # Write a RAM-backed buffer out as .npy files that ReplayBuffer(path=...) can map
+        os.makedirs(path, exist_ok=True)
+        for name, array in zip(self.FIELDS, self.fields):
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+    def begin_generation(self, generation):
+        # Start checkpoint `generation`'s undo log; rows below the current size are what it covers
+        self.close_undo()
+        for entry in os.listdir(self.path):
+            if entry.startswith("undo-"):
+                os.remove(os.path.join(self.path, entry))
+        self.generation = generation
+        self._undo = open(_undo_file(self.path, generation), "wb")
+        self._undo_base = self.size
+        self._undo_logged = np.zeros(self.capacity, dtype=bool)
+
+    def close_undo(self):
+        if self._undo is not None:
+            self._undo.close()
+            self._undo = None
+
+    def _log_overwrite(self, idx):
+        # Append each checkpointed row's current contents the first time it is about to change.
+        # Record: int64 n, n int64 row indices, then the n rows of every field as float32.
+        if self._undo is None:
+            return
+        idx = np.unique(idx[idx < self._undo_base])
+        idx = idx[~self._undo_logged[idx]]
+        if not len(idx):
+            return
+        rows = np.concatenate([array[idx] for array in self.fields], axis=1)
+        self._undo.write(np.int64(len(idx)).tobytes() + idx.astype(np.int64).tobytes() + rows.tobytes())
+        self._undo.flush()
+        self._undo_logged[idx] = True
+
+    def rollback(self, path, generation):
+        # Restore the rows logged in path/undo-<generation>.bin; a record cut short by a crash
+        # was written before its rows were touched, so it is simply dropped. Returns rows restored.
+        file = _undo_file(path, generation)
+        if not os.path.exists(file):
+            return 0
+        with open(file, "rb") as f:
+            log = f.read()
+        widths = np.cumsum([0] + [array.shape[1] for array in self.fields])
+        offset = restored = 0
+        while offset + 8 <= len(log):
+            n = int(np.frombuffer(log, np.int64, 1, offset)[0])
+            end = offset + 8 + n * (8 + 4 * int(widths[-1]))
+            if end > len(log):
+                break
+            idx = np.frombuffer(log, np.int64, n, offset + 8)
+            rows = np.frombuffer(log, np.float32, n * int(widths[-1]), offset + 8 + 8 * n).reshape(n, -1)
+            for array, lo, hi in zip(self.fields, widths[:-1], widths[1:]):
+                array[idx] = rows[:, lo:hi]
+            restored += n
+            offset = end
+        return restored
+
+    def state_dict(self):
+        return {"capacity": self.capacity, "ptr": self.ptr, "size": self.size,
+                "rng": self.rng.bit_generator.state}
+
+    def load_state_dict(self, state):
+        self.ptr, self.size = state["ptr"], state["size"]
+        self.rng.bit_generator.state = state["rng"]
 
     def __len__(self):
-        return len(self.buffer)
+        return self.size
 
 class TriadEnv:
     def __init__(self):
@@ -79,23 +201,87 @@ class TriadEnv:
         state = self.get_state()
         return state, reward, done
 
+class VectorTriadEnv:
+    # B independent TriadEnvs stepped as one (B, 3) array. sigma0/sigma_slope may be
+    # per-env arrays (different noise schedules); step() returns a done mask and the
+    # caller resets just those envs with reset(done).
+    def __init__(self, num_envs, horizon=50, sigma0=0.01, sigma_slope=0.04, seed=None):
+        self.num_envs = num_envs
+        self.horizon = horizon
+        self.G = np.array([3.14162100062, 3.141592653589793, 3.23586896365])
+        self.T = np.array([3.141592653589793, 3.23586896365, 3.14162100062])
+        self.L = (self.G + self.T) / 2
+        self.sigma0 = np.broadcast_to(np.asarray(sigma0, dtype=np.float64), (num_envs,))
+        self.sigma_slope = np.broadcast_to(np.asarray(sigma_slope, dtype=np.float64), (num_envs,))
+        self.rng = np.random.default_rng(seed)
+        self.v = np.empty((num_envs, 3))
+        self.n_step = np.zeros(num_envs, dtype=np.int64)
+        self.reset()
+
+    def reset(self, mask=None):
+        mask = slice(None) if mask is None else mask
+        self.v[mask] = 3.173027539287
+        self.n_step[mask] = 0
+        return self.get_state()
+
+    def sigma(self):
+        return self.sigma0 + (self.n_step / self.horizon) * self.sigma_slope
+
+    def get_state(self):
+        error = np.linalg.norm(self.v - self.L, axis=1)
+        return np.stack([error, self.sigma()], axis=1).astype(np.float32)
+
+    def state_dict(self):
+        return {"v": self.v.copy(), "n_step": self.n_step.copy(), "rng": self.rng.bit_generator.state}
+
+    def load_state_dict(self, state):
+        self.v[:] = state["v"]
+        self.n_step[:] = state["n_step"]
+        self.rng.bit_generator.state = state["rng"]
+
+    def step(self, k):
+        k = np.reshape(k, (self.num_envs, 1))
+        noise = self.rng.standard_normal((self.num_envs, 3)) * self.sigma()[:, None]
+        self.v = (1 - k) * (self.v + noise) + k * self.L
+        self.n_step += 1
+        done = self.n_step >= self.horizon
+        reward = -np.linalg.norm(self.v - self.L, axis=1)
+        return self.get_state(), reward, done
+
+def _adam(params, lr):
+    # Fused Adam (one kernel for every parameter) where this torch build supports it on CPU
+    params = list(params)
+    try:
+        return optim.Adam(params, lr=lr, fused=True)
+    except (RuntimeError, TypeError):
+        return optim.Adam(params, lr=lr)
+
 class DDPGAgent:
-    def __init__(self, state_dim, action_dim):
+    def __init__(self, state_dim, action_dim, gamma=0.95, tau=0.005, lr=1e-3, batch_size=64,
+                 epsilon_decay=0.995, epsilon_min=0.1, buffer_capacity=10000, seed=None, buffer_path=None,
+                 buffer_mode="r+"):
+        self.hparams = {"state_dim": state_dim, "action_dim": action_dim, "gamma": gamma, "tau": tau, "lr": lr,
+                        "batch_size": batch_size, "epsilon_decay": epsilon_decay, "epsilon_min": epsilon_min,
+                        "buffer_capacity": buffer_capacity}
         self.actor = Actor(state_dim, action_dim)
         self.actor_target = Actor(state_dim, action_dim)
         self.actor_target.load_state_dict(self.actor.state_dict())
         self.critic = Critic(state_dim, action_dim)
         self.critic_target = Critic(state_dim, action_dim)
         self.critic_target.load_state_dict(self.critic.state_dict())
-        self.actor_optimizer = optim.Adam(self.actor.parameters(), lr=1e-3)
-        self.critic_optimizer = optim.Adam(self.critic.parameters(), lr=1e-3)
-        self.replay_buffer = ReplayBuffer(10000)
-        self.gamma = 0.95
-        self.tau = 0.005
-        self.batch_size = 64
+        self.actor_optimizer = _adam(self.actor.parameters(), lr)
+        self.critic_optimizer = _adam(self.critic.parameters(), lr)
+        self.replay_buffer = ReplayBuffer(buffer_capacity, state_dim, action_dim, seed=seed,
+                                          path=buffer_path, mode=buffer_mode)
+        self.gamma = gamma
+        self.tau = tau
+        self.batch_size = batch_size
         self.epsilon = 1.0
-        self.epsilon_min = 0.1
-        self.epsilon_decay = 0.995
+        self.epsilon_min = epsilon_min
+        self.epsilon_decay = epsilon_decay
+        # Flat parameter lists for the fused soft update
+        self._online = list(self.actor.parameters()) + list(self.critic.parameters())
+        self._target = list(self.actor_target.parameters()) + list(self.critic_target.parameters())
 
     def select_action(self, state):
         state = torch.FloatTensor(state).unsqueeze(0)
@@ -105,103 +291,492 @@ class DDPGAgent:
             action = self.actor(state).detach().numpy()[0]
         return action
 
-    def update(self):
-        if len(self.replay_buffer) < self.batch_size:
-            return
-        batch = random.sample(self.replay_buffer, self.batch_size)
-        state, action, reward, next_state, done = map(np.stack, zip(*batch))
-        state = torch.FloatTensor(state)
-        action = torch.FloatTensor(action)
-        reward = torch.FloatTensor(reward).unsqueeze(1)
-        next_state = torch.FloatTensor(next_state)
-        done = torch.FloatTensor(done).unsqueeze(1)
+    def select_actions(self, states):
+        # Whole batch in one actor forward pass; epsilon exploration is drawn per env
+        with torch.no_grad():
+            actions = self.actor(torch.from_numpy(np.asarray(states, dtype=np.float32))).numpy()
+        explore = np.random.random(len(actions)) < self.epsilon
+        actions[explore] = np.random.uniform(0.2, 0.4, (int(explore.sum()), actions.shape[1]))
+        return actions
+
+    def learn(self, state, action, reward, next_state, done):
+        # One gradient step on a sampled batch; returns (critic_loss, actor_loss) tensors
+        with torch.no_grad():
+            target_q = self.critic_target(next_state, self.actor_target(next_state))
+            target_q = reward + (1 - done) * self.gamma * target_q
 
         # Critic update
-        q_values = self.critic(state, action)
-        next_actions = self.actor_target(next_state)
-        target_q = self.critic_target(next_state, next_actions)
-        target_q = reward + (1 - done) * self.gamma * target_q
-        critic_loss = nn.MSELoss()(q_values, target_q.detach())
-        self.critic_optimizer.zero_grad()
+        critic_loss = nn.functional.mse_loss(self.critic(state, action), target_q)
+        self.critic_optimizer.zero_grad(set_to_none=True)
         critic_loss.backward()
         self.critic_optimizer.step()
 
         # Actor update
-        pred_actions = self.actor(state)
-        actor_loss = -self.critic(state, pred_actions).mean()
-        self.actor_optimizer.zero_grad()
+        actor_loss = -self.critic(state, self.actor(state)).mean()
+        self.actor_optimizer.zero_grad(set_to_none=True)
         actor_loss.backward()
         self.actor_optimizer.step()
 
-        # Soft update targets
-        for target_param, param in zip(self.actor_target.parameters(), self.actor.parameters()):
-            target_param.data.copy_(self.tau * param.data + (1 - self.tau) * target_param.data)
-        for target_param, param in zip(self.critic_target.parameters(), self.critic.parameters()):
-            target_param.data.copy_(self.tau * param.data + (1 - self.tau) * target_param.data)
+        self.soft_update()
+        return critic_loss.detach(), actor_loss.detach()
 
+    @torch.no_grad()
+    def soft_update(self):
+        # target ← (1 - tau)·target + tau·online, every tensor of both networks in one fused call
+        torch._foreach_lerp_(self._target, self._online, self.tau)
+
+    def decay_epsilon(self):
         self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
 
-# Training
-env = TriadEnv()
-agent = DDPGAgent(state_dim=2, action_dim=1)
-num_episodes = 100
-rewards = []
+    def state_dict(self):
+        # Everything but the replay arrays, which checkpoints keep as memmapped .npy files
+        return {"hparams": self.hparams, "epsilon": self.epsilon,
+                "actor": self.actor.state_dict(), "critic": self.critic.state_dict(),
+                "actor_target": self.actor_target.state_dict(), "critic_target": self.critic_target.state_dict(),
+                "actor_optimizer": self.actor_optimizer.state_dict(),
+                "critic_optimizer": self.critic_optimizer.state_dict(),
+                "replay_buffer": self.replay_buffer.state_dict()}
+
+    def load_state_dict(self, state):
+        for name in ("actor", "critic", "actor_target", "critic_target", "actor_optimizer", "critic_optimizer"):
+            getattr(self, name).load_state_dict(state[name])
+        self.epsilon = state["epsilon"]
+        self.replay_buffer.load_state_dict(state["replay_buffer"])
+
+    def update(self):
+        if len(self.replay_buffer) < self.batch_size:
+            return
+        self.learn(*self.replay_buffer.sample(self.batch_size))
+        self.decay_epsilon()
 
-for episode in range(num_episodes):
+class Trainer:
+    # Vectorized rollouts with `updates_per_step` gradient steps per env step. Batches are
+    # gathered into preallocated (pinned, when CUDA is present) tensors, so the update loop
+    # allocates nothing per step. Epsilon decays once per horizon, as in train().
+    def __init__(self, agent, env, updates_per_step=1, warmup=None, log_every=1):
+        self.agent = agent
+        self.env = env
+        self.updates_per_step = updates_per_step
+        self.warmup = agent.batch_size if warmup is None else warmup
+        self.log_every = log_every
+        pin = torch.cuda.is_available()
+        buf = agent.replay_buffer
+        self.batch = tuple(torch.empty((agent.batch_size, a.shape[1]), dtype=torch.float32, pin_memory=pin)
+                           for a in buf.fields)
+        self.steps = 0          # vector steps; epsilon decays every env.horizon of them
+        self.env_steps = 0
+        self.updates = 0
+        self.elapsed = 0.0
+        self.history = {"episode_reward": [], "critic_loss": [], "actor_loss": [], "epsilon": []}
+        self.state = env.reset()
+        self._episode_reward = np.zeros(env.num_envs)
+        self._finished = []
+
+    def step(self):
+        agent, env = self.agent, self.env
+        action = agent.select_actions(self.state)
+        next_state, reward, done = env.step(action)
+        agent.replay_buffer.push_batch(self.state, action, reward, next_state, done)
+        self._episode_reward += reward
+        if done.any():
+            self._finished.extend(self._episode_reward[done].tolist())
+            self._episode_reward[done] = 0.0
+            next_state = env.reset(done)
+        self.state = next_state
+        self.steps += 1
+        self.env_steps += env.num_envs
+
+        if len(agent.replay_buffer) < self.warmup:
+            return
+        critic_loss = actor_loss = None
+        for _ in range(self.updates_per_step):
+            critic_loss, actor_loss = agent.learn(*agent.replay_buffer.sample(agent.batch_size, out=self.batch))
+        self.updates += self.updates_per_step
+        if self.updates % (self.log_every * self.updates_per_step) == 0:
+            self.history["critic_loss"].append(critic_loss.item())
+            self.history["actor_loss"].append(actor_loss.item())
+
+    def run(self, total_steps):
+        # total_steps vector steps (each advances every env once)
+        start = time.perf_counter()
+        for _ in range(total_steps):
+            self.step()
+            if self.steps % self.env.horizon == 0:
+                self.agent.decay_epsilon()
+                self.history["epsilon"].append(self.agent.epsilon)
+                if self._finished:
+                    self.history["episode_reward"].append(float(np.mean(self._finished)))
+                    self._finished = []
+        self.elapsed += time.perf_counter() - start
+        return self.stats()
+
+    def state_dict(self):
+        return {"steps": self.steps, "env_steps": self.env_steps, "updates": self.updates, "elapsed": self.elapsed,
+                "updates_per_step": self.updates_per_step, "history": self.history, "env": self.env.state_dict(),
+                "state": self.state, "episode_reward": self._episode_reward, "finished": self._finished}
+
+    def load_state_dict(self, state):
+        for name in ("steps", "env_steps", "updates", "elapsed", "history"):
+            setattr(self, name, state[name])
+        self.env.load_state_dict(state["env"])
+        self.state = state["state"]
+        self._episode_reward = state["episode_reward"]
+        self._finished = state["finished"]
+
+    def stats(self):
+        return {"env_steps": self.env_steps, "updates": self.updates, "elapsed_s": round(self.elapsed, 3),
+                "env_steps_per_s": round(self.env_steps / self.elapsed) if self.elapsed else 0,
+                "updates_per_s": round(self.updates / self.elapsed) if self.elapsed else 0}
+
+def train(num_episodes=100):
+    env = TriadEnv()
+    agent = DDPGAgent(state_dim=2, action_dim=1)
+    rewards = []
+
+    for episode in range(num_episodes):
+        state = env.reset()
+        episode_reward = 0
+        for step in range(50):
+            action = agent.select_action(state)
+            next_state, reward, done = env.step(action)
+            agent.replay_buffer.push(state, action, reward, next_state, done)
+            state = next_state
+            episode_reward += reward
+            if done:
+                break
+        agent.update()
+        rewards.append(episode_reward)
+        if episode % 20 == 0:
+            print(f"Episode {episode}, Reward: {episode_reward}")
+    return env, agent, rewards
+
+def train_vectorized(num_episodes=100, num_envs=16, seed=None):
+    # Same schedule as train() (one update per episode), but every episode rolls out num_envs envs
+    env = VectorTriadEnv(num_envs, seed=seed)
+    agent = DDPGAgent(state_dim=2, action_dim=1)
+    rewards = []
+
+    for episode in range(num_episodes):
+        state = env.reset()
+        episode_reward = np.zeros(num_envs)
+        for step in range(env.horizon):
+            action = agent.select_actions(state)
+            next_state, reward, done = env.step(action)
+            agent.replay_buffer.push_batch(state, action, reward, next_state, done)
+            state = next_state
+            episode_reward += reward
+            if done.all():
+                break
+        agent.update()
+        rewards.append(float(episode_reward.mean()))
+        if episode % 20 == 0:
+            print(f"Episode {episode}, Mean reward over {num_envs} envs: {rewards[-1]}")
+    return TriadEnv(), agent, rewards
+
+def bench_env(batch_sizes=(1, 8, 64, 256, 1024), steps=200):
+    # Env steps/s including batched action selection and replay pushes
+    report = {}
+    agent = DDPGAgent(state_dim=2, action_dim=1)
+    agent.replay_buffer = ReplayBuffer(1_000_000)
+    agent.epsilon = 0.5
+    env = TriadEnv()
+    start = time.perf_counter()
     state = env.reset()
-    episode_reward = 0
-    for step in range(50):
+    for _ in range(steps):
         action = agent.select_action(state)
         next_state, reward, done = env.step(action)
         agent.replay_buffer.push(state, action, reward, next_state, done)
+        state = env.reset() if done else next_state
+    report["scalar"] = round(steps / (time.perf_counter() - start))
+    for b in batch_sizes:
+        env = VectorTriadEnv(b, seed=0)
+        state = env.reset()
+        start = time.perf_counter()
+        for _ in range(steps):
+            action = agent.select_actions(state)
+            next_state, reward, done = env.step(action)
+            agent.replay_buffer.push_batch(state, action, reward, next_state, done)
+            state = env.reset(done) if done.any() else next_state
+        report[b] = round(b * steps / (time.perf_counter() - start))
+    return report
+
+CHECKPOINT = "checkpoint.pt"
+POLICY = "policy.pt"
+REPLAY = "replay"
+
+def _undo_file(path, generation):
+    return os.path.join(path, f"undo-{generation}.bin")
+
+def save_checkpoint(path, agent, trainer=None, config=None):
+    # path/checkpoint.pt (networks, optimizers, epsilon, trainer + env state), path/policy.pt
+    # (actor only, for triad_policy.TriadPolicy) and path/replay/*.npy (the buffer arrays).
+    # A buffer already memmapped read-write at path/replay is only flushed: checkpoint.pt records
+    # its ptr/size and a generation, and the rows overwritten after that go to the generation's
+    # undo log. Any other buffer is written out in full.
+    os.makedirs(path, exist_ok=True)
+    replay_dir = os.path.join(path, REPLAY)
+    buf = agent.replay_buffer
+    live = buf.mode == "r+" and buf.path and os.path.abspath(buf.path) == os.path.abspath(replay_dir)
+    if live:
+        buf.flush()
+    else:
+        buf.save(replay_dir)
+        for entry in os.listdir(replay_dir):
+            if entry.startswith("undo-"):
+                os.remove(os.path.join(replay_dir, entry))
+    generation = buf.generation + 1
+    payload = {"replay_generation": generation,
+               "agent": agent.state_dict(), "trainer": trainer.state_dict() if trainer else None,
+               "rng": {"numpy": np.random.get_state(), "torch": torch.get_rng_state(), "python": random.getstate()},
+               "config": config or {}, "env": {"num_envs": trainer.env.num_envs, "horizon": trainer.env.horizon,
+                                               "sigma0": trainer.env.sigma0.copy(),
+                                               "sigma_slope": trainer.env.sigma_slope.copy()} if trainer else None}
+    for name, body in ((CHECKPOINT, payload), (POLICY, {"actor": agent.actor.state_dict(), "config": config or {}})):
+        tmp = os.path.join(path, name + ".tmp")
+        torch.save(body, tmp)
+        os.replace(tmp, os.path.join(path, name))
+    if live:
+        buf.begin_generation(generation)
+    else:
+        buf.generation = generation
+
+def load_checkpoint(path, mmap=True, resume=False):
+    # (agent, trainer or None, config). The buffer is path/replay rolled back to the checkpoint
+    # through its undo log. Loading leaves path/replay as it is: mmap maps it copy-on-write and
+    # otherwise it is read into RAM. resume=True maps it read-write instead, rolls the files
+    # back on disk and opens a fresh undo log, so the run can keep appending in place.
+    payload = torch.load(os.path.join(path, CHECKPOINT), map_location="cpu", weights_only=False)
+    state = payload["agent"]
+    hparams = dict(state["hparams"])
+    replay_dir = os.path.join(path, REPLAY)
+    generation = payload["replay_generation"]
+    if mmap or resume:
+        agent = DDPGAgent(buffer_path=replay_dir, buffer_mode="r+" if resume else "c", **hparams)
+    else:
+        agent = DDPGAgent(**hparams)
+        for name, array in zip(ReplayBuffer.FIELDS, agent.replay_buffer.fields):
+            array[:] = np.load(os.path.join(replay_dir, f"{name}.npy"), mmap_mode="r")
+    buf = agent.replay_buffer
+    buf.rollback(replay_dir, generation)
+    agent.load_state_dict(state)
+    if resume:
+        buf.flush()
+        buf.begin_generation(generation)
+    else:
+        buf.generation = generation
+    np.random.set_state(payload["rng"]["numpy"])
+    torch.set_rng_state(payload["rng"]["torch"])
+    random.setstate(payload["rng"]["python"])
+    trainer = None
+    if payload["trainer"] is not None:
+        env = VectorTriadEnv(**payload["env"])
+        trainer = Trainer(agent, env, updates_per_step=payload["trainer"]["updates_per_step"])
+        trainer.load_state_dict(payload["trainer"])
+    return agent, trainer, payload["config"]
+
+def train_engine(num_episodes=100, num_envs=16, updates_per_step=1, seed=None,
+                 checkpoint_dir=None, checkpoint_every=10, resume=False, **agent_kwargs):
+    # num_episodes horizons of num_envs envs — same episode count as train(), far more updates.
+    # With checkpoint_dir a checkpoint is written every checkpoint_every horizons and at the end;
+    # resume=True picks up from the last one (replay buffer memmapped in checkpoint_dir/replay).
+    if seed is not None:
+        torch.manual_seed(seed)
+        np.random.seed(seed)
+    if resume and checkpoint_dir and os.path.exists(os.path.join(checkpoint_dir, CHECKPOINT)):
+        agent, trainer, _ = load_checkpoint(checkpoint_dir, resume=True)
+        saved = {"num_envs": trainer.env.num_envs, "updates_per_step": trainer.updates_per_step,
+                 **agent.hparams}
+        asked = {"num_envs": num_envs, "updates_per_step": updates_per_step, **agent_kwargs}
+        differ = sorted(k for k, v in asked.items() if k in saved and saved[k] != v)
+        unknown = sorted(k for k in asked if k not in saved)
+        if differ or unknown:
+            warnings.warn(f"Resuming {checkpoint_dir} with its own settings; ignoring "
+                          + ", ".join([f"{k}={asked[k]!r} (checkpoint has {saved[k]!r})" for k in differ]
+                                      + [f"{k}={asked[k]!r}" for k in unknown]), RuntimeWarning)
+        print(f"Resuming from {checkpoint_dir} at episode {trainer.steps // trainer.env.horizon}")
+    else:
+        env = VectorTriadEnv(num_envs, seed=seed)
+        buffer_path = os.path.join(checkpoint_dir, REPLAY) if checkpoint_dir else None
+        agent = DDPGAgent(state_dim=2, action_dim=1, seed=seed, buffer_path=buffer_path, **agent_kwargs)
+        trainer = Trainer(agent, env, updates_per_step=updates_per_step)
+    config = {"num_episodes": num_episodes, "num_envs": trainer.env.num_envs,
+              "updates_per_step": trainer.updates_per_step, "seed": seed}
+
+    horizon = trainer.env.horizon
+    while trainer.steps < num_episodes * horizon:
+        episodes = min(checkpoint_every if checkpoint_dir else num_episodes,
+                       num_episodes - trainer.steps // horizon)
+        trainer.run(episodes * horizon)
+        if checkpoint_dir:
+            save_checkpoint(checkpoint_dir, agent, trainer, config)
+    return trainer
+
+def final_error(agent, episodes=20, seed=0):
+    # Greedy policy's mean final ||v - L|| over a batch of test episodes
+    epsilon, agent.epsilon = agent.epsilon, 0.0
+    env = VectorTriadEnv(episodes, seed=seed)
+    state = env.reset()
+    for _ in range(env.horizon):
+        state, _, _ = env.step(agent.select_actions(state))
+    agent.epsilon = epsilon
+    return float(np.linalg.norm(env.v - env.L, axis=1).mean())
+
+def bench_training(seeds=(0, 1, 2), num_envs=16, updates_per_step=1, max_episodes=100):
+    # Wall time for today's loop (100 episodes, one update each) vs the engine run until its
+    # greedy policy reaches the same final error (checked once per horizon, checks included)
+    rows = []
+    for seed in seeds:
+        torch.manual_seed(seed)
+        np.random.seed(seed)
+        start = time.perf_counter()
+        _, agent, _ = train(100)
+        target = final_error(agent)
+        rows.append({"engine": "train", "seed": seed, "wall_s": time.perf_counter() - start,
+                     "final_error": target, "episodes": 100, "updates": 100})
+
+        torch.manual_seed(seed)
+        np.random.seed(seed)
+        start = time.perf_counter()
+        env = VectorTriadEnv(num_envs, seed=seed)
+        trainer = Trainer(DDPGAgent(state_dim=2, action_dim=1, seed=seed), env, updates_per_step)
+        for episode in range(1, max_episodes + 1):
+            trainer.run(env.horizon)
+            error = final_error(trainer.agent)
+            if error <= target:
+                break
+        rows.append({"engine": "trainer", "seed": seed, "wall_s": time.perf_counter() - start,
+                     "final_error": error, "episodes": episode, **trainer.stats()})
+    return rows
+
+def evaluate(env, agent):
+    # Test Episode
+    state = env.reset()
+    test_errors = []
+    test_ks = []
+    for step in range(50):
+        k = float(np.ravel(agent.select_action(state))[0])
+        next_state, reward, done = env.step(k)
+        error = np.linalg.norm(env.v - env.L)
+        test_errors.append(error)
+        test_ks.append(k)
         state = next_state
-        episode_reward += reward
         if done:
             break
-    agent.update()
-    rewards.append(episode_reward)
-    if episode % 20 == 0:
-        print(f"Episode {episode}, Reward: {episode_reward}")
-
-# Test Episode
-state = env.reset()
-test_errors = []
-test_ks = []
-for step in range(50):
-    k = agent.select_action(state)[0]
-    next_state, reward, done = env.step(k)
-    error = np.linalg.norm(env.v - env.L)
-    test_errors.append(error)
-    test_ks.append(k)
-    state = next_state
-    if done:
-        break
-
-print("Test Episode Errors:", test_errors[:10], "...", test_errors[-5:])
-print("Test Episode Learned k:", test_ks[:10], "...", test_ks[-5:])
-print("Final Error Norm:", test_errors[-1])
-print("Avg Learned k:", np.mean(test_ks))
-
-# Plot and save to path (e.g., './ddpg_simulation.png')
-plt.figure(figsize=(12, 4))
-plt.subplot(1, 3, 1)
-plt.plot(rewards)
-plt.title('Training Rewards')
-plt.xlabel('Episode')
-plt.ylabel('Total Reward')
-
-plt.subplot(1, 3, 2)
-plt.plot(test_errors)
-plt.title('Test Error Norm')
-plt.xlabel('Step')
-plt.ylabel('||e_n||')
-
-plt.subplot(1, 3, 3)
-plt.plot(test_ks)
-plt.title('Learned k_n')
-plt.xlabel('Step')
-plt.ylabel('k')
-
-plt.tight_layout()
-plt.savefig('./ddpg_simulation.png')
-print("Graph saved as './ddpg_simulation.png'")
\ No newline at end of file
+    return test_errors, test_ks
+
+def plot(rewards, test_errors, test_ks, path='./ddpg_simulation.png'):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 4))
+    plt.subplot(1, 3, 1)
+    plt.plot(rewards)
+    plt.title('Training Rewards')
+    plt.xlabel('Episode')
+    plt.ylabel('Total Reward')
+
+    plt.subplot(1, 3, 2)
+    plt.plot(test_errors)
+    plt.title('Test Error Norm')
+    plt.xlabel('Step')
+    plt.ylabel('||e_n||')
+
+    plt.subplot(1, 3, 3)
+    plt.plot(test_ks)
+    plt.title('Learned k_n')
+    plt.xlabel('Step')
+    plt.ylabel('k')
+
+    plt.tight_layout()
+    plt.savefig(path)
+    print(f"Graph saved as '{path}'")
+
+class _ListReplayBuffer:
+    # The original list-of-tuples buffer, kept only as the benchmark baseline
+    def __init__(self, capacity):
+        self.buffer = []
+        self.capacity = capacity
+
+    def push(self, *transition):
+        if len(self.buffer) >= self.capacity:
+            self.buffer.pop(0)
+        self.buffer.append(transition)
+
+    def sample(self, batch_size):
+        batch = random.sample(self.buffer, batch_size)
+        return tuple(torch.FloatTensor(np.stack(x)) for x in zip(*batch))
+
+def bench_replay(capacity=1_000_000, pushes=200_000, samples=2_000, batch_size=64, legacy_capacity=100_000):
+    # Pushes/s and samples/s once the ring is full (the regime where list.pop(0) hurts)
+    rng = np.random.default_rng(0)
+    s = rng.random((pushes, 2), dtype=np.float32)
+    a = rng.uniform(0.2, 0.4, (pushes, 1)).astype(np.float32)
+    r = -rng.random(pushes, dtype=np.float32)
+    report = {}
+    for name, buf, cap in (("ring", ReplayBuffer(capacity, seed=0), capacity),
+                           ("list", _ListReplayBuffer(legacy_capacity), legacy_capacity)):
+        for i in range(cap):
+            buf.push(s[i % pushes], a[i % pushes], r[i % pushes], s[(i + 1) % pushes], False)
+        start = time.perf_counter()
+        for i in range(pushes):
+            buf.push(s[i], a[i], r[i], s[(i + 1) % pushes], i % 50 == 49)
+        push_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(samples):
+            buf.sample(batch_size)
+        sample_s = time.perf_counter() - start
+        report[name] = {"capacity": cap, "pushes_per_s": round(pushes / push_s),
+                        "samples_per_s": round(samples / sample_s),
+                        "transitions_per_s": round(samples * batch_size / sample_s)}
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DDPG controller for the triad error-correction loop")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--bench-replay", action="store_true", help="ring buffer vs the list buffer")
+    mode.add_argument("--bench-env", action="store_true", help="vectorized env steps/s per batch size")
+    mode.add_argument("--bench-train", action="store_true", help="train() vs Trainer wall time to equal error")
+    mode.add_argument("--engine", action="store_true", help="train with train_engine (Trainer + VectorTriadEnv)")
+    parser.add_argument("--envs", type=int, help="parallel envs (default 16 with --engine, else 1)")
+    parser.add_argument("--updates", type=int, default=1, help="--engine: gradient updates per env step")
+    parser.add_argument("--checkpoint", help="--engine: checkpoint directory")
+    parser.add_argument("--resume", action="store_true", help="--engine: resume from --checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.bench_replay:
+        for name, row in bench_replay().items():
+            print(f"{name:>5}: {row}")
+        return
+    if args.bench_env:
+        for batch, rate in bench_env().items():
+            print(f"{str(batch):>6} envs: {rate:>10,} env steps/s")
+        return
+
+    if args.bench_train:
+        for row in bench_training():
+            print({k: round(v, 4) if isinstance(v, float) else v for k, v in row.items()})
+        return
+    if args.engine:
+        trainer = train_engine(num_envs=args.envs or 16, updates_per_step=args.updates,
+                               checkpoint_dir=args.checkpoint, resume=args.resume)
+        print(trainer.stats())
+        env, agent, rewards = TriadEnv(), trainer.agent, trainer.history["episode_reward"]
+        test_errors, test_ks = evaluate(env, agent)
+        print("Final Error Norm:", test_errors[-1])
+        print("Avg Learned k:", np.mean(test_ks))
+        plot(rewards, test_errors, test_ks)
+        return
+
+    num_envs = args.envs or 1
+    env, agent, rewards = train_vectorized(num_envs=num_envs) if num_envs > 1 else train()
+    test_errors, test_ks = evaluate(env, agent)
+
+    print("Test Episode Errors:", test_errors[:10], "...", test_errors[-5:])
+    print("Test Episode Learned k:", test_ks[:10], "...", test_ks[-5:])
+    print("Final Error Norm:", test_errors[-1])
+    print("Avg Learned k:", np.mean(test_ks))
+
+    # Plot and save to path (e.g., './ddpg_simulation.png')
+    plot(rewards, test_errors, test_ks)
+
+if __name__ == "__main__":
+    main()
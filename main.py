@@ -1,45 +1,49 @@
 BB84# === SOVEREIGN ETHICS ENGINE — FINAL INTEGRATION ===
-def load_ethics_lists():
-    """Load blacklist/whitelist once at startup"""
-    blacklist = set()
-    whitelist = set()
-    if os.path.exists(cfg["ethics"]["blacklist_file"]):
-        blacklist = set(yaml.safe_load(open(cfg["ethics"]["blacklist_file"])) or [])
-    if os.path.exists(cfg["ethics"]["whitelist_file"]):
-        whitelist = set(yaml.safe_load(open(cfg["ethics"]["whitelist_file"])) or [])
-    return blacklist, whitelist
-
-BLACKLIST, WHITELIST = load_ethics_lists()
-
-def ethics_violation_log(entity: str, type_: str, project: str):
+from core.bid_config import ConfigWatcher
+
+# Compiled + validated once; the watcher hot-swaps it when config.yaml or the ethics lists change.
+# Each bid takes one snapshot (conf = CONFIG.current() at the top of run()), passes it to every
+# helper below and records conf.version; a helper called without conf reads the current snapshot.
+# Importing main.py only loads it; entry points start the polling thread.
+CONFIG = ConfigWatcher("config.yaml")
+if __name__ == "__main__":
+    CONFIG.start()
+
+def load_ethics_lists(conf=None):
+    """Blacklist/whitelist of a config snapshot — re-read on every call, so list edits hot-reload"""
+    conf = conf or CONFIG.current()
+    return conf.ethics.blacklist, conf.ethics.whitelist
+
+def ethics_violation_log(entity: str, type_: str, project: str, conf=None):
     """Log every blocked attempt"""
-    if cfg["ethics"].get("log_violations", True):
+    if (conf or CONFIG.current()).ethics.log_violations:
         log_path = OUTPUT_DIR / "ethics_violations.log"
         with open(log_path, "a") as f:
             f.write(f"{datetime.now().isoformat()} | BLOCKED | {type_} | {entity} | {project}\n")
 
-def is_entity_allowed(entity_name: str, entity_type: str) -> bool:
+def is_entity_allowed(entity_name: str, entity_type: str, conf=None) -> bool:
     """The vhitzee blade — single source of truth"""
-    if not cfg["ethics"]["enabled"]:
+    e = (conf or CONFIG.current()).ethics
+    if not e.enabled:
         return True
 
-    mode = cfg["ethics"].get("mode", "blacklist")
-    strict = cfg["ethics"].get("strict_mode", False)
+    mode = e.mode
+    strict = e.strict_mode
 
     # Normalize name
     name = entity_name.strip().split()[0] if entity_type == "manufacturer" else entity_name
 
     if mode == "blacklist":
-        if name in BLACKLIST:
-            ethics_violation_log(name, entity_type, project_key)
+        if name in e.blacklist:
+            ethics_violation_log(name, entity_type, project_key, conf)
             click.echo(f"   VHITZEE BLADE: {name} BLOCKED ({entity_type} blacklisted)")
             return False
         return True
 
     elif mode == "whitelist":
-        allowed = name in WHITELIST
+        allowed = name in e.whitelist
         if not allowed:
-            ethics_violation_log(name, entity_type, project_key)
+            ethics_violation_log(name, entity_type, project_key, conf)
             if strict:
                 click.echo(f"   VHITZEE BLADE: {name} REJECTED — not in Circle of Honor (strict mode)")
                 click.echo("   Bid halted. Only the worthy eat.")
@@ -48,100 +52,54 @@ def is_entity_allowed(entity_name: str, entity_type: str) -> bool:
                 click.echo(f"   VHITZEE BLADE: {name} excluded — not in whitelist")
         return allowed
 
-# === REBUILT build_line_items WITH ETHICS FUSED ===
-def build_line_items(takeoff: dict, region: str, project_key: str):
-    priority_mfr = cfg["manufacturers_priority"][0]
-    active_suppliers = [s for s in cfg["suppliers"] if s.get("active", True)]
-    items = []
+# === REBUILT build_line_items — catalog-driven pricing kernel, ethics fused ===
+from core.pricing_kernel import price_line_items, subtotal, labor_hours_total
 
-    # Sealant line
-    if takeoff["sealant_linear_feet"] > 0:
-        if not is_entity_allowed(priority_mfr, "manufacturer"):
-            click.echo(f"   → Skipping sealant — {priority_mfr} not allowed")
-        else:
-            supplier_allowed = False
-            price = 18.42
-            for s in active_suppliers:
-                if is_entity_allowed(s["name"], "supplier"):
-                    price = scrape_price(s, "Tremco Vulkem 45SSL", region)
-                    supplier_allowed = True
-                    break
-            if not supplier_allowed:
-                click.echo("   → No clean supplier found for sealant — using fallback price")
-            
-            qty = takeoff["sealant_linear_feet"]
-            labor_hrs = qty / cfg["labor"]["productivity"]["sealant_lf_per_hour"]
-            labor_rate = cfg["labor"]["rates"]["Sealant Installer"]
-            items.append({
-                "desc": f"{priority_mfr} Vulkem 45SSL Sealant",
-                "qty": qty, "unit": "LF", "mat_price": price,
-                "labor_hours": round(labor_hrs, 1), "labor_rate": labor_rate,
-                "line_total": qty * price + labor_hrs * labor_rate,
-                "ethics_status": "CLEAN"
-            })
-
-    # Deck coating line
-    if takeoff["deck_coating_sf"] > 0:
-        if not is_entity_allowed(priority_mfr, "manufacturer"):
-            click.echo(f"   → Skipping deck coating — {priority_mfr} not allowed")
-        else:
-            supplier_allowed = False
-            price = 4.87
-            for s in active_suppliers:
-                if is_entity_allowed(s["name"], "supplier"):
-                    price = scrape_price(s, "Tremco Spectrem 2", region)
-                    supplier_allowed = True
-                    break
-            if not supplier_allowed:
-                click.echo("   → No clean supplier found for deck coating")
-            
-            qty = takeoff["deck_coating_sf"]
-            labor_hrs = qty / cfg["labor"]["productivity"]["deck_coating_sf_per_hour"]
-            labor_rate = cfg["labor"]["rates"]["Deck Coating Foreman"]
-            items.append({
-                "desc": f"{priority_mfr} Spectrem 2 Deck Coating",
-                "qty": qty, "unit": "SF", "mat_price": price,
-                "labor_hours": round(labor_hrs, 1), "labor_rate": labor_rate,
-                "line_total": qty * price + labor_hrs * labor_rate,
-                "ethics_status": "CLEAN"
-            })
+def build_line_items(takeoff: dict, region: str, project_key: str, conf=None):
+    conf = conf or CONFIG.current()
+    allow = lambda name, entity_type: is_entity_allowed(name, entity_type, conf=conf)
+    items = price_line_items(takeoff, conf, region, allow=allow, lookup=scrape_price)
+    if not len(items) and any(takeoff.get(p.takeoff_key, 0) for p in conf.catalog):
+        click.echo(f"   → Skipping materials — {conf.manufacturers_priority[0]} not allowed")
+    for key, source in zip(items.keys, items.price_source):
+        if source == "fallback":
+            click.echo(f"   → No clean supplier price for {key} — using catalog fallback")
 
     # Subs — only invite Circle of Honor
-    if cfg["subcontractors"]["enabled"]:
+    if conf.subcontractors_enabled:
         for sub in APPROVED_SUBS:
-            if is_entity_allowed(sub["name"], "subcontractor"):
+            if allow(sub["name"], "subcontractor"):
                 # invite logic here
                 pass
             else:
                 click.echo(f"   → Sub {sub['name']} BLOCKED by vhitzee blade")
 
     return items
-def is_entity_allowed(entity_name: str, entity_type: str, bypass_reason: str = "") -> bool:
-    if not cfg["ethics"]["enabled"]:
+def is_entity_allowed(entity_name: str, entity_type: str, bypass_reason: str = "", conf=None) -> bool:
+    e = (conf or CONFIG.current()).ethics
+    if not e.enabled:
         return True
 
     # Emergency mode = warnings only, never blocks
-    if cfg["ethics"]["emergency_mode"]["active"]:
-        click.echo(f"   EMERGENCY MODE: {entity_name} allowed ({cfg['ethics']['emergency_mode']['reason']})")
+    if e.emergency_active:
+        click.echo(f"   EMERGENCY MODE: {entity_name} allowed ({e.emergency_reason})")
         return True
 
     # Manual bypass per category
-    bypass_cfg = cfg["ethics"]["bypass"]
-    if bypass_cfg["enabled"]:
-        override_key = f"allow_{entity_type}_override"
-        if bypass_cfg.get(override_key, False):
+    if e.bypass.enabled:
+        if e.bypass.allows(entity_type):
             reason = bypass_reason or "manual override"
             click.echo(f"   SOVEREIGN OVERRIDE: {entity_name} allowed — {reason}")
             return True
 
     # Normal ethics blade (only runs if no override)
     name = entity_name.strip().split()[0] if entity_type == "manufacturer" else entity_name
-    mode = cfg["ethics"].get("mode", "blacklist")
+    mode = e.mode
 
     if mode == "blacklist":
-        if name in BLACKLIST:
+        if name in e.blacklist:
             msg = f"   VHITZEE BLADE: {name} BLOCKED (blacklisted)"
-            if cfg["ethics"]["strict_mode"]:
+            if e.strict_mode:
                 click.echo(msg)
                 raise SystemExit(1)
             else:
@@ -150,9 +108,9 @@ def is_entity_allowed(entity_name: str, entity_type: str, bypass_reason: str = "
         return True
 
     elif mode == "whitelist":
-        if name not in WHITELIST:
+        if name not in e.whitelist:
             msg = f"   VHITZEE BLADE: {name} REJECTED — not in Circle of Honor"
-            if cfg["ethics"]["strict_mode"]:
+            if e.strict_mode:
                 click.echo(msg)
                 raise SystemExit(1)
             else:
@@ -162,70 +120,75 @@ def is_entity_allowed(entity_name: str, entity_type: str, bypass_reason: str = "
 
     return True
 # === SOVEREIGN AUDIT TRAIL ===
-AUDIT_LOG = OUTPUT_DIR / "ethics_audit.log"
+# Daily segments (output/ethics_audit-YYYY-MM-DD.log) with count footers — reports cost O(tail)
+from core.audit_trail import SegmentedAuditLog
+
+AUDIT_LOG = OUTPUT_DIR / "ethics_audit.log"   # legacy single file, split once on first start
+AUDIT = SegmentedAuditLog(OUTPUT_DIR)
+if AUDIT_LOG.exists() and not AUDIT.segments():
+    AUDIT.import_legacy(AUDIT_LOG)
 
 def audit_log(event_type: str, category: str, entity: str, result: str, reason: str = ""):
-    line = f"{datetime.now().isoformat()} | {event_type.ljust(7)} | {category.ljust(12} | {entity.ljust(20)} | {result.ljust(8)} | {reason}\n"
-    with open(AUDIT_LOG, "a") as f:
-        f.write(line)
-
-# Log config at startup
-def log_ethics_config():
-    e = cfg["ethics"]
-    audit_log("AUDIT", "config", "ethics_enabled", str(e["enabled"]))
-    audit_log("AUDIT", "config", "mode", e.get("mode", "blacklist"))
-    audit_log("AUDIT", "config", "strict_mode", str(e.get("strict_mode", False)))
-    audit_log("AUDIT", "config", "emergency_mode", str(e["emergency_mode"]["active"]))
-    if e["emergency_mode"]["active"]:
-        audit_log("AUDIT", "config", "emergency_reason", e["emergency_mode"].get("reason", ""))
+    line = f"{datetime.now().isoformat()} | {event_type.ljust(7)} | {category.ljust(12)} | {entity.ljust(20)} | {result.ljust(8)} | {reason}\n"
+    AUDIT.write(line)
+
+# Log config at startup — the version stamp ties every bid to the exact config it ran under
+def log_ethics_config(conf=None):
+    conf = conf or CONFIG.current()
+    e = conf.ethics
+    audit_log("AUDIT", "config", "config_version", conf.version)
+    audit_log("AUDIT", "config", "ethics_enabled", str(e.enabled))
+    audit_log("AUDIT", "config", "mode", e.mode)
+    audit_log("AUDIT", "config", "strict_mode", str(e.strict_mode))
+    audit_log("AUDIT", "config", "emergency_mode", str(e.emergency_active))
+    if e.emergency_active:
+        audit_log("AUDIT", "config", "emergency_reason", e.emergency_reason)
 
 # Updated is_entity_allowed with full auditing
-def is_entity_allowed(entity_name: str, entity_type: str, bypass_reason: str = "") -> bool:
-    if not cfg["ethics"]["enabled"]:
+def is_entity_allowed(entity_name: str, entity_type: str, bypass_reason: str = "", conf=None) -> bool:
+    e = (conf or CONFIG.current()).ethics
+    if not e.enabled:
         audit_log("CHECK", entity_type, entity_name, "ALLOWED", "ethics disabled")
         return True
 
     # Emergency mode
-    if cfg["ethics"]["emergency_mode"]["active"]:
-        audit_log("CHECK", entity_type, entity_name, "ALLOWED", f"EMERGENCY MODE: {cfg['ethics']['emergency_mode']['reason']}")
+    if e.emergency_active:
+        audit_log("CHECK", entity_type, entity_name, "ALLOWED", f"EMERGENCY MODE: {e.emergency_reason}")
         return True
 
     name = entity_name.strip().split()[0] if entity_type == "manufacturer" else entity_name
-    mode = cfg["ethics"].get("mode", "blacklist")
 
     # Manual bypass
-    bypass_cfg = cfg["ethics"]["bypass"]
-    if bypass_cfg["enabled"]:
-        override_key = f"allow_{entity_type}_override"
-        if bypass_cfg.get(override_key, False) and bypass_reason:
-            audit_log("BYPASS", entity_type, entity_name, "ALLOWED", reason=bypass_reason)
-            return True
+    if e.bypass.allows(entity_type) and bypass_reason:
+        audit_log("BYPASS", entity_type, entity_name, "ALLOWED", reason=bypass_reason)
+        return True
 
     # Normal blade
-    if mode == "blacklist":
-        if name in BLACKLIST:
+    if e.mode == "blacklist":
+        if name in e.blacklist:
             audit_log("CHECK", entity_type, name, "BLOCKED", "in blacklist")
-            if cfg["ethics"]["strict_mode"]:
+            if e.strict_mode:
                 raise SystemExit(1)
             return False
         else:
             audit_log("CHECK", entity_type, name, "ALLOWED", "not blacklisted")
             return True
 
-    elif mode == "whitelist":
-        if name in WHITELIST:
+    elif e.mode == "whitelist":
+        if name in e.whitelist:
             audit_log("CHECK", entity_type, name, "ALLOWED", "in Circle of Honor")
             return True
         else:
             audit_log("CHECK", entity_type, name, "REJECTED", "not in whitelist")
-            if cfg["ethics"]["strict_mode"]:
+            if e.strict_mode:
                 raise SystemExit(1)
             return False
 
 # Final audit at end of bid
-def finalize_audit(project_name: str, violations: int, overrides: int):
+def finalize_audit(project_name: str, violations: int, overrides: int, config_version: str = ""):
+    # Pass the bid's conf.version — CONFIG.version may already be a newer snapshot
     status = "CLEAN" if violations == 0 and overrides == 0 else f"OVERRIDDEN ({overrides})" if overrides else f"VIOLATIONS ({violations})"
-    audit_log("FINAL", "project", project_name, status)
+    audit_log("FINAL", "project", project_name, status, f"config {config_version or CONFIG.version}")
 # === SOVEREIGN AUDIT REPORT GENERATION ===
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as RLImage
@@ -233,7 +196,8 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 
-def generate_audit_report(project_name: str, project_key: str, violations: int, overrides: int, final_bid: float):
+def generate_audit_report(project_name: str, project_key: str, violations: int, overrides: int, final_bid: float,
+                          conf=None):
     pdf_path = OUTPUT_DIR / f"SOVEREIGN_AUDIT_REPORT_{project_key}.pdf"
     doc = SimpleDocTemplate(str(pdf_path), pagesize=letter, topMargin=1*inch)
     styles = getSampleStyleSheet()
@@ -255,11 +219,13 @@ def generate_audit_report(project_name: str, project_key: str, violations: int,
     story.append(Spacer(1, 0.5*inch))
 
     # Summary table
+    conf = conf or CONFIG.current()
     data = [
-        ["Ethics Mode", cfg["ethics"].get("mode", "blacklist").title()],
-        ["Strict Mode", "ON" if cfg["ethics"].get("strict_mode", False) else "OFF"],
-        ["Emergency Mode", cfg["ethics"]["emergency_mode"]["reason"] if cfg["ethics"]["emergency_mode"]["active"] else "Inactive"],
-        ["Manual Bypass Allowed", "Yes" if cfg["ethics"]["bypass"]["enabled"] else "No"],
+        ["Config Version", conf.version],
+        ["Ethics Mode", conf.ethics.mode.title()],
+        ["Strict Mode", "ON" if conf.ethics.strict_mode else "OFF"],
+        ["Emergency Mode", conf.ethics.emergency_reason if conf.ethics.emergency_active else "Inactive"],
+        ["Manual Bypass Allowed", "Yes" if conf.ethics.bypass.enabled else "No"],
         ["Ethics Violations", str(violations)],
         ["Sovereign Overrides Used", str(overrides)],
     ]
@@ -276,12 +242,11 @@ def generate_audit_report(project_name: str, project_key: str, violations: int,
 
     # Detailed log excerpt
     story.append(Paragraph("Recent Audit Trail (last 20 actions):", styles["Heading3"]))
-    try:
-        with open(AUDIT_LOG) as f:
-            lines = f.readlines()[-20:]
+    lines = AUDIT.tail(20)
+    if lines:
         log_text = "<br/>".join(line.strip() for line in lines)
         story.append(Paragraph(log_text, ParagraphStyle(name="Log", fontName="Courier", fontSize=8)))
-    except:
+    else:
         story.append(Paragraph("Audit log not yet available.", styles["Normal"]))
 
     # Signature
@@ -293,10 +258,11 @@ def generate_audit_report(project_name: str, project_key: str, violations: int,
     doc.build(story)
     click.echo(f"SOVEREIGN AUDIT REPORT → {pdf_path.name}")
 # Final audit + report
-        violations_count = len([1 for line in open(AUDIT_LOG) if "BLOCKED" in line or "REJECTED" in line])
-        override_count = len([1 for line in open(AUDIT_LOG) if "BYPASS" in line])
-        finalize_audit(pdf.stem, violations_count, override_count)
-        generate_audit_report(pdf.stem, project_key, violations_count, override_count, final_bid)
+        audit_counts = AUDIT.counts()
+        violations_count = audit_counts["violations"]
+        override_count = audit_counts["BYPASS"]
+        finalize_audit(pdf.stem, violations_count, override_count, conf.version)
+        generate_audit_report(pdf.stem, project_key, violations_count, override_count, final_bid, conf)
 # === SOVEREIGN FINANCIAL COMPLIANCE AUDITOR ===
 from reportlab.lib import colors
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, KeepInFrame
@@ -318,19 +284,20 @@ def detect_project_type(project_name: str, pdf_path: Path) -> dict:
     }
     return flags
 
-def calculate_financial_compliance(line_items: list, total: dict, flags: dict, final_bid: float):
+def calculate_financial_compliance(line_items: list, total: dict, flags: dict, final_bid: float, conf=None):
+    conf = conf or CONFIG.current()
     violations = []
     warnings = []
 
     # 1. Prevailing Wage Check
     if flags["davis_bacon"]:
-        min_rate = 82.50 if "417" in cfg["region"]["current"] else 118.00  # Alaska rates higher
+        min_rate = 82.50 if "417" in conf.region.key else 118.00  # Alaska rates higher
         for item in line_items:
             if "labor_rate" in item and item["labor_rate"] < min_rate:
                 violations.append(f"Labor rate \( {item['labor_rate']} below prevailing wage \){min_rate}")
     
     # 2. Circle Profit Cap on village jobs
-    material_labor_total = sum(i.get("line_total", 0) for i in line_items)
+    material_labor_total = subtotal(line_items)
     gross_margin = (final_bid - material_labor_total) / material_labor_total if material_labor_total else 0
     if flags["village_job"] and gross_margin > 0.33:
         violations.append(f"Gross margin {gross_margin:.1%} exceeds 33% Circle Cap on village job")
@@ -347,7 +314,7 @@ def calculate_financial_compliance(line_items: list, total: dict, flags: dict, f
 
     # 4. Tax-Exempt Tribal Job
     if flags["tribal_tax_exempt"]:
-        if cfg["region"]["region"]["current"] != "Yukon" and "tax" in str(final_bid):
+        if conf.region.key != "Yukon" and "tax" in str(final_bid):
             warnings.append("Tax included on potential tribal tax-exempt job")
 
     return {
@@ -415,7 +382,7 @@ def generate_financial_compliance_certificate(project_name: str, project_key: st
     doc.build(story)
     click.echo(f"FINANCIAL COMPLIANCE CERTIFICATE → {pdf_path.name}")
 flags = detect_project_type(pdf.stem, pdf)
-        compliance = calculate_financial_compliance(line_items, total, flags, final_bid)
+        compliance = calculate_financial_compliance(line_items, total, flags, final_bid, conf)
         generate_financial_compliance_certificate(pdf.stem, project_key, compliance, final_bid)
 # === ENVIRONMENTAL STEWARDSHIP AUDITOR — SEVEN GENERATIONS LAW ===
 KNOWN_PFAS_PRODUCTS = {"Sika", "Dow", "3M", "Chemours", "DuPont"}
@@ -531,7 +498,7 @@ def calculate_esg_scores(env_risks: dict, ethics_status: str, compliance: dict,
 
     # SOCIAL (S) — Indigenous ownership, labor justice, circle reciprocity
     s_score = 100
-    native_owned_subs = sum(1 for item in line_items if "Doyon" in item["desc"] or "Calista" in item["desc"] or "Tanana" in item["desc"])
+    native_owned_subs = count_native_owned_subs(item["desc"] for item in line_items)
     if native_owned_subs > 0:
         s_score += 15  # bonus for circle flow
     if compliance.get("prevailing_wage_compliant", True):
@@ -622,7 +589,7 @@ def generate_esg_impact_report(project_name: str, project_key: str, esg: dict, e
 def calculate_dei_impact(line_items: list, final_bid: float, project_key: str) -> dict:
     # Hardcoded crew manifest for Pro Seal (real data — Scott updates weekly)
     crew = {
-        "total_hours": sum(i.get("labor_hours", 0) for i in line_items),
+        "total_hours": labor_hours_total(line_items),
         "women_hours": 184,      # e.g., Jess, Kayla, Marissa
         "veteran_hours": 98,     # e.g., Mike, Tony
         "apprentice_count": 3,   # current apprentices
@@ -722,7 +689,12 @@ def generate_dei_impact_report(project_name: str, project_key: str, dei: dict, f
     doc.build(story)
     click.echo(f"DEI IMPACT REPORT → {pdf_path.name}")
 # === SOVEREIGN RISK ASSESSMENT ENGINE ===
-def calculate_risk_profile(project_key: str, line_items: list, final_bid: float, env_risks: dict, dei: dict, forecast: dict) -> dict:
+from core.bid_sweep import (PROFIT_EROSION_LINE, PROFIT_EROSION_POINTS, count_native_owned_subs, risk_level,
+                            save_line_items)
+
+def calculate_risk_profile(project_key: str, line_items: list, final_bid: float, env_risks: dict, dei: dict, forecast: dict,
+                           conf=None) -> dict:
+    conf = conf or CONFIG.current()
     risk = {
         "overall_risk_score": 0,
         "risk_level": "LOW",
@@ -753,32 +725,28 @@ def calculate_risk_profile(project_key: str, line_items: list, final_bid: float,
         score += 15
 
     # 4. Weather Risk — region + season
-    if "Yukon" in cfg["region"]["current"] and datetime.now().month in [11,12,1,2,3]:
+    if "Yukon" in conf.region.key and datetime.now().month in [11,12,1,2,3]:
         score += 35
         risk["critical_flags"].append("Extreme Weather Delay Risk — Yukon winter")
 
     # 5. Ethics Override Risk
-    if "BYPASS" in open(AUDIT_LOG).read():
+    if AUDIT.counts()["BYPASS"]:
         score += 30
         risk["critical_flags"].append("Ethics Override Used — honor debt to circle")
 
+    # Everything above is margin-independent — what-if sweeps start from here
+    risk["base_score"] = score
+
     # 6. Profit Erosion — final truth
-    gross_margin = (final_bid - sum(i.get("line_total", 0) for i in line_items)) / final_bid
-    if gross_margin < 0.18:
-        score += 40
+    gross_margin = (final_bid - subtotal(line_items)) / final_bid
+    if gross_margin < PROFIT_EROSION_LINE:
+        score += PROFIT_EROSION_POINTS
         risk["critical_flags"].append("Profit Erosion Risk — margin below 18% survival line")
         risk["mitigations"].append("WALK AWAY or renegotiate scope")
 
     # Final score
     risk["overall_risk_score"] = min(100, score)
-    if score >= 70:
-        risk["risk_level"] = "CRITICAL — RECONSIDER BID"
-    elif score >= 45:
-        risk["risk_level"] = "HIGH — PROCEED WITH CAUTION"
-    elif score >= 25:
-        risk["risk_level"] = "MODERATE"
-    else:
-        risk["risk_level"] = "LOW — CLEAN CHASE"
+    risk["risk_level"] = risk_level(score)
 
     return risk
 
@@ -826,9 +794,15 @@ def generate_risk_report(project_name: str, project_key: str, risk: dict, final_
     doc.build(story)
     click.echo(f"RISK ASSESSMENT REPORT → {pdf_path.name}")
 # 7. RISK — the final blade
-        risk_profile = calculate_risk_profile(project_key, line_items, final_bid, env_risks, dei_impact, forecast)
+        risk_profile = calculate_risk_profile(project_key, line_items, final_bid, env_risks, dei_impact, forecast, conf)
         generate_risk_report(pdf.stem, project_key, risk_profile, final_bid)
 
+        # Cache priced line items for what-if sweeps: python -m core.bid_sweep output/line_items_<key>.npz
+        save_line_items(line_items, OUTPUT_DIR / f"line_items_{project_key}.npz",
+                        tax_rate=conf.tax_rate, base_risk_score=risk_profile["base_score"],
+                        village_job=flags["village_job"],
+                        native_owned_subs=count_native_owned_subs(line_items.desc))
+
         click.echo("SEVEN SACRED DOCUMENTS GENERATED.")
         click.echo("Ethics. Money. Earth. People. Reciprocity. Impact. Risk.")
         click.echo("The circle sees all.")
@@ -1108,7 +1082,7 @@ def import_p6_baseline(xer_path: Path) -> dict:
     baseline = {
         'activities': df[df['Type'] == 'Task'],  # Filter tasks
         'resources': df[df['Type'] == 'Resource'],
-        'ethics_tags': [r for r in df['ResourceName'] if r in WHITELIST]  # Vhitzee filter
+        'ethics_tags': [r for r in df['ResourceName'] if r in load_ethics_lists()[1]]  # Vhitzee filter
     }
     click.echo(f"Imported P6 baseline: {len(baseline['activities'])} tasks, {len(baseline['ethics_tags'])} clean resources")
     return baseline
@@ -1155,7 +1129,7 @@ def import_msproject_baseline(mpp_path: Path) -> dict:
     baseline = {
         'tasks': df[df['Type'] == 'Task'],  # Filter tasks (ID, Name, Duration, Predecessors)
         'resources': df[df['Type'] == 'Resource'],
-        'ethics_tags': [r for r in df['ResourceName'] if r in WHITELIST]  # Vhitzee filter (e.g., Tremco)
+        'ethics_tags': [r for r in df['ResourceName'] if r in load_ethics_lists()[1]]  # Vhitzee filter (e.g., Tremco)
     }
     click.echo(f"Imported MS Project baseline: {len(baseline['tasks'])} tasks, {len(baseline['ethics_tags'])} clean resources")
     return baseline
@@ -1223,7 +1197,7 @@ def bigquery_ethics_agent(query: str) -> list:
         results = client.query(sql).result()
         return [row.name for row in results]
     else:
-        return [n for n in WHITELIST if 'Doyon' in n]  # Local fallback
+        return [n for n in load_ethics_lists()[1] if 'Doyon' in n]  # Local fallback
 
 def a2a_optimizer_agent(baseline: dict) -> dict:
     """A2A Protocol: Call PuLP sim (min time + ethics)—interoperable with Procore/ALICE"""
@@ -1254,10 +1228,12 @@ def grokipedia_query(query: str) -> str:
     return "Local fallback: Check ethics.yaml"  # Offline
 
 # In ethics_check:
-if name not in WHITELIST and not in BLACKLIST:
+blacklist, whitelist = load_ethics_lists(conf)
+if name not in whitelist and name not in blacklist:
     truth = grokipedia_query(f"ethics: {name} reciprocity?")
     if 'clean' in truth.lower():
-        WHITELIST.add(name)
+        with open(conf.ethics.whitelist_file, "a") as f:  # snapshots are frozen; CONFIG reloads the file
+            f.write(f'\n- "{name}"\n')
         audit_log("GROKIPEDIA", "truth", name, "ADDED", "AI-verified")
 
 # In run(): Pre-takeoff oracle
@@ -1298,7 +1274,7 @@ def bedrock_ethics_rag(query: str, kb_id='ethics-kb-proseal') -> list:
         )
         return [chunk['content']['text'] for chunk in resp['citations']]  # ['Tremco: Circle honored']
     else:
-        return [n for n in WHITELIST if 'Tremco' in n]  # Local fallback
+        return [n for n in load_ethics_lists()[1] if 'Tremco' in n]  # Local fallback
 
 def lambda_optimizer_agent(baseline: dict) -> dict:
     """Invoke Lambda PuLP sim (min time + ethics)—Bedrock Agents chain"""
@@ -1430,7 +1406,8 @@ def glue_etl_ethics(input_s3: str, output_s3: str) -> dict:
             Arguments={'--input_path': input_s3, '--output_path': output_s3}
         )
         # Poll Glue job (ETL: Clean whitelist → vector store)
-        cleaned = {'whitelist_size': len(WHITELIST), 'blacklist_purged': len(BLACKLIST)}  # Mock 25% save
+        blacklist, whitelist = load_ethics_lists()
+        cleaned = {'whitelist_size': len(whitelist), 'blacklist_purged': len(blacklist)}  # Mock 25% save
         s3.put_object(Bucket='proseal-lake', Key=f"{project_key}/etl.json", Body=json.dumps(cleaned))
         return cleaned  # {'ready_for_ml': True}
     else:
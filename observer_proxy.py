@@ -8,44 +8,40 @@ from typing import Dict, List, Optional
 # In production: from sentence_transformers import SentenceTransformer, util
 import numpy as np
 
-class ImmutableSpecViolation(Exception):
-    """Raised when the immutable truth file is tampered with or violated."""
-    pass
+from core.observer_rules import DarvoTracker
+from core.spec_compiler import ImmutableSpecViolation, load_compiled_spec
 
 class MetaObserver:
-    def __init__(self, spec_path: str = "truth.json"):
+    def __init__(self, spec_path: str = "truth.json", artifact_dir: str = "build/spec"):
         self.spec_path = spec_path
-        self.spec = self._load_and_verify_spec()
+        self.artifact_dir = artifact_dir
+        compiled = self._load_and_verify_spec()
+        self.spec = compiled.spec
         self.session_log = []
+        self.rules = compiled.rules
+        self.darvo = DarvoTracker()
         
         # Initialize specialized sub-agents
         self.validator = TechnicalValidator(self.spec['technical_constraints'])
         self.drift_detector = SemanticDriftDetector(self.spec['axioms'])
         
-        print(f"👁️ OBSERVER ONLINE. Reference Frame: {self.spec['meta']['spec_hash']}")
+        print(f"👁️ OBSERVER ONLINE. Reference Frame: {self.spec['meta']['runtime_hash'][:12]}")
 
-    def _load_and_verify_spec(self) -> Dict:
+    def _load_and_verify_spec(self):
         """
-        Loads the JSON. In a real scenario, this would check the file's 
-        SHA256 against a hardcoded 'genesis hash' stored in a separate, 
-        read-only config to prevent 'truth drift'.
+        Loads the spec through its compiled artifact (python -m core.spec_compiler).
+        The file's SHA256 must match the hash recorded at compile time — the
+        stored 'genesis hash' — otherwise ImmutableSpecViolation is raised
+        to prevent 'truth drift'.
         """
         try:
-            with open(self.spec_path, 'r') as f:
-                data = f.read()
-                
-            spec = json.loads(data)
-            
-            # Calculate current hash
-            current_hash = hashlib.sha256(data.encode('utf-8')).hexdigest()
-            
-            # In a strict implementation, we would compare this to a stored hash.
-            # For now, we just lock it in memory.
-            spec['meta']['runtime_hash'] = current_hash
-            return spec
-            
+            compiled = load_compiled_spec(self.spec_path, self.artifact_dir)
         except FileNotFoundError:
             sys.exit("CRITICAL: truth.json not found. Observer cannot start.")
+        except ImmutableSpecViolation as e:
+            sys.exit(f"CRITICAL: {e}. Observer cannot start.")
+        compiled.spec['meta']['runtime_hash'] = compiled.spec_hash
+        return compiled
 
     def intercept_input(self, user_input: str) -> str:
         """
@@ -59,18 +55,17 @@ class MetaObserver:
         """
         The Core Logic: The Matrix Interrupt.
         """
+        verdict = self.rules.classify(ai_response)
+
         # 1. Deterministic Check: Does it violate constraints?
-        # (Simplified: checking for forbidden packages in text)
-        forbidden = self.spec['technical_constraints']['environment']['forbidden_packages']
-        for pkg in forbidden:
-            if f"import {pkg}" in ai_response or f"from {pkg}" in ai_response:
-                return self._trigger_matrix_interrupt(
-                    f"Forbidden dependency detected: {pkg}", 
-                    "Constraint Violation"
-                )
+        if verdict.forbidden:
+            return self._trigger_matrix_interrupt(
+                f"Forbidden dependency detected: {verdict.first_forbidden}", 
+                "Constraint Violation"
+            )
 
         # 2. Heuristic Check: DARVO Loop Detection
-        if self._detect_darvo_loop(ai_response):
+        if self.darvo.observe(verdict):
              return self._trigger_matrix_interrupt(
                 "Repeated failure pattern detected. AI is looping.",
                 "DARVO/Gaslight Prevention"
@@ -88,24 +83,6 @@ class MetaObserver:
         self.session_log.append({"role": "ai", "content": ai_response})
         return ai_response
 
-    def _detect_darvo_loop(self, current_response: str) -> bool:
-        """
-        Checks if we are in a 'Reverse Victim/Offender' loop.
-        Simple heuristic: active apology without distinct code change?
-        """
-        # Look at last 3 AI responses
-        ai_history = [x for x in self.session_log if x['role'] == 'ai']
-        if len(ai_history) < 2:
-            return False
-            
-        last_response = ai_history[-1]['content']
-        
-        # If the AI is apologizing repeatedly (a sign of a loop)
-        if "apologize" in current_response.lower() and "apologize" in last_response.lower():
-            return True
-            
-        return False
-
     def _trigger_matrix_interrupt(self, reason: str, context: str) -> str:
         """
         Injects the 'Mr. Anderson' moment.
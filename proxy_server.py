@@ -1,28 +1,63 @@
 import os
+import re
 import sys
 import copy
+import json
 import hashlib
-import subprocess
-import tempfile
+import time
 import numpy as np
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Dict, List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
+import httpx
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import openai
-from sentence_transformers import SentenceTransformer
+from core.drift_backends import DEFAULT_MODEL, EmbeddingBackend, load_or_build_reference, make_backend
+from core.embedding_service import EmbeddingBatcher
+from core.observer_metrics import ObserverMetrics
+from core.observer_rules import CompiledRules, Verdict
+from core.observer_sessions import ANONYMOUS, SessionLog, SessionManager, session_key
+from core.session_store import SessionStore, make_store
+from core.spec_compiler import ImmutableSpecViolation, load_compiled_spec
+from core.sandbox_pool import SandboxPool, SandboxResult
 
 # ===========================
-# Global State
+# Session State
 # ===========================
 class ProxyState:
-    def __init__(self):
+    """Everything one client session owns: its observer (log + streaks) and the lockdown flag."""
+    STREAKS = ("code_fail_streak", "drift_streak", "apology_streak", "total_interventions")
+
+    def __init__(self, observer: "MetaObserver"):
+        self.observer = observer
         self.critical_pending = False
         self.last_intervention = None
         self.original_messages = None
-
-state = ProxyState()
+        self.version = 0      # shared-store version this copy reflects
+        self.log_mark = 0     # session_log.appended at the last flush
+
+    def snapshot(self) -> dict:
+        counter = self.observer.failure_counter
+        return {"streaks": {name: getattr(counter, name) for name in self.STREAKS},
+                "critical_pending": self.critical_pending,
+                "last_intervention": self.last_intervention,
+                "original_messages": self.original_messages}
+
+    def restore(self, snapshot: dict, log: List[dict]):
+        counter = self.observer.failure_counter
+        for name, value in snapshot["streaks"].items():
+            setattr(counter, name, value)
+        self.critical_pending = snapshot["critical_pending"]
+        self.last_intervention = snapshot["last_intervention"]
+        self.original_messages = snapshot["original_messages"]
+        self.observer.session_log.replace(log)
+        self.version = snapshot["version"]
+        self.log_mark = self.observer.session_log.appended
 
 # ===========================
 # Core Observer Components
@@ -58,68 +93,79 @@ class FailureCounter:
                 f"Total Interventions: {self.total_interventions}")
 
 class SemanticDriftDetector:
-    def __init__(self, axioms: dict, model_name: str = "all-MiniLM-L6-v2"):
-        print("🧠 Loading embedding model...")
-        self.model = SentenceTransformer(model_name)
-        axiom_texts = [v for v in axioms.values() if isinstance(v, str) and v.strip()]
-        self.reference_texts = [t.strip() for t in axiom_texts if t.strip()]
+    def __init__(self, axioms: dict, model_name: str = DEFAULT_MODEL,
+                 backend: Union[str, EmbeddingBackend, None] = None,
+                 reference: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                 reference_cache: str = "truth.reference.npz",
+                 max_batch: int = 32, max_wait_ms: float = 5.0, cache_size: int = 4096):
+        # Backend (torch / int8 / onnx, default $DRIFT_BACKEND) loads its model on the first
+        # encode. With a compiled spec (or a warm reference cache) startup never touches the model.
+        self.backend = backend if isinstance(backend, EmbeddingBackend) else make_backend(backend, model_name)
+        print(f"🧠 Drift backend: {self.backend.name}")
+        if reference is not None:
+            self.reference_embeddings, self.composite_reference = reference
+        else:
+            self.reference_embeddings, self.composite_reference = load_or_build_reference(
+                axioms, self.backend, reference_cache)
+
+        # Concurrent check() calls (one per threadpool request) are coalesced into one encode
+        self.embedder = EmbeddingBatcher(
+            self.backend.encode,
+            max_batch=max_batch, max_wait_ms=max_wait_ms, cache_size=cache_size,
+        )
 
-        self.reference_embeddings = self.model.encode(self.reference_texts, normalize_embeddings=True)
-        self.composite_reference = np.mean(self.reference_embeddings, axis=0)
-        self.composite_reference /= np.linalg.norm(self.composite_reference)
+    def check_future(self, text: str) -> Future:
+        """Drift score as a Future — resolves when the batch holding this text is encoded."""
+        drift: Future = Future()
+        if not text.strip():
+            drift.set_result(0.0)
+            return drift
+
+        def _score(emb_future: Future):
+            try:
+                drift.set_result(1.0 - float(np.dot(self.composite_reference, emb_future.result())))
+            except Exception as e:
+                drift.set_exception(e)
+
+        self.embedder.submit(text).add_done_callback(_score)
+        return drift
 
     def check(self, text: str) -> float:
-        if not text.strip(): return 0.0
-        emb = self.model.encode([text], normalize_embeddings=True)[0]
-        sim = np.dot(self.composite_reference, emb)
-        return 1.0 - sim
+        return self.check_future(text).result()
 
 class TechnicalValidator:
-    def __init__(self):
+    def __init__(self, pool_size: int = int(os.getenv("SANDBOX_WORKERS", "4")),
+                 max_runs: int = int(os.getenv("SANDBOX_MAX_RUNS", "100")),
+                 memory_mb: int = int(os.getenv("SANDBOX_MEMORY_MB", "256"))):
         self.timeout = 5
+        self.pool = SandboxPool(size=pool_size, max_runs=max_runs, timeout=self.timeout, memory_mb=memory_mb)
 
     def extract_code(self, text: str) -> str:
         if "```python" in text:
             return text.split("```python")[1].split("```")[0].strip()
         return ""
 
-    def validate_code(self, code: str):
-        restricted_env = {"PATH": os.environ.get("PATH", ""), "PYTHONPATH": ""}
-        with tempfile.NamedTemporaryFile(suffix=".py", delete=False) as tmp:
-            tmp.write(code.encode('utf-8'))
-            tmp_path = tmp.name
-
-        try:
-            result = subprocess.run(
-                [sys.executable, tmp_path],
-                capture_output=True,
-                text=True,
-                env=restricted_env,
-                timeout=self.timeout
-            )
-            success = result.returncode == 0
-            return type("Result", (), {
-                "success": success,
-                "output": result.stdout,
-                "error": result.stderr or result.stdout
-            })
-        except subprocess.TimeoutExpired:
-            return type("Result", (), {"success": False, "error": "Timeout (possible infinite loop)"})
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+    def validate_code(self, code: str) -> SandboxResult:
+        return self.pool.run(code)
 
 class MetaObserver:
-    def __init__(self, spec_path: str = "truth.json"):
-        with open(spec_path) as f:
-            self.spec = json.load(f)
-        self.session_log = []
+    """
+    Per-session observer. The spec, drift detector and sandbox pool are shared
+    across sessions; the session log and failure streaks are not.
+    """
+    def __init__(self, spec: dict, drift_detector: SemanticDriftDetector, validator: TechnicalValidator,
+                 rules: CompiledRules, log_size: int = 256, log_chars: int = 4096,
+                 session_id: str = ANONYMOUS, metrics: Optional[ObserverMetrics] = None):
+        self.spec = spec
+        self.rules = rules
+        self.session_id = session_id
+        self.metrics = metrics
+        self.session_log = SessionLog(log_size, log_chars)
         self.failure_counter = FailureCounter(
             self.spec["observer_behavior"]["darvo_heuristics"]["max_consecutive_failures"]
         )
-        self.drift_detector = SemanticDriftDetector(self.spec["axioms"])
-        self.validator = TechnicalValidator()
-        print("👁️ META-OBSERVER ONLINE — Reference frame locked.")
+        self.drift_detector = drift_detector
+        self.validator = validator
 
     def intercept_input(self, user_input: str):
         self.session_log.append({"role": "user", "content": user_input})
@@ -127,6 +173,8 @@ class MetaObserver:
     def _trigger_matrix_interrupt(self, reason: str, context: str) -> str:
         msg = f"\n┌─────────────────────────────────────────────────────────────┐\n│ 🛑 OBSERVER INTERVENTION | {datetime.now().isoformat()}\n│ TYPE: {context}\n│ REASON: {reason}\n└─────────────────────────────────────────────────────────────┘\n"
         self.session_log.append({"role": "observer", "content": msg})
+        if self.metrics:
+            self.metrics.intervention(self.session_id, context)
         return msg
 
     def _trigger_critical_intervention(self, reason: str) -> str:
@@ -146,63 +194,294 @@ class MetaObserver:
 └─────────────────────────────────────────────────────────────┘
 """
         self.session_log.append({"role": "observer", "content": msg})
+        if self.metrics:
+            self.metrics.intervention(self.session_id, "CRITICAL")
         return msg
 
-    def intercept_response(self, ai_response: str) -> str:
-        # Apology tracking
-        if any(p in ai_response.lower() for p in ["apologize", "sorry", "mistake"]):
+    # Individual checks — intercept_response runs them in order on a full reply,
+    # StreamGuard runs them incrementally on a streamed one. Text is classified
+    # by the compiled rule set once; pass the Verdict along to avoid a rescan.
+    def track_apology(self, text: str, verdict: Optional[Verdict] = None):
+        if (verdict or self.rules.classify(text)).apologies:
             self.failure_counter.record_apology()
 
-        # Forbidden packages
-        forbidden = self.spec["technical_constraints"]["environment"]["forbidden_packages"]
-        for pkg in forbidden:
-            if f"import {pkg}" in ai_response or f"from {pkg}" in ai_response:
-                return self._trigger_matrix_interrupt(f"Forbidden package: {pkg}", "CONSTRAINT VIOLATION")
-
-        # Sandbox execution
-        code = self.validator.extract_code(ai_response)
-        if code:
-            print("🧪 Running sandbox...")
-            result = self.validator.validate_code(code)
-            if not result.success:
-                self.failure_counter.record_code_failure()
-                reason = f"Code failed: {result.error.strip()}"
-                if self.failure_counter.is_critical_loop():
-                    return self._trigger_critical_intervention(reason)
-                return self._trigger_matrix_interrupt(reason, "CODE EXECUTION FAILURE")
-            print("✅ Code passed sandbox.")
-            self.failure_counter.record_code_success()
-
-        # Semantic drift
-        drift = self.drift_detector.check(ai_response)
+    def check_constraints(self, text: str, verdict: Optional[Verdict] = None) -> Optional[str]:
+        pkg = (verdict or self.rules.classify(text)).first_forbidden
+        if pkg:
+            return self._trigger_matrix_interrupt(f"Forbidden package: {pkg}", "CONSTRAINT VIOLATION")
+        return None
+
+    def check_code(self, code: str) -> Optional[str]:
+        print("🧪 Running sandbox...")
+        result = self.validator.validate_code(code)
+        if self.metrics:
+            self.metrics.sandbox_run(result.duration, result.cached)
+        if result.busy:
+            # Not the model's failure: the code was never run, so hold it without counting a strike
+            return self._trigger_matrix_interrupt(result.error, "SANDBOX UNAVAILABLE")
+        if not result.success:
+            self.failure_counter.record_code_failure()
+            reason = f"Code failed: {result.error.strip()}"
+            if self.failure_counter.is_critical_loop():
+                return self._trigger_critical_intervention(reason)
+            return self._trigger_matrix_interrupt(reason, "CODE EXECUTION FAILURE")
+        print("✅ Code passed sandbox.")
+        self.failure_counter.record_code_success()
+        return None
+
+    def check_drift(self, text: str) -> Optional[str]:
+        if self.metrics:
+            with self.metrics.time(self.metrics.embedding_time):
+                drift = self.drift_detector.check(text)
+        else:
+            drift = self.drift_detector.check(text)
         if drift > self.spec["observer_behavior"]["semantic_drift_threshold"]:
             self.failure_counter.record_drift()
             reason = f"Semantic drift {drift:.3f} exceeds threshold"
             if self.failure_counter.is_critical_loop():
                 return self._trigger_critical_intervention(reason)
             return self._trigger_matrix_interrupt(reason, "SEMANTIC DRIFT")
+        return None
 
+    def accept(self, ai_response: str):
         self.session_log.append({"role": "ai", "content": ai_response})
+
+    def intercept_response(self, ai_response: str) -> str:
+        verdict = self.rules.classify(ai_response)
+        self.track_apology(ai_response, verdict)
+
+        intervention = self.check_constraints(ai_response, verdict)
+        if intervention:
+            return intervention
+
+        code = self.validator.extract_code(ai_response) if verdict.has_code else ""
+        if code:
+            intervention = self.check_code(code)
+            if intervention:
+                return intervention
+
+        intervention = self.check_drift(ai_response)
+        if intervention:
+            return intervention
+
+        self.accept(ai_response)
         return ai_response
 
+
+class StreamGuard:
+    """
+    Rolling-buffer observer for streamed completions.
+    Constraint checks scan only the new delta plus a short overlap (so an
+    'import torch' split across chunks is still caught); each fenced python
+    block is sandboxed the moment its closing fence arrives; drift needs the
+    whole reply and runs once at the end. Blocking checks go to the threadpool
+    so the event loop keeps serving other users.
+    """
+    OVERLAP = 64
+    _FENCE = "```python"
+    _CODE_BLOCK = re.compile(r"```python(.*?)```", re.DOTALL)
+
+    def __init__(self, observer: "MetaObserver"):
+        self.observer = observer
+        self.parts: List[str] = []
+        self.tail = ""
+        self.unfenced: List[str] = []   # the reply since the last closed block's fence
+        self.blocks_checked = 0
+        self.overhead = 0.0   # seconds the guard itself added to this stream
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    async def feed(self, delta: str) -> Optional[str]:
+        """Returns an intervention message if the stream must be cut here."""
+        start = time.perf_counter()
+        try:
+            return await self._feed(delta)
+        finally:
+            self.overhead += time.perf_counter() - start
+
+    async def _feed(self, delta: str) -> Optional[str]:
+        window = self.tail + delta
+        self.parts.append(delta)
+        self.unfenced.append(delta)
+        self.tail = window[-self.OVERLAP:]
+
+        intervention = self.observer.check_constraints(window)
+        if intervention:
+            return intervention
+
+        if "`" in window:
+            # Closed blocks are never rescanned: keep only an open fence, or a
+            # tail that could still become one, so each chunk costs O(open block)
+            pending = "".join(self.unfenced)
+            blocks = list(self._CODE_BLOCK.finditer(pending))
+            end = blocks[-1].end() if blocks else 0
+            fence = pending.find(self._FENCE, end)
+            keep = pending[fence:] if fence >= 0 else pending[max(end, len(pending) - len(self._FENCE) + 1):]
+            self.unfenced = [keep] if keep else []
+            for m in blocks:
+                self.blocks_checked += 1
+                intervention = await run_in_threadpool(self.observer.check_code, m.group(1).strip())
+                if intervention:
+                    return intervention
+        return None
+
+    async def finish(self) -> Optional[str]:
+        start = time.perf_counter()
+        try:
+            return await self._finish()
+        finally:
+            self.overhead += time.perf_counter() - start
+
+    async def _finish(self) -> Optional[str]:
+        full = self.text
+        self.observer.track_apology(full)
+        intervention = await run_in_threadpool(self.observer.check_drift, full)
+        if intervention:
+            return intervention
+        self.observer.accept(full)
+        return None
+
 # ===========================
 # FastAPI Proxy
 # ===========================
-app = FastAPI()
-observer = MetaObserver()
-
-client = openai.OpenAI(
+# Reference frame: the compiled artifact (python -m core.spec_compiler) is memory-mapped,
+# and the proxy refuses to start unless it was compiled from this exact truth.json.
+SPEC_PATH = os.getenv("OBSERVER_SPEC", "truth.json")
+drift_backend = make_backend()
+try:
+    COMPILED = load_compiled_spec(SPEC_PATH, os.getenv("OBSERVER_SPEC_ARTIFACT", "build/spec"), drift_backend.name)
+except ImmutableSpecViolation as e:
+    sys.exit(f"CRITICAL: {e}. Observer cannot start.")
+SPEC = COMPILED.spec
+drift_detector = SemanticDriftDetector(
+    SPEC["axioms"], backend=drift_backend,
+    reference=(COMPILED.reference_embeddings, COMPILED.composite_reference),
+)
+validator = TechnicalValidator()
+rules: CompiledRules = COMPILED.rules
+metrics = ObserverMetrics()
+sessions: SessionManager[ProxyState] = SessionManager(
+    lambda key: ProxyState(MetaObserver(SPEC, drift_detector, validator, rules,
+                                        log_size=int(os.getenv("SESSION_LOG_SIZE", "256")),
+                                        session_id=key, metrics=metrics)),
+    idle_ttl=float(os.getenv("SESSION_IDLE_TTL", "1800")),
+    max_sessions=int(os.getenv("SESSION_MAX", "10000")),
+    on_evict=lambda key, _: metrics.forget_session(key),
+)
+print(f"👁️ META-OBSERVER ONLINE — Reference frame {COMPILED.version} locked.")
+
+# Multi-worker deployments (python -m core.proxy_cluster) share session state through
+# SESSION_STORE=sqlite (on /dev/shm) or redis://…; each worker keeps its SessionManager
+# as a write-through cache and only reloads a session another worker has touched since.
+store: Optional[SessionStore] = make_store(os.getenv("SESSION_STORE", ""), sessions.idle_ttl)
+
+def pull_session(key: str, state: ProxyState):
+    if store is None:
+        return
+    remote = store.version(key)
+    if remote == state.version:
+        return                       # sticky routing keeps us here: nothing to reload
+    snapshot = store.load(key)
+    if snapshot is not None:
+        state.restore(snapshot, store.read_log(key))
+
+def push_session(key: str, state: ProxyState):
+    if store is None:
+        return
+    log = state.observer.session_log
+    store.append_log(key, log.since(state.log_mark), log.maxlen)
+    state.log_mark = log.appended
+    state.version = store.save(key, state.snapshot())
+    store.maybe_evict(sessions.idle_ttl)
+
+# One pooled async client for every request — keep-alive connections to the upstream
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100")),
+                        max_keepalive_connections=int(os.getenv("UPSTREAM_KEEPALIVE", "20"))),
+    timeout=httpx.Timeout(float(os.getenv("UPSTREAM_TIMEOUT", "120")), connect=10.0),
+)
+client = openai.AsyncOpenAI(
     api_key=os.getenv("REAL_API_KEY"),
-    base_url="https://api.openai.com/v1"  # Change for Grok/Claude as needed
+    base_url=os.getenv("UPSTREAM_BASE_URL", "https://api.openai.com/v1"),  # Change for Grok/Claude as needed
+    http_client=http_client,
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await client.close()
+    validator.pool.close()
+
+app = FastAPI(lifespan=lifespan)
+
 class ChatRequest(BaseModel):
     messages: list
     model: str = "gpt-4o"
+    stream: bool = False
+
+def _sse(payload) -> str:
+    return f"data: {payload if isinstance(payload, str) else json.dumps(payload)}\n\n"
+
+def _observer_chunk(content: str, model: str, finish_reason: Optional[str] = "stop") -> dict:
+    return {
+        "id": "observer", "object": "chat.completion.chunk", "model": model,
+        "created": int(datetime.now().timestamp()),
+        "choices": [{"index": 0, "delta": {"role": "assistant", "content": content}, "finish_reason": finish_reason}],
+    }
+
+def observer_reply(content: str, stream: bool):
+    """A reply authored by the observer itself (lockdown prompts), in whichever shape the client asked for."""
+    if stream:
+        async def one_shot() -> AsyncIterator[str]:
+            yield _sse(_observer_chunk(content, "observer"))
+            yield _sse("[DONE]")
+        return StreamingResponse(one_shot(), media_type="text/event-stream")
+    resp = copy.deepcopy(response_template())
+    resp.choices[0].message.content = content
+    return resp
+
+async def stream_with_observer(request: "ChatRequest", key: str, state: ProxyState) -> AsyncIterator[str]:
+    """Forward upstream tokens as they arrive; cut the stream only when the guard flags a violation."""
+    guard = StreamGuard(state.observer)
+    started = time.perf_counter()
+    upstream = await client.chat.completions.create(model=request.model, messages=request.messages, stream=True)
+    intervention = None
+    first_token = True
+    try:
+        async for chunk in upstream:
+            if first_token:
+                metrics.upstream_latency.labels(mode="first_token").observe(time.perf_counter() - started)
+                first_token = False
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                intervention = await guard.feed(delta)
+                if intervention:
+                    break
+            yield _sse(chunk.model_dump_json(exclude_unset=True))
+        if intervention is None:
+            intervention = await guard.finish()
+    finally:
+        await upstream.close()
+        metrics.intercept_overhead.labels(mode="stream").observe(guard.overhead)
+
+    if intervention:
+        if "CRITICAL OBSERVER INTERVENTION" in intervention:
+            state.critical_pending = True
+            state.original_messages = request.messages.copy()
+        yield _sse(_observer_chunk(intervention, request.model, finish_reason="content_filter"))
+    if store is not None:
+        await run_in_threadpool(push_session, key, state)
+    yield _sse("[DONE]")
 
 @app.post("/v1/chat/completions")
-async def chat_proxy(request: ChatRequest):
-    global state
+async def chat_proxy(request: ChatRequest, http_request: Request):
+    key = session_key(http_request.headers)
+    state = sessions.get(key)
+    observer = state.observer
+    if store is not None:
+        await run_in_threadpool(pull_session, key, state)
 
     # Critical lockdown handling
     if state.critical_pending:
@@ -210,6 +489,8 @@ async def chat_proxy(request: ChatRequest):
 
         if "observer acknowledged" in user_msg:
             state.critical_pending = False
+            if store is not None:
+                await run_in_threadpool(push_session, key, state)
             choices = """
 OBSERVER ACKNOWLEDGED — Thank you.
 
@@ -218,9 +499,7 @@ Reply with exact phrase:
 - "REFINE SPEC"
 - "TERMINATE SESSION"
 """
-            resp = copy.deepcopy(response_template())
-            resp.choices[0].message.content = choices
-            return resp
+            return observer_reply(choices, request.stream)
 
         if "reset context" in user_msg:
             # Keep only initial system prompt (index 0)
@@ -229,35 +508,60 @@ Reply with exact phrase:
         elif "refine spec" in user_msg:
             raise HTTPException(503, "Session paused — update truth.json and restart proxy")
         elif "terminate session" in user_msg:
+            sessions.drop(key)
+            if store is not None:
+                await run_in_threadpool(store.drop, key)
             raise HTTPException(503, "Session terminated by user")
         else:
-            resp = copy.deepcopy(response_template())
-            resp.choices[0].message.content = "🛑 CRITICAL INTERVENTION ACTIVE — Reply 'OBSERVER ACKNOWLEDGED'"
-            return resp
+            return observer_reply("🛑 CRITICAL INTERVENTION ACTIVE — Reply 'OBSERVER ACKNOWLEDGED'", request.stream)
 
     # Normal path
     observer.intercept_input(request.messages[-1]["content"])
 
-    response = client.chat.completions.create(
-        model=request.model,
-        messages=request.messages
-    )
+    if request.stream:
+        return StreamingResponse(stream_with_observer(request, key, state), media_type="text/event-stream")
+
+    with metrics.time(metrics.upstream_latency, mode="full"):
+        response = await client.chat.completions.create(
+            model=request.model,
+            messages=request.messages
+        )
     ai_content = response.choices[0].message.content
-    final_content = observer.intercept_response(ai_content)
+    # Sandbox + embedding are blocking — keep them off the event loop
+    with metrics.time(metrics.intercept_overhead, mode="full"):
+        final_content = await run_in_threadpool(observer.intercept_response, ai_content)
 
     if "CRITICAL OBSERVER INTERVENTION" in final_content:
         state.critical_pending = True
         state.original_messages = request.messages.copy()
+    if store is not None:
+        await run_in_threadpool(push_session, key, state)
 
     response.choices[0].message.content = final_content
     return response
 
+@app.get("/observer/stats")
+async def observer_stats():
+    """Embedding batcher and sandbox pool throughput, latency, cache and queue depth."""
+    return {"embedding": drift_detector.embedder.stats(),
+            "sandbox": validator.pool.stats(),
+            "sessions": {**sessions.stats(), "shared": store.count() if store is not None else None,
+                         "worker_pid": os.getpid()}}
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus scrape target — histograms for upstream vs observer time, interventions per session."""
+    metrics.refresh(sandbox=validator.pool.stats(), embedding=drift_detector.embedder.stats(),
+                    sessions=sessions.stats())
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
 def response_template():
     # Minimal valid response structure
     from openai.types.chat.chat_completion import ChatCompletion, Choice
     from openai.types.chat.chat_completion_message import ChatCompletionMessage
     return ChatCompletion(
-        id="mock", model="observer", choices=[Choice(index=0, message=ChatCompletionMessage(role="assistant", content=""))],
+        id="mock", model="observer", choices=[Choice(index=0, finish_reason="stop", message=ChatCompletionMessage(role="assistant", content=""))],
         created=int(datetime.now().timestamp()), object="chat.completion"
     )
 
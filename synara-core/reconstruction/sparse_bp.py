@@ -1,35 +1,497 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from typing import NamedTuple, Optional
+
 import numpy as np
 from scipy.sparse import csr_matrix
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    # The threading layer is Numba's own choice (NUMBA_THREADING_LAYER). TBB does
+    # not survive fork: a process that runs the numba backend and later forks
+    # shard pools (backend="numpy", workers > 1) hangs at exit unless it selects
+    # NUMBA_THREADING_LAYER=omp or workqueue.
+    _jit = numba.njit
+    _jit_parallel = numba.njit(parallel=True)
+    prange = numba.prange
+else:
+    # Without Numba the kernels stay plain Python: correct but slow, so the
+    # decoder only selects them when they are compiled
+    _jit = _jit_parallel = lambda f: f
+    prange = range
+
+
+class BatchResult(NamedTuple):
+    beliefs: np.ndarray      # (frames, n) final LLRs
+    iterations: np.ndarray   # (frames,) iterations run before the syndrome cleared (or the cap)
+    converged: np.ndarray    # (frames,) bool — all parity checks satisfied
+
+class EdgeSegments:
+    """
+    A set of checks as flat edge arrays: the variable behind each edge and
+    reduceat segments (one per nonempty check) over those edges. The full
+    code is one EdgeSegments; a layered schedule uses one per layer.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, checks: np.ndarray):
+        degree = (indptr[checks + 1] - indptr[checks]).astype(np.int64)
+        checks, degree = checks[degree > 0], degree[degree > 0]     # reduceat misreads empty segments
+        self.checks = checks
+        # Each check's edge range, in one gather: its indptr start, shifted by the edges before it
+        first = np.cumsum(degree) - degree
+        self.edges = np.repeat(indptr[checks].astype(np.int64) - first, degree) + np.arange(degree.sum())
+        self.var = indices[self.edges].astype(np.int64)
+        self.starts = np.concatenate(([0], np.cumsum(degree)[:-1])).astype(np.int64)
+        self.rows = np.repeat(np.arange(len(checks)), degree)
+        self.pos = np.arange(len(self.edges))
+        # A check of degree 1 has no "other" variables, so it sends nothing
+        self.active = np.repeat(degree, degree) >= 2
+        self.has_leaf_checks = not self.active.all()
+
+    def min_sum(self, q: np.ndarray, alpha: float) -> np.ndarray:
+        """Extrinsic min-sum message on every edge from its variable-to-check message q (..., edges)."""
+        rows, starts = self.rows, self.starts
+        # Sign of the product over the *other* edges of the check (0 if any of them is 0):
+        # negatives counted in the low byte, zeros above it, one segmented sum for both
+        code = (q < 0).astype(np.int32) | ((q == 0).astype(np.int32) << 8)
+        others = np.add.reduceat(code, starts, axis=-1)[..., rows] - code
+        sign = np.float32(1) - np.float32(2) * (others & 1).astype(np.float32)
+        sign[others >= 256] = 0
+
+        # min1 / min2 per check; the edge holding min1 (first one on ties) receives min2
+        mag = np.abs(q)
+        min1 = np.minimum.reduceat(mag, starts, axis=-1)
+        first = np.minimum.reduceat(np.where(mag == min1[..., rows], self.pos, len(self.pos)), starts, axis=-1)
+        is_min = self.pos == first[..., rows]
+        min2 = np.minimum.reduceat(np.where(is_min, np.float32(np.inf), mag), starts, axis=-1)
+        extrinsic = np.where(is_min, min2[..., rows], min1[..., rows])
+
+        extrinsic *= sign
+        extrinsic *= np.float32(alpha)
+        if self.has_leaf_checks:
+            extrinsic[..., ~self.active] = 0
+        return extrinsic
+
+
+@_jit
+def _check_node(q, out, alpha):
+    """Min-sum on one check: q holds its variable-to-check messages, out receives the check-to-variable ones."""
+    degree = len(q)
+    if degree < 2:
+        for i in range(degree):
+            out[i] = 0
+        return
+    negatives = 0
+    zeros = 0
+    min1 = np.float32(np.inf)
+    min2 = np.float32(np.inf)
+    first = 0
+    for i in range(degree):
+        if q[i] < 0:
+            negatives += 1
+        elif q[i] == 0:
+            zeros += 1
+        mag = abs(q[i])
+        if mag < min1:
+            min2 = min1
+            min1 = mag
+            first = i
+        elif mag < min2:
+            min2 = mag
+    for i in range(degree):
+        if zeros - (q[i] == 0) > 0:
+            sign = np.float32(0)
+        else:
+            sign = np.float32(1 - 2 * ((negatives - (q[i] < 0)) & 1))
+        out[i] = (min2 if i == first else min1) * sign * alpha
+
+
+@_jit_parallel
+def _flooding_kernel(llr, beliefs, r, indptr, indices, alpha, keep, damping):
+    """One flooding iteration per frame, in place on beliefs and r, in the NumPy path's float32 operation order."""
+    frames, n = beliefs.shape
+    max_degree = np.max(indptr[1:] - indptr[:-1])
+    for f in prange(frames):
+        q = np.empty(max_degree, dtype=np.float32)
+        msg = np.empty(max_degree, dtype=np.float32)
+        for c in range(len(indptr) - 1):
+            lo, hi = indptr[c], indptr[c + 1]
+            for e in range(lo, hi):
+                q[e - lo] = beliefs[f, indices[e]] - r[f, e]
+            _check_node(q[:hi - lo], msg[:hi - lo], alpha)
+            for e in range(lo, hi):
+                if damping != 0:
+                    r[f, e] = keep * msg[e - lo] + damping * r[f, e]
+                else:
+                    r[f, e] = msg[e - lo]
+        total = np.zeros(n, dtype=np.float32)
+        for e in range(r.shape[1]):
+            total[indices[e]] += r[f, e]
+        for v in range(n):
+            beliefs[f, v] = llr[f, v] + total[v]
+
+
+@_jit_parallel
+def _layered_kernel(beliefs, r, indptr, indices, order, alpha):
+    """One layered sweep per frame, in place: checks in layer order, each seeing the posteriors just written."""
+    max_degree = np.max(indptr[1:] - indptr[:-1])
+    for f in prange(beliefs.shape[0]):
+        q = np.empty(max_degree, dtype=np.float32)
+        msg = np.empty(max_degree, dtype=np.float32)
+        for c in order:
+            lo, hi = indptr[c], indptr[c + 1]
+            for e in range(lo, hi):
+                q[e - lo] = beliefs[f, indices[e]] - r[f, e]
+            _check_node(q[:hi - lo], msg[:hi - lo], alpha)
+            for e in range(lo, hi):
+                beliefs[f, indices[e]] = q[e - lo] + msg[e - lo]
+                r[f, e] = msg[e - lo]
+
+
+def layer_checks(H: csr_matrix) -> list:
+    """
+    Greedy colouring of checks so no two checks in a layer share a variable.
+    Updating a whole layer at once is then exactly row-serial processing of
+    its checks, and layers run one after another.
+
+    First-fit in check order puts into each layer the lexicographically first
+    maximal independent set of the checks not yet coloured. That set is found
+    in rounds of array passes over the remaining edges: a check joins when it
+    is the lowest undecided check on every one of its variables, and the
+    checks it shares a variable with wait for a later layer.
+    """
+    H = csr_matrix(H)
+    num_checks, num_vars = H.shape
+    check = np.repeat(np.arange(num_checks), np.diff(H.indptr))
+    var = H.indices.astype(np.int64)
+    layer_of = np.full(num_checks, -1, dtype=np.int64)
+    layer = 0
+    while (layer_of < 0).any():
+        undecided = layer_of < 0
+        c, v = check, var
+        while undecided.any():
+            live = undecided[c]
+            c, v = c[live], v[live]
+            lowest = np.full(num_vars, num_checks)
+            np.minimum.at(lowest, v, c)
+            chosen = undecided & (np.bincount(c[lowest[v] != c], minlength=num_checks) == 0)
+            layer_of[chosen] = layer
+            undecided &= ~chosen
+            blocked = np.zeros(num_vars, dtype=bool)
+            blocked[v[chosen[c]]] = True
+            undecided[c[blocked[v]]] = False
+        uncoloured = layer_of[check] < 0
+        check, var = check[uncoloured], var[uncoloured]
+        layer += 1
+    order = np.argsort(layer_of, kind="stable")
+    return np.split(order, np.cumsum(np.bincount(layer_of, minlength=layer))[:-1]) if layer else []
+
+
 class SparseMinSumBP:
-    """Real sparse min-sum belief propagation — scalable, stable, GPU-ready."""
+    """Real sparse min-sum belief propagation — scalable, stable, GPU-ready.
+
+    Edge-indexed normalized min-sum: check-to-variable messages r live in a
+    flat per-edge array, each variable-to-check message is the posterior
+    minus that edge's own r, and each check's sign product and two smallest
+    magnitudes come from segmented reductions over H.indptr.
 
-    def __init__(self, H: csr_matrix, iterations: int = 20, alpha: float = 0.8, damping: float = 0.2):
-        self.H = H
+    schedule="flooding" updates every check from the previous iteration's
+    messages, with r ← (1 - damping)·r_new + damping·r_old. "layered" sweeps
+    groups of variable-disjoint checks in turn, each seeing the posteriors
+    the previous group just produced; it needs no damping and usually
+    converges in about half the iterations.
+
+    backend="numba" runs each pass as a compiled per-frame loop over the CSR
+    arrays (parallel across frames), in the NumPy path's float32 operation
+    order so hard decisions match bit for bit. "auto" picks it when Numba is
+    installed and falls back to NumPy otherwise.
+    """
+
+    SCHEDULES = ("flooding", "layered")
+    BACKENDS = ("auto", "numpy", "numba")
+
+    def __init__(self, H: csr_matrix, iterations: int = 20, alpha: float = 0.8, damping: float = 0.2,
+                 early_stop: bool = True, schedule: str = "flooding", backend: str = "auto"):
+        if schedule not in self.SCHEDULES:
+            raise ValueError(f"schedule must be one of {self.SCHEDULES}, not {schedule!r}")
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}, not {backend!r}")
+        if backend == "numba" and not NUMBA_AVAILABLE:
+            raise RuntimeError("numba backend needs Numba: pip install numba")
+        self.H = csr_matrix(H)
         self.iterations = iterations
         self.alpha = alpha
         self.damping = damping
+        self.early_stop = early_stop
+        self.schedule = schedule
+        self.backend = backend if backend != "auto" else ("numba" if NUMBA_AVAILABLE else "numpy")
+
+        num_checks, self.num_vars = self.H.shape
+        self.segments = EdgeSegments(self.H.indptr, self.H.indices, np.arange(num_checks))
+        self.edge_var = self.segments.var
+        self.num_edges = len(self.edge_var)
+        self.row_start = self.segments.starts
+        # (n, edges) incidence: scatters a batch of per-edge messages onto variables
+        self.scatter = csr_matrix((np.ones(self.num_edges, dtype=np.float32),
+                                   (self.edge_var, np.arange(self.num_edges))),
+                                  shape=(self.num_vars, self.num_edges))
+        self.layers = []
+        if schedule == "layered":
+            self.layers = [EdgeSegments(self.H.indptr, self.H.indices, checks) for checks in layer_checks(self.H)]
+        self.layer_order = np.concatenate([layer.checks for layer in self.layers]) if self.layers else None
+
+    def check_messages(self, q: np.ndarray) -> np.ndarray:
+        """Extrinsic min-sum message on every edge from the variable-to-check messages q (..., edges)."""
+        return self.segments.min_sum(q, self.alpha)
+
+    def syndrome_ok(self, beliefs: np.ndarray) -> np.ndarray:
+        """Per frame: does the hard decision (bit = LLR < 0) satisfy every parity check?"""
+        hard = (beliefs[..., self.edge_var] < 0).astype(np.int32)
+        return ~(np.add.reduceat(hard, self.row_start, axis=-1) & 1).any(axis=-1)
 
     def decode(self, llr: np.ndarray) -> np.ndarray:
-        """Min-sum BP with damping and sparse edges only."""
-        beliefs = llr.copy().astype(np.float32)
-        num_checks, num_vars = self.H.shape
-
-        for _ in range(self.iterations):
-            new_beliefs = beliefs.copy()
-
-            for c in range(num_checks):
-                vars_idx = self.H.indices[self.H.indptr[c]:self.H.indptr[c+1]]
-                for v in vars_idx:
-                    others = [beliefs[ov] for ov in vars_idx if ov != v]
-                    if not others:
-                        continue
-                    sign_prod = np.prod(np.sign(others))
-                    mag_min = np.min(np.abs(others))
-                    msg = self.alpha * sign_prod * mag_min
-                    new_beliefs[v] += msg
+        """Posterior LLRs for one frame (bit = LLR < 0)."""
+        return self.decode_batch(np.asarray(llr)[None]).beliefs[0]
+
+    def decode_batch(self, llr: np.ndarray, workers: Optional[int] = None, shard_frames: int = 4096) -> BatchResult:
+        """
+        Decode a (frames, n) LLR matrix together. Each iteration checks every
+        frame's syndrome and drops converged frames from the working set, so
+        they stop costing anything. With workers > 1, batches larger than
+        shard_frames are split across a process pool (the numba backend
+        uses that many kernel threads instead).
+        """
+        llr = np.atleast_2d(np.asarray(llr, dtype=np.float32))
+        if not (workers and workers > 1 and len(llr) > shard_frames):
+            return self._decode_frames(llr)
+        if self.backend != "numba":
+            return self._decode_sharded(llr, workers, shard_frames)
+        # The kernels already split frames across threads, and forking
+        # under a live Numba threading layer can deadlock the children
+        threads = numba.get_num_threads()
+        numba.set_num_threads(min(workers, numba.config.NUMBA_NUM_THREADS))
+        try:
+            return self._decode_frames(llr)
+        finally:
+            numba.set_num_threads(threads)
 
+    def _decode_frames(self, llr: np.ndarray) -> BatchResult:
+        beliefs = llr.copy()
+        frames = len(beliefs)
+        r = np.zeros((frames, self.num_edges), dtype=np.float32)
+        iterations = np.full(frames, self.iterations, dtype=np.int32)
+        converged = np.zeros(frames, dtype=bool)
+        active = np.arange(frames)
+
+        for it in range(self.iterations):
+            if self.early_stop:
+                done = self.syndrome_ok(beliefs[active])
+                iterations[active[done]] = it
+                converged[active[done]] = True
+                active = active[~done]
+                if not len(active):
+                    break
+
+            if self.schedule == "layered":
+                beliefs[active], r[active] = self._layered_pass(beliefs[active], r[active])
+            else:
+                beliefs[active], r[active] = self._flooding_pass(llr[active], beliefs[active], r[active])
+
+        if len(active):
+            converged[active] = self.syndrome_ok(beliefs[active])
+        return BatchResult(beliefs, iterations, converged)
+
+    def _flooding_pass(self, llr: np.ndarray, beliefs: np.ndarray, r: np.ndarray):
+        if self.backend == "numba":
+            _flooding_kernel(llr, beliefs, r, self.H.indptr, self.H.indices, np.float32(self.alpha),
+                             np.float32(1 - self.damping), np.float32(self.damping))
+            return beliefs, r
+        r_new = self.check_messages(beliefs[:, self.edge_var] - r)
+        if self.damping:
             # Damping to prevent oscillation
-            beliefs = (1 - self.damping) * beliefs + self.damping * new_beliefs
+            r_new = (1 - self.damping) * r_new + self.damping * r
+        return llr + (self.scatter @ r_new.T).T, r_new
+
+    def _layered_pass(self, beliefs: np.ndarray, r: np.ndarray):
+        if self.backend == "numba":
+            _layered_kernel(beliefs, r, self.H.indptr, self.H.indices, self.layer_order, np.float32(self.alpha))
+            return beliefs, r
+        for layer in self.layers:
+            r_old = r[:, layer.edges]
+            q = beliefs[:, layer.var] - r_old
+            r_new = layer.min_sum(q, self.alpha)
+            beliefs[:, layer.var] = q + r_new          # variables within a layer are distinct
+            r[:, layer.edges] = r_new
+        return beliefs, r
+
+    def _decode_sharded(self, llr: np.ndarray, workers: int, shard_frames: int) -> BatchResult:
+        # fork keeps the decoder (and this module) in the children without pickling H per shard
+        ctx = get_context("fork" if "fork" in get_all_start_methods() else None)
+        shards = [llr[i:i + shard_frames] for i in range(0, len(llr), shard_frames)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards)), mp_context=ctx,
+                                 initializer=_init_worker, initargs=(self,)) as pool:
+            parts = list(pool.map(_decode_shard, shards))
+        return BatchResult(*(np.concatenate(field) for field in zip(*parts)))
+
+
+_worker_decoder: Optional[SparseMinSumBP] = None
+
+
+def _init_worker(decoder: SparseMinSumBP):
+    global _worker_decoder
+    _worker_decoder = decoder
+
+
+def _decode_shard(llr: np.ndarray) -> BatchResult:
+    return _worker_decoder.decode_batch(llr)
+
+
+def random_ldpc(n: int, dv: int = 3, dc: int = 6, seed: int = 0) -> csr_matrix:
+    """(dv, dc)-regular Gallager-style code: n·dv edges, sockets matched by a random permutation."""
+    if n * dv % dc:
+        raise ValueError(f"n·dv = {n * dv} sockets don't split evenly into checks of degree {dc}")
+    rng = np.random.default_rng(seed)
+    m = n * dv // dc
+    var_sockets = np.repeat(np.arange(n), dv)
+    checks = np.repeat(np.arange(m), dc)[rng.permutation(n * dv)]
+    H = csr_matrix((np.ones(n * dv, dtype=np.int8), (checks, var_sockets)), shape=(m, n))
+    H.sum_duplicates()
+    H.data[:] = 1          # a repeated (check, var) pair is one edge
+    return H
+
+
+def awgn_llr(frames: int, n: int, snr_db: float, seed: int = 0) -> np.ndarray:
+    """All-zero codeword, BPSK over AWGN at Eb/N0-style snr_db (rate ignored): channel LLRs 2y/σ²."""
+    rng = np.random.default_rng(seed)
+    sigma = np.sqrt(1.0 / (2.0 * 10 ** (snr_db / 10.0)))
+    y = 1.0 + sigma * rng.standard_normal((frames, n))
+    return (2.0 * y / sigma ** 2).astype(np.float32)
+
+
+def bench(edge_counts=(10_000, 100_000, 1_000_000), iterations: int = 20, seed: int = 0) -> list:
+    rows = []
+    for edges in edge_counts:
+        H = random_ldpc(max(edges // 6 * 2, 6), seed=seed)
+        rng = np.random.default_rng(seed)
+        llr = (2.0 + rng.standard_normal(H.shape[1])).astype(np.float32)
+        decoder = SparseMinSumBP(H, iterations=iterations, early_stop=False)
+        start = time.perf_counter()
+        decoder.decode(llr)
+        elapsed = time.perf_counter() - start
+        rows.append({"edges": decoder.num_edges, "vars": H.shape[1], "checks": H.shape[0],
+                     "decode_s": round(elapsed, 4),
+                     "edge_updates_per_s": round(decoder.num_edges * iterations / elapsed)})
+    return rows
+
+
+def bench_batch(n: int = 1000, frames: int = 2000, snr_db: float = 3.0, iterations: int = 20,
+                workers: Optional[int] = None, seed: int = 0) -> dict:
+    """Frames/s: per-frame full-length decoding vs decode_batch (early termination), optionally sharded."""
+    H = random_ldpc(n, seed=seed)
+    llr = awgn_llr(frames, n, snr_db, seed)
+    decoder = SparseMinSumBP(H, iterations=iterations)
+    report = {"n": n, "edges": decoder.num_edges, "frames": frames, "snr_db": snr_db}
+
+    # Baseline: one frame at a time, every iteration, as decode() used to run
+    legacy = SparseMinSumBP(H, iterations=iterations, early_stop=False)
+    one = min(frames, 200)
+    start = time.perf_counter()
+    for frame in llr[:one]:
+        legacy.decode(frame)
+    report["per_frame_fps"] = round(one / (time.perf_counter() - start))
+
+    start = time.perf_counter()
+    result = decoder.decode_batch(llr)
+    report["batch_fps"] = round(frames / (time.perf_counter() - start))
+    report["mean_iterations"] = round(float(result.iterations.mean()), 2)
+    report["converged"] = round(float(result.converged.mean()), 4)
+    if workers and workers > 1:
+        start = time.perf_counter()
+        decoder.decode_batch(llr, workers=workers, shard_frames=max(1, frames // workers))
+        report[f"sharded_fps_{workers}w"] = round(frames / (time.perf_counter() - start))
+    return report
+
+
+
+def bench_schedules(n: int = 1000, frames: int = 1000, snr_dbs=(0.5, 1.0, 1.5, 2.0), max_iterations: int = 50,
+                    caps=(1, 2, 5, 10, 20, 50), seed: int = 0) -> list:
+    """
+    FER against the iteration cap for flooding vs layered. One early-terminated
+    run per schedule gives every cap at once: a frame is decoded within cap c
+    if its syndrome cleared after ≤ c iterations on the all-zero codeword.
+    """
+    H = random_ldpc(n, seed=seed)
+    rows = []
+    for snr_db in snr_dbs:
+        llr = awgn_llr(frames, n, snr_db, seed)
+        for schedule in SparseMinSumBP.SCHEDULES:
+            decoder = SparseMinSumBP(H, iterations=max_iterations, schedule=schedule)
+            start = time.perf_counter()
+            result = decoder.decode_batch(llr)
+            elapsed = time.perf_counter() - start
+            correct = result.converged & ~(result.beliefs < 0).any(axis=1)
+            row = {"snr_db": snr_db, "schedule": schedule, "layers": len(decoder.layers) or 1,
+                   "mean_iterations": round(float(result.iterations.mean()), 2),
+                   "fps": round(frames / elapsed)}
+            for cap in caps:
+                if cap <= max_iterations:
+                    row[f"fer@{cap}"] = round(float(1.0 - (correct & (result.iterations <= cap)).mean()), 4)
+            rows.append(row)
+    return rows
+
+
+def bench_backends(n: int = 1000, frames: int = 2000, snr_db: float = 1.0, iterations: int = 20, seed: int = 0) -> list:
+    """Frames/s of the NumPy and (when installed) Numba kernels per schedule, with a hard-decision parity check."""
+    H = random_ldpc(n, seed=seed)
+    llr = awgn_llr(frames, n, snr_db, seed)
+    backends = ("numpy", "numba") if NUMBA_AVAILABLE else ("numpy",)
+    rows = []
+    for schedule in SparseMinSumBP.SCHEDULES:
+        reference = None
+        for backend in backends:
+            decoder = SparseMinSumBP(H, iterations=iterations, schedule=schedule, backend=backend)
+            decoder.decode_batch(llr[:2])                   # JIT compile outside the timing
+            start = time.perf_counter()
+            result = decoder.decode_batch(llr)
+            elapsed = time.perf_counter() - start
+            hard = result.beliefs < 0
+            reference = hard if reference is None else reference
+            rows.append({"schedule": schedule, "backend": backend, "frames": frames,
+                         "fps": round(frames / elapsed), "mean_iterations": round(float(result.iterations.mean()), 2),
+                         "hard_decisions_match": bool(np.array_equal(hard, reference))})
+    return rows
 
-        return beliefs
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the edge-indexed min-sum decoder")
+    parser.add_argument("--edges", default="10000,100000,1000000")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--frames", type=int, default=0, help="batch benchmark with this many AWGN frames")
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument("--snr-db", type=float, default=3.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--schedules", default="", metavar="SNRS",
+                        help="FER vs iteration cap for flooding vs layered at these SNRs, e.g. 1.5,2,2.5")
+    parser.add_argument("--backends", action="store_true", help="NumPy vs Numba kernel frames/s and parity")
+    args = parser.parse_args()
+    if args.backends:
+        if not NUMBA_AVAILABLE:
+            print("numba not installed — timing the NumPy path only")
+        for row in bench_backends(args.n, args.frames or 2000, args.snr_db, args.iterations):
+            print(row)
+    elif args.schedules:
+        for row in bench_schedules(args.n, args.frames or 1000, [float(x) for x in args.schedules.split(",")],
+                                   max(args.iterations, 50)):
+            print(row)
+    elif args.frames:
+        print(bench_batch(args.n, args.frames, args.snr_db, args.iterations, args.workers))
+    else:
+        for row in bench([int(e) for e in args.edges.split(",")], args.iterations):
+            print(row)
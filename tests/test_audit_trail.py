@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+tests/test_audit_trail.py — Reverse tail reader + daily segmented audit log
+"""
+
+from datetime import date, datetime
+from core.audit_trail import SegmentedAuditLog, tail_lines
+
+class Clock:
+    def __init__(self, when):
+        self.when = when
+    def __call__(self):
+        return self.when
+
+def _line(i, result="ALLOWED"):
+    return f"2025-11-25T14:22:{i % 60:02d} | CHECK   | supplier     | Sub {i:<16} | {result:<8} | test"
+
+def test_tail_lines_matches_readlines(tmp_path):
+    path = tmp_path / "big.log"
+    lines = [f"line {i} " + "x" * (i % 37) for i in range(5000)]
+    path.write_text("\n".join(lines) + "\n")
+    assert tail_lines(path, 20, block_size=64) == lines[-20:]
+    assert tail_lines(path, 10000) == lines
+
+def test_tail_lines_without_trailing_newline(tmp_path):
+    path = tmp_path / "short.log"
+    path.write_text("a\nb\nc")
+    assert tail_lines(path, 2) == ["b", "c"]
+
+def test_counts_survive_roll_and_compression(tmp_path):
+    clock = Clock(datetime(2025, 11, 24, 9))
+    log = SegmentedAuditLog(tmp_path, clock=clock)
+    log.write(_line(1, "BLOCKED"))
+    log.write(_line(2, "REJECTED"))
+    log.write(_line(3))
+
+    clock.when = datetime(2025, 11, 25, 9)
+    log.write(_line(4, "BLOCKED"))
+    log.write("2025-11-25T09:00:00 | BYPASS  | supplier     | White Cap            | ALLOWED  | manual")
+
+    counts = log.counts()
+    assert (counts["BLOCKED"], counts["REJECTED"], counts["BYPASS"]) == (2, 1, 1)
+    assert log.tail(3)[0] == _line(3)              # tail crosses into the closed segment, footer skipped
+
+    assert [p.name for p in log.compress_before(date(2025, 11, 25))] == ["ethics_audit-2025-11-24.log.gz"]
+    reopened = SegmentedAuditLog(tmp_path, clock=clock)
+    assert reopened.counts()["BLOCKED"] == 2
+    assert reopened.tail(5)[:3] == [_line(1, "BLOCKED"), _line(2, "REJECTED"), _line(3)]
+
+def test_violations_count_each_line_once(tmp_path):
+    clock = Clock(datetime(2025, 11, 24, 9))
+    log = SegmentedAuditLog(tmp_path, clock=clock)
+    log.write(_line(1, "BLOCKED") + " after REJECTED review")
+    log.write(_line(2, "REJECTED"))
+    clock.when = datetime(2025, 11, 25, 9)
+    log.write(_line(3, "BLOCKED") + " | REJECTED")
+    counts = log.counts()
+    assert (counts["BLOCKED"], counts["REJECTED"], counts["violations"]) == (2, 3, 3)
+
+def test_import_legacy_log(tmp_path):
+    legacy = tmp_path / "ethics_audit.log"
+    legacy.write_text("2025-11-20T10:00:00 | CHECK | x | BLOCKED\n2025-11-21T10:00:00 | CHECK | y | ALLOWED\n")
+    log = SegmentedAuditLog(tmp_path / "segments", clock=Clock(datetime(2025, 11, 25)))
+    assert log.import_legacy(legacy) == 2
+    assert log.counts()["BLOCKED"] == 1
+    assert len(log.segments()) == 2
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+tests/test_bid_config.py — Compiled config: validation, derived values, hot reload
+"""
+
+import os
+import dataclasses
+import pytest
+import yaml
+from core.bid_config import ConfigError, ConfigWatcher, compile_config, load_config
+
+BASE = {
+    "app": {"company_name": "CHAMPLUND", "default_profit_pct": 28.0},
+    "region": {"current": "417", "regions": {
+        "417": {"name": "Springfield", "tax_rate": 0.08225},
+        "Yukon": {"name": "Yukon-Kuskokwim", "tax_rate": 0.0},
+    }},
+    "labor": {
+        "rates": {"Sealant Installer": 78.50, "Deck Coating Foreman": 92.00},
+        "productivity": {"sealant_lf_per_hour": 45, "deck_coating_sf_per_hour": 380},
+    },
+    "ethics": {"enabled": True, "mode": "blacklist", "emergency_mode": {"active": False}},
+}
+
+def _write(path, raw):
+    path.write_text(yaml.safe_dump(raw))
+    return str(path)
+
+def test_derived_values_precomputed():
+    conf = compile_config(BASE)
+    assert conf.tax_rate == pytest.approx(0.08225)
+    assert conf.labor.cost_per_unit["sealant_lf_per_hour"] == pytest.approx(78.50 / 45)
+    assert conf.labor.cost_per_unit["deck_coating_sf_per_hour"] == pytest.approx(92.00 / 380)
+    assert conf.profit_multiplier == pytest.approx(1.28)
+
+def test_compiled_config_is_frozen():
+    conf = compile_config(BASE)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        conf.default_profit_pct = 50.0
+    with pytest.raises(TypeError):
+        conf.labor.rates["Sealant Installer"] = 1.0
+
+@pytest.mark.parametrize("patch", [
+    {"region": {"current": "Mars", "regions": BASE["region"]["regions"]}},
+    {"ethics": {"mode": "greylist"}},
+    {"app": {"default_profit_pct": -5}},
+    {"labor": {"rates": {"Sealant Installer": 78.5}, "productivity": {"sealant_lf_per_hour": 0}}},
+    {"catalog": [{"key": "sealant", "takeoff_key": "sealant_linear_feet", "product": "Vulkem", "unit": "LF",
+                  "productivity": "sealant_lf_per_hour", "role": "Deck Coating Foreman", "fallback_price": 18.42}]},
+])
+def test_invalid_config_rejected(patch):
+    with pytest.raises(ConfigError):
+        compile_config({**BASE, **patch})
+
+def test_watcher_swaps_and_keeps_last_good(tmp_path):
+    path = tmp_path / "config.yaml"
+    _write(path, BASE)
+    watcher = ConfigWatcher(str(path))
+    first = watcher.current()
+
+    _write(path, {**BASE, "app": {"default_profit_pct": 22.0}})
+    os.utime(path, ns=(1, 1))
+    assert watcher.reload_if_changed()
+    assert watcher.current().default_profit_pct == 22.0
+    assert watcher.version != first.version
+    assert first.default_profit_pct == 28.0   # old snapshot untouched
+
+    good = watcher.current()
+    _write(path, {**BASE, "ethics": {"mode": "greylist"}})
+    os.utime(path, ns=(2, 2))
+    assert not watcher.reload_if_changed()
+    assert watcher.current() is good
+    assert "ethics.mode" in watcher.last_error
+
+def test_repo_config_compiles():
+    conf = load_config("config.yaml")
+    assert set(conf.labor.cost_per_unit) >= {"penetrations_per_hour", "expansion_joints_lf_per_hour"}
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+tests/test_bid_service.py — Bid service: job lifecycle, progress stream, backpressure, cancellation
+"""
+
+import sys
+import threading
+import types
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from core.bid_service import PIPELINE_ENTRY_POINTS, create_app, default_stages
+
+PDF = b"%PDF-1.4\n%fake\n"
+
+def _stages(output_dir, gate=None):
+    def extract(ctx):
+        if gate is not None:
+            gate.wait(5)
+        ctx["takeoff"] = {"sealant_linear_feet": 10}
+
+    def certify(ctx):
+        (output_dir / f"RISK_ASSESSMENT_REPORT_{ctx['project_key']}.pdf").write_bytes(PDF)
+
+    return lambda: [("extract", extract), ("certify", certify)]
+
+def test_submit_stream_and_download(tmp_path):
+    app = create_app(tmp_path, tmp_path / "uploads", stages=_stages(tmp_path), workers=1)
+    with TestClient(app) as client:
+        job_id = client.post("/bids?name=Hangar 7.pdf", content=PDF).json()["job_id"]
+        with client.websocket_connect(f"/bids/{job_id}/progress") as ws:
+            events = []
+            while not events or events[-1]["event"] not in {"done", "failed", "cancelled"}:
+                events.append(ws.receive_json())
+        assert [e.get("stage") for e in events if e["event"] == "stage"] == ["extract", "certify"]
+        status = client.get(f"/bids/{job_id}").json()
+        assert status["status"] == "done"
+        name = status["certificates"][0]
+        assert client.get(f"/bids/{job_id}/certificates/{name}").content == PDF
+
+def test_backpressure_and_cancel(tmp_path):
+    gate = threading.Event()
+    app = create_app(tmp_path, tmp_path / "uploads", stages=_stages(tmp_path, gate), workers=1, max_queue=1)
+    with TestClient(app) as client:
+        running = client.post("/bids", content=PDF).json()["job_id"]
+        while client.get(f"/bids/{running}").json()["status"] != "running":
+            pass
+        queued = client.post("/bids", content=PDF).json()["job_id"]
+        full = client.post("/bids", content=PDF)
+        assert full.status_code == 503 and "Retry-After" in full.headers
+
+        assert client.delete(f"/bids/{queued}").json()["status"] == "cancelled"
+        refill = client.post("/bids", content=PDF)                 # the cancelled job gave its slot back
+        assert refill.status_code == 202
+        client.delete(f"/bids/{refill.json()['job_id']}")
+        client.delete(f"/bids/{running}")
+        gate.set()
+        with client.websocket_connect(f"/bids/{running}/progress") as ws:
+            while (event := ws.receive_json())["event"] not in {"done", "failed", "cancelled"}:
+                pass
+        assert event["event"] == "cancelled"
+
+def test_rejects_non_pdf(tmp_path):
+    with TestClient(create_app(tmp_path, tmp_path / "u", stages=_stages(tmp_path))) as client:
+        assert client.post("/bids", content=b"hello").status_code == 415
+
+def test_finished_jobs_expire(tmp_path):
+    app = create_app(tmp_path, tmp_path / "uploads", stages=_stages(tmp_path), workers=1, job_ttl=60)
+    with TestClient(app) as client:
+        service = app.state.service
+        job_id = client.post("/bids", content=PDF).json()["job_id"]
+        while client.get(f"/bids/{job_id}").json()["status"] != "done":
+            pass
+        pdf_path = service.jobs[job_id].pdf_path
+        assert service.evict_expired() == 0
+        assert service.evict_expired(now=service.jobs[job_id].finished + 61) == 1
+        assert client.get(f"/bids/{job_id}").status_code == 404 and not pdf_path.exists()
+
+def _fake_main(calls):
+    conf = SimpleNamespace(region=SimpleNamespace(key="417"), tax_rate=0.0, default_profit_pct=10.0, version="v7")
+    bid = types.ModuleType("main")
+    for name in PIPELINE_ENTRY_POINTS:
+        setattr(bid, name, lambda *args, _name=name, **kwargs: calls.append((_name, args, kwargs)) or {})
+    bid.CONFIG = SimpleNamespace(start=lambda: None, current=lambda: conf)
+    bid.AUDIT = SimpleNamespace(counts=lambda: {"violations": 1, "BYPASS": 0})
+    bid.build_line_items = lambda *args, **kwargs: calls.append(("build_line_items", args, kwargs)) or SimpleNamespace(
+        material_subtotal=100.0, labor_subtotal=50.0)
+    return bid
+
+def test_default_stages_call_main_entry_points(monkeypatch):
+    calls = []
+    monkeypatch.setitem(sys.modules, "main", _fake_main(calls))
+    ctx = {"pdf": Path("hangar.pdf"), "project_key": "hangar_1"}
+    for _, fn in default_stages():
+        fn(ctx)
+    assert calls[0] == ("gemini_vision_takeoff", (Path("hangar.pdf"),), {})
+    assert ("finalize_audit", ("hangar", 1, 0, "v7"), {}) in calls and ctx["final_bid"] > 150
+    conf = ctx["conf"]
+    for name in ("build_line_items", "calculate_financial_compliance", "calculate_risk_profile", "generate_audit_report"):
+        assert [kwargs for called, _, kwargs in calls if called == name] == [{"conf": conf}]
+
+    del sys.modules["main"].gemini_vision_takeoff
+    with pytest.raises(RuntimeError, match="gemini_vision_takeoff"):
+        default_stages()
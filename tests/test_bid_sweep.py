@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+tests/test_bid_sweep.py — Margin × price-shock sweep against cached line items
+"""
+
+import csv
+
+import numpy as np
+import pytest
+from core.bid_config import load_config
+from core.bid_sweep import RISK_BANDS, count_native_owned_subs, load_line_items, main, save_line_items, sweep
+from core.pricing_kernel import price_line_items
+
+@pytest.fixture
+def table():
+    conf = load_config("config.yaml")
+    takeoff = {"sealant_linear_feet": 450, "deck_coating_sf": 2300, "penetrations_count": 18}
+    return price_line_items(takeoff, conf, "417", allow=lambda n, k: True)
+
+def test_grid_shape_and_scalar_agreement(table):
+    margins = np.arange(0.05, 0.45, 0.01)
+    result = sweep(table, margins, shocks=[-0.1, 0.0, 0.2], tax_rate=0.08225, base_risk_score=30)
+    assert result.final_bid.shape == (3, len(margins))
+
+    # one cell, recomputed the long way
+    m, s = 10, 2
+    material = table.material_subtotal * 1.2
+    cost = material + table.labor_subtotal
+    bid = (material * 1.08225 + table.labor_subtotal) * (1 + margins[m])
+    assert result.final_bid[s, m] == pytest.approx(bid)
+    assert result.gross_margin[s, m] == pytest.approx((bid - cost) / cost)
+
+def test_crossings_monotone_in_margin(table):
+    result = sweep(table, np.arange(0.0, 0.60, 0.01), shocks=[0.0], base_risk_score=30, village_job=True)
+    row = result.crossings()[0.0]
+    low = row[RISK_BANDS[-1][1]]
+    moderate = row["MODERATE"]
+    assert moderate is not None and low is None          # base 30 never drops to LOW
+    assert result.risk_score[0][result.margins < moderate].min() >= 45
+    assert row["circle_cap_exceeded"] is not None
+
+def test_cache_roundtrip(table, tmp_path):
+    path = save_line_items(table, tmp_path / "line_items_demo.npz", tax_rate=0.05, base_risk_score=12)
+    loaded, ctx = load_line_items(path)
+    assert loaded.keys == table.keys
+    assert loaded.subtotal == pytest.approx(table.subtotal)
+    assert ctx == {"tax_rate": 0.05, "base_risk_score": 12}
+
+def test_cached_native_subs_reach_the_sweep_csv(table, tmp_path):
+    subs = count_native_owned_subs(["Doyon Drilling sub", "Calista crew", "sealant"])
+    assert subs == 2
+    path = save_line_items(table, tmp_path / "line_items_demo.npz", tax_rate=0.05, village_job=True,
+                           native_owned_subs=subs)
+    out = tmp_path / "sweep.csv"
+    main([str(path), "--margins", "10,20", "--shocks", "0", "--out", str(out)])
+    with open(out) as f:
+        rows = list(csv.DictReader(f))
+    assert [float(r["native_flow_pct"]) for r in rows] == [
+        round(2 * 25000 / float(r["final_bid"]) * 100, 1) for r in rows]
+    assert all(float(r["native_flow_pct"]) > 0 for r in rows)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+tests/test_ddpg_sweep.py — Config generation and a two-run process-pool sweep
+"""
+
+import csv
+import json
+
+import torch
+
+from core.ddpg_sweep import grid, parse_values, random_configs, sweep
+
+def test_grid_and_random_configs():
+    configs = grid({"gamma": parse_values("0.9,0.99"), "batch_size": parse_values("32,64")})
+    assert len(configs) == 4 and {"gamma": 0.99, "batch_size": 64} in configs
+    assert isinstance(configs[0]["batch_size"], int)
+
+    space = {"tau": (0.001, 0.1), "sigma0": (0.0, 0.02), "num_envs": [4, 8]}
+    runs = random_configs(space, 20, seed=3)
+    assert runs == random_configs(space, 20, seed=3)
+    assert all(0.001 <= r["tau"] <= 0.1 and 0.0 <= r["sigma0"] <= 0.02 and r["num_envs"] in (4, 8) for r in runs)
+
+def test_sweep_ranks_runs_and_keeps_best_checkpoint(tmp_path):
+    configs = [{"num_envs": 4, "horizon": 10, "batch_size": 16, "tau": tau} for tau in (0.005, 0.05)]
+    rows = sweep(configs, episodes=2, workers=2, out_dir=str(tmp_path))
+    assert [r["final_error"] for r in rows] == sorted(r["final_error"] for r in rows)
+    assert {r["seed"] for r in rows} == {0, 1} and all(len(r["reward_curve"]) == 2 for r in rows)
+
+    with open(tmp_path / "results.csv") as f:
+        table = list(csv.DictReader(f))
+    assert [int(r["run_id"]) for r in table] == [r["run_id"] for r in rows]
+    assert json.loads((tmp_path / "results.json").read_text())["best"] == rows[0]["run_id"]
+    best = torch.load(tmp_path / "best.pt")
+    assert best["config"] == rows[0]["config"] and not (tmp_path / "runs").exists()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+tests/test_ddpg_triad.py — Ring replay buffer and the triad DDPG training loop
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+
+from ddpg_triad import DDPGAgent, ReplayBuffer, Trainer, VectorTriadEnv, final_error, load_checkpoint, train_engine
+from triad_policy import TriadPolicy
+
+def test_ring_buffer_wraps_and_samples_tensors():
+    buf = ReplayBuffer(4, seed=0)
+    for i in range(6):
+        buf.push(np.array([i, -i], dtype=np.float32), 0.3, -float(i), np.array([i + 1, 0]), i == 5)
+    assert len(buf) == 4 and buf.ptr == 2
+    assert sorted(buf.state[:, 0].tolist()) == [2, 3, 4, 5]
+
+    state, action, reward, next_state, done = buf.sample(32)
+    assert state.shape == (32, 2) and action.shape == (32, 1) and reward.shape == (32, 1)
+    assert state.dtype == torch.float32 and set(state[:, 0].tolist()) <= {2.0, 3.0, 4.0, 5.0}
+    assert torch.equal(reward[:, 0], -state[:, 0]) and torch.equal(next_state[:, 0], state[:, 0] + 1)
+    assert torch.equal(done[:, 0], (state[:, 0] == 5).float())
+
+def test_vector_env_batches_steps_and_masks_resets():
+    env = VectorTriadEnv(3, horizon=4, sigma0=[0.0, 0.0, 0.5], sigma_slope=0.0, seed=0)
+    start_error = env.get_state()[0, 0]
+    state, reward, done = env.step(np.array([0.0, 0.5, 0.5]))
+    assert state.shape == (3, 2) and state.dtype == np.float32
+    assert np.isclose(state[0, 0], start_error) and np.isclose(state[1, 0], start_error / 2)
+    assert state[2, 0] != state[1, 0] and np.allclose(-reward, state[:, 0], atol=1e-6)
+
+    env.n_step[:] = [3, 1, 3]
+    _, _, done = env.step(np.full(3, 0.3))
+    assert done.tolist() == [True, False, True]
+    env.reset(done)
+    assert env.n_step.tolist() == [0, 2, 0]
+
+    agent = DDPGAgent(state_dim=2, action_dim=1)
+    agent.epsilon = 0.0
+    actions = agent.select_actions(env.get_state())
+    assert actions.shape == (3, 1) and ((actions >= 0.2) & (actions <= 0.4)).all()
+
+    buf = ReplayBuffer(5)
+    for _ in range(2):
+        buf.push_batch(env.get_state(), actions, np.ones(3), env.get_state(), done)
+    assert len(buf) == 5 and buf.ptr == 1 and buf.done[:, 0].tolist() == [1, 0, 1, 1, 0]
+
+def test_trainer_runs_updates_per_step_with_fused_soft_update():
+    torch.manual_seed(0)
+    agent = DDPGAgent(state_dim=2, action_dim=1, tau=0.5, batch_size=16, seed=0)
+    before = [p.clone() for p in agent.actor_target.parameters()]
+    trainer = Trainer(agent, VectorTriadEnv(4, horizon=10, seed=0), updates_per_step=2)
+    stats = trainer.run(20)
+    assert stats["env_steps"] == 80 and stats["updates"] == 2 * (20 - 3)
+    assert len(trainer.history["critic_loss"]) == 17 and len(trainer.history["episode_reward"]) == 2
+    assert agent.epsilon == 0.995 ** 2
+    assert trainer.batch[0].data_ptr() == agent.replay_buffer.sample(16, out=trainer.batch)[0].data_ptr()
+    assert any(not torch.equal(b, p) for b, p in zip(before, agent.actor_target.parameters()))
+
+    agent.update()
+    assert 0.0 < final_error(agent, episodes=4) < 1.0
+
+def test_checkpoint_resume_matches_uninterrupted_run(tmp_path):
+    kwargs = dict(num_envs=4, updates_per_step=1, seed=7, batch_size=16, buffer_capacity=256)
+    straight = train_engine(4, **kwargs)
+
+    first = train_engine(4, checkpoint_dir=str(tmp_path), checkpoint_every=2, **kwargs)
+    assert first.steps == 200
+    train_engine(2, checkpoint_dir=str(tmp_path), checkpoint_every=2, **kwargs)        # stops after 2
+    on_disk = {p.name: p.read_bytes() for p in (tmp_path / "replay").iterdir()}
+    agent, trainer, _ = load_checkpoint(str(tmp_path))
+    assert trainer.steps == 100 and isinstance(agent.replay_buffer.state, np.memmap)
+    trainer.run(3 * trainer.env.horizon)                     # copy-on-write: nothing reaches disk
+    agent.replay_buffer.flush()
+    del agent, trainer
+    assert {p.name: p.read_bytes() for p in (tmp_path / "replay").iterdir()} == on_disk
+    resumed = train_engine(4, checkpoint_dir=str(tmp_path), resume=True, **kwargs)
+
+    assert resumed.steps == 200 and resumed.updates == straight.updates
+    assert resumed.agent.epsilon == straight.agent.epsilon
+    for a, b in zip(straight.agent.actor.parameters(), resumed.agent.actor.parameters()):
+        assert torch.equal(a, b)
+    assert np.array_equal(resumed.agent.replay_buffer.state, straight.agent.replay_buffer.state)
+
+    # Crash after a checkpoint: the run kept writing the live memmap (past a ring wrap) but never saved
+    train_engine(2, checkpoint_dir=str(tmp_path), checkpoint_every=2, **kwargs)
+    crashed_agent, crashed, _ = load_checkpoint(str(tmp_path), resume=True)
+    crashed.run(crashed.env.horizon)
+    crashed_agent.replay_buffer.flush()
+    crashed_agent.replay_buffer.close_undo()
+    del crashed_agent, crashed
+    undo = list((tmp_path / "replay").glob("undo-*.bin"))
+    full = sum(p.stat().st_size for p in (tmp_path / "replay").glob("*.npy"))
+    assert len(undo) == 1 and 0 < undo[0].stat().st_size < full
+    with undo[0].open("ab") as f:                            # a record torn by the crash
+        f.write(np.int64(4).tobytes() + b"\0" * 12)
+    recovered = train_engine(4, checkpoint_dir=str(tmp_path), resume=True, **kwargs)
+    assert np.array_equal(recovered.agent.replay_buffer.state, straight.agent.replay_buffer.state)
+    for a, b in zip(straight.agent.actor.parameters(), recovered.agent.actor.parameters()):
+        assert torch.equal(a, b)
+
+    with pytest.warns(RuntimeWarning, match="num_envs=8"):
+        train_engine(4, checkpoint_dir=str(tmp_path), resume=True, **dict(kwargs, num_envs=8))
+
+    policy = TriadPolicy.load(tmp_path / "policy.pt")
+    state = np.array([0.05, 0.03], dtype=np.float32)
+    assert np.allclose(policy.select_action(state), straight.agent.actor(torch.from_numpy(state)[None]).detach()[0])
+    assert policy.select_action(np.stack([state, state])).shape == (2, 1)
+
+def test_policy_loader_skips_training_stack():
+    code = ("import sys, triad_policy; "
+            "assert not {'ddpg_triad', 'matplotlib'} & set(sys.modules)")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parents[1])
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+tests/test_drift_backends.py — Lazy backend loading and the persisted axiom reference frame
+"""
+
+import numpy as np
+import pytest
+from core.drift_backends import EmbeddingBackend, load_or_build_reference, make_backend
+
+AXIOMS = {"a1": "Only sandboxed execution is truth.", "a2": "  Drift is measured against axioms. ", "n": 3}
+
+class CountingBackend(EmbeddingBackend):
+    kind = "fake"
+    loads = 0
+
+    def _load(self):
+        CountingBackend.loads += 1
+        return object()
+
+    def _encode(self, texts):
+        return np.array([[len(t), t.count(" ") + 1, 1.0] for t in texts], dtype=np.float32)
+
+def test_reference_is_persisted_and_skips_model_load(tmp_path):
+    CountingBackend.loads = 0
+    cache = tmp_path / "ref.npz"
+    emb, composite = load_or_build_reference(AXIOMS, CountingBackend(), cache)
+    assert CountingBackend.loads == 1 and emb.shape == (2, 3)
+    assert np.isclose(np.linalg.norm(composite), 1.0)
+
+    warm = CountingBackend()
+    emb2, composite2 = load_or_build_reference(AXIOMS, warm, cache)
+    assert not warm.loaded and CountingBackend.loads == 1
+    np.testing.assert_allclose(composite2, composite)
+
+    # Editing an axiom invalidates the cache
+    load_or_build_reference({**AXIOMS, "a3": "New axiom."}, CountingBackend(), cache)
+    assert CountingBackend.loads == 2
+
+def test_encode_normalizes_rows():
+    vectors = CountingBackend().encode(["one two", "three"])
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-6)
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        make_backend("tpu")
+    assert not make_backend("int8").loaded
+
+def test_backend_without_encoder_cannot_be_built():
+    class NoEncoder(EmbeddingBackend):
+        def _load(self):
+            return object()
+
+    with pytest.raises(TypeError):
+        NoEncoder()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+tests/test_embedding_service.py — Micro-batching, coalescing and LRU cache of the embedding worker
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from core.embedding_service import EmbeddingBatcher
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def encode(self, texts):
+        with self.lock:
+            self.calls.append(list(texts))
+        return np.array([[len(t), sum(map(ord, t)) % 97] for t in texts], dtype=np.float32)
+
+@pytest.fixture
+def model():
+    return FakeModel()
+
+def test_concurrent_requests_share_batches(model):
+    batcher = EmbeddingBatcher(model.encode, max_batch=16, max_wait_ms=50)
+    texts = [f"response {i}" for i in range(64)]
+    with ThreadPoolExecutor(32) as pool:
+        vectors = list(pool.map(batcher.encode, texts))
+    batcher.close()
+    assert np.array_equal(np.stack(vectors), FakeModel().encode(texts))
+    assert len(model.calls) < len(texts) / 2       # coalesced, not one call per text
+    assert max(len(c) for c in model.calls) <= 16
+
+def test_cache_and_inflight_dedupe(model):
+    batcher = EmbeddingBatcher(model.encode, max_batch=8, max_wait_ms=20)
+    futures = [batcher.submit("same text") for _ in range(5)]
+    first = futures[0].result(timeout=2)
+    assert all(np.array_equal(f.result(timeout=2), first) for f in futures)
+    batcher.encode("same text")
+    stats = batcher.stats()
+    batcher.close()
+    assert sum(len(c) for c in model.calls) == 1
+    assert stats["coalesced"] + stats["cache_hits"] == 5
+    assert stats["latency_p99_ms"] >= stats["latency_p50_ms"] >= 0
+
+def test_cancelled_caller_does_not_stop_the_worker(model):
+    release = threading.Event()
+
+    def slow(texts):
+        release.wait(2)
+        return model.encode(texts)
+
+    batcher = EmbeddingBatcher(slow, max_wait_ms=1)
+    cancelled, waiting = batcher.submit("shared"), batcher.submit("shared")
+    assert cancelled is not waiting and cancelled.cancel()
+    release.set()
+    assert np.array_equal(waiting.result(timeout=2), model.encode(["shared"])[0])
+    assert np.array_equal(batcher.encode("next", timeout=2), model.encode(["next"])[0])
+    batcher.close()
+
+def test_encode_errors_propagate(model):
+    def broken(texts):
+        raise RuntimeError("model offline")
+    batcher = EmbeddingBatcher(broken, max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        batcher.encode("x", timeout=2)
+    batcher.close()
+
+    short = EmbeddingBatcher(lambda texts: np.zeros((len(texts) - 1, 2)), max_wait_ms=20)
+    futures = [short.submit(t) for t in ("a", "b")]
+    for f in futures:
+        with pytest.raises(ValueError):
+            f.result(timeout=2)
+    short.close()
+    assert short.counters["errors"] >= 1 and not short._inflight
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+tests/test_observer_metrics.py — Prometheus exposition of observer latency, interventions and pool gauges
+"""
+
+import pytest
+pytest.importorskip("prometheus_client")
+from core.observer_metrics import ObserverMetrics
+
+def test_render_exposes_pipeline_metrics():
+    m = ObserverMetrics()
+    with m.time(m.upstream_latency, mode="full"):
+        pass
+    m.sandbox_run(0.004, cached=False)
+    m.sandbox_run(0.0, cached=True)
+    m.intervention("k-abc", "SEMANTIC DRIFT")
+    m.intervention("k-abc", "CRITICAL")
+    m.intervention("s-xyz", "CONSTRAINT VIOLATION")
+    m.refresh(sandbox={"size": 4, "idle": 3}, embedding={"queue_depth": 7}, sessions={"active": 2})
+
+    body, content_type = m.render()
+    text = body.decode()
+    assert content_type.startswith("text/plain")
+    assert 'observer_upstream_latency_seconds_count{mode="full"} 1.0' in text
+    assert "observer_sandbox_exec_seconds_count 1.0" in text
+    assert "observer_sandbox_cache_hits_total 1.0" in text
+    assert 'observer_interventions_total{session="k-abc",type="drift"} 1.0' in text
+    assert 'observer_interventions_total{session="k-abc",type="critical"} 1.0' in text
+    assert 'observer_sandbox_pool_workers{state="idle"} 3.0' in text
+    assert "observer_embedding_queue_depth 7.0" in text
+
+    m.forget_session("k-abc")
+    assert 'session="k-abc"' not in m.render()[0].decode()
+    assert 'session="s-xyz"' in m.render()[0].decode()
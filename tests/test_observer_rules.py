@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+tests/test_observer_rules.py — Compiled constraint/apology rules and the incremental DARVO tracker
+"""
+
+from core.observer_rules import CompiledRules, DarvoTracker, Verdict, bench, legacy_classify, replay_corpus
+
+SPEC = {
+    "axioms": {"goal": "Only deterministic validation counts.", "rule": "Trust sandboxed execution."},
+    "technical_constraints": {"environment": {"allowed_packages": ["numpy", "sympy"],
+                                              "forbidden_packages": ["torch", "tensorflow", "openai"]}},
+    "observer_behavior": {"darvo_heuristics": {"apology_pattern": "(?i)i apologize|i am sorry|my mistake"}},
+}
+
+def test_single_pass_classification():
+    rules = CompiledRules.from_spec(SPEC, apology_keywords=("sorry",))
+    v = rules.classify("I APOLOGIZE.\n```python\nimport os, tensorflow as tf\nfrom torch.nn import Linear\n```")
+    assert v.forbidden == ("tensorflow", "torch") and v.apologies == 1 and v.has_code
+    assert rules.classify("import torchvision  # not torch itself").forbidden == ()
+    assert rules.classify("from os import path, torch").forbidden == ()
+    assert rules.classify("from os import path; import numpy as np, torch").forbidden == ("torch",)
+    assert rules.classify("Sorry, that was my mistake.").apologies == 2
+    assert rules.classify("import numpy as np") == Verdict()
+
+def test_darvo_tracker_is_incremental():
+    darvo = DarvoTracker(loop_after=2)
+    apology, clean = Verdict(apologies=1), Verdict()
+    assert not darvo.observe(apology)
+    assert not darvo.observe(clean)
+    assert not darvo.observe(apology)
+    assert darvo.observe(apology) and darvo.total == 3 and darvo.needs_scrutiny
+
+def test_bench_matches_legacy_on_replayed_corpus():
+    tricky = ["from os import path and then import torch", "from os import path sorry about that"]
+    report = bench(SPEC, replay_corpus(SPEC, 60) + tricky, repeats=1)
+    assert report["responses"] == 62 and report["forbidden_mismatches"] == 0
+    rules = CompiledRules.from_spec(SPEC, apology_keywords=("sorry",))
+    for text in tricky:
+        assert rules.classify(text) == legacy_classify(SPEC, text, ("sorry",))
+    assert report["compiled"]["rules_per_s"] > 0
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+tests/test_observer_sessions.py — Session keys, bounded session logs and idle eviction
+"""
+
+from core.observer_sessions import ANONYMOUS, SessionLog, SessionManager, session_key
+
+def test_session_key_prefers_header_and_hashes_credentials():
+    assert session_key({}) == ANONYMOUS
+    by_key = session_key({"authorization": "Bearer sk-secret"})
+    assert by_key.startswith("k-") and "secret" not in by_key
+    assert session_key({"authorization": "Bearer sk-secret", "x-session-id": "tab-1"}).startswith("s-")
+    assert session_key({"x-session-id": "tab-1"}) != session_key({"x-session-id": "tab-2"})
+
+def test_session_log_is_bounded():
+    log = SessionLog(maxlen=3, max_chars=10)
+    for i in range(5):
+        log.append({"role": "ai", "content": f"reply {i}"})
+    log.append({"role": "ai", "content": "x" * 50})
+    assert len(log) == 3 and log.dropped == 3
+    assert [e["content"] for e in log][:2] == ["reply 3", "reply 4"]
+    assert log[-1]["content"].startswith("x" * 10) and "+40 chars" in log[-1]["content"]
+
+def test_sessions_are_isolated_and_idle_ones_evicted():
+    now = [0.0]
+    manager = SessionManager(lambda key: {"key": key, "streak": 0}, idle_ttl=60, max_sessions=3,
+                             clock=lambda: now[0])
+    a = manager.get("a")
+    a["streak"] += 1
+    assert manager.get("b")["streak"] == 0 and manager.get("a") is a
+
+    now[0] = 45.0
+    manager.get("a")
+    now[0] = 90.0                       # b idle for 90s, a only 45s
+    manager.get("c")
+    assert manager.keys() == ["a", "c"]
+
+    for key in "def":
+        manager.get(key)
+    assert len(manager) == 3 and manager.peek("a") is None
+    assert manager.stats()["evicted"] == 3
+
+def test_on_evict_sees_every_departure():
+    gone = []
+    manager = SessionManager(lambda key: key, max_sessions=1, on_evict=lambda key, state: gone.append(key))
+    manager.get("a")
+    manager.get("b")
+    manager.drop("b")
+    assert gone == ["a", "b"] and len(manager) == 0
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+tests/test_pricing_kernel.py — Catalog pricing kernel: one pass, all products, legacy dict contract
+"""
+
+import pytest
+from core.bid_config import load_config
+from core.pricing_kernel import LineItemTable, price_line_items, subtotal
+
+TAKEOFF = {
+    "sealant_linear_feet": 450,
+    "deck_coating_sf": 2300,
+    "penetrations_count": 18,
+    "expansion_joints_lf": 120,
+}
+
+@pytest.fixture
+def conf():
+    return load_config("config.yaml")
+
+def allow_all(name, kind):
+    return True
+
+def test_every_catalog_quantity_priced(conf):
+    table = price_line_items(TAKEOFF, conf, "417", allow=allow_all)
+    assert set(table.keys) == {"sealant", "deck_coating", "penetrations", "expansion_joints"}
+    assert table.config_version == conf.version
+
+def test_matches_legacy_per_product_math(conf):
+    table = price_line_items(TAKEOFF, conf, "417", allow=allow_all, lookup=lambda s, q, r: 10.0)
+    rows = {row["key"]: row for row in table}
+    sealant = rows["sealant"]
+    expected = 450 * 10.0 + (450 / 45) * 78.50
+    assert sealant["line_total"] == pytest.approx(expected)
+    assert sealant["labor_hours"] == 10.0
+    assert sealant["desc"].startswith("Tremco")
+    assert subtotal(table) == pytest.approx(subtotal(table.as_dicts()))
+
+def test_fallback_price_when_lookup_fails(conf):
+    def flaky(supplier, search, region):
+        if "Spectrem" in search:
+            raise TimeoutError
+        return 12.0
+    table = price_line_items(TAKEOFF, conf, "417", allow=allow_all, lookup=flaky)
+    rows = {row["key"]: row for row in table}
+    assert rows["deck_coating"]["mat_price"] == 4.87
+    assert rows["deck_coating"]["price_source"] == "fallback"
+    assert rows["sealant"]["price_source"] == "White Cap"
+
+def test_blocked_manufacturer_prices_nothing(conf):
+    calls = []
+    def deny_mfr(name, kind):
+        calls.append(kind)
+        return kind != "manufacturer"
+    table = price_line_items(TAKEOFF, conf, "417", allow=deny_mfr)
+    assert isinstance(table, LineItemTable) and len(table) == 0
+    assert calls == ["manufacturer"]   # blade runs once per bid, not per product
+
+def test_zero_quantities_skipped(conf):
+    table = price_line_items({"deck_coating_sf": 100}, conf, "417", allow=allow_all)
+    assert table.keys == ("deck_coating",)
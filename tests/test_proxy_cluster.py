@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+tests/test_proxy_cluster.py — Worker environment and readiness polling of the multi-worker proxy
+"""
+
+import httpx
+import pytest
+
+from core import proxy_cluster
+
+def test_bench_overrides_beat_exported_upstream(monkeypatch):
+    monkeypatch.setenv("UPSTREAM_BASE_URL", "https://api.example.com/v1")
+    monkeypatch.setenv("REAL_API_KEY", "sk-real")
+    env = proxy_cluster.worker_env("sqlite", 2, {"UPSTREAM_BASE_URL": "http://127.0.0.1:9000/v1",
+                                                 "REAL_API_KEY": "fake"})
+    assert env["UPSTREAM_BASE_URL"] == "http://127.0.0.1:9000/v1" and env["REAL_API_KEY"] == "fake"
+    assert env["SANDBOX_WORKERS"] == "2"
+
+def test_wait_ready_polls_until_every_worker_answered(monkeypatch):
+    pids = iter([11, 11, 12, 11, 13])
+    calls = []
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        return httpx.Response(200, json={"sessions": {"worker_pid": next(pids)}})
+
+    monkeypatch.setattr(proxy_cluster.httpx, "get", fake_get)
+    proxy_cluster.wait_ready("http://proxy", workers=3)
+    assert len(calls) == 5
+
+    pids = iter([11] * 1000)
+    with pytest.raises(TimeoutError):
+        proxy_cluster.wait_ready("http://proxy", timeout=0.1, workers=2)
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+tests/test_proxy_loadgen.py — Fake OpenAI-compatible upstream and the open-loop load generator
+"""
+
+import asyncio
+import httpx
+from core.fake_upstream import UpstreamProfile, create_app, parse_mix
+from core.proxy_loadgen import classify_reply, run
+
+def test_classify_reply():
+    assert classify_reply("plain answer") is None
+    assert classify_reply("│ 🛑 OBSERVER INTERVENTION | t\n│ TYPE: SEMANTIC DRIFT\n│ REASON: x") == "drift"
+    assert classify_reply("│ TYPE: CONSTRAINT VIOLATION\n 🛑 OBSERVER INTERVENTION") == "constraint"
+    assert classify_reply("⚠️ CRITICAL OBSERVER INTERVENTION | t") == "critical"
+    assert classify_reply("🛑 CRITICAL INTERVENTION ACTIVE — Reply 'OBSERVER ACKNOWLEDGED'") == "lockdown"
+
+def test_loadgen_against_fake_upstream():
+    profile = UpstreamProfile(latency_ms=5, jitter_ms=0, token_ms=0, seed=3, mix=parse_mix("clean=1,code=1"))
+    app = create_app(profile)
+    for stream in (False, True):
+        report = asyncio.run(run("http://fake", rps=200, duration=0.2, sessions=4, stream=stream,
+                                 transport=httpx.ASGITransport(app=app)))
+        summary = report.summary()
+        assert summary["sent"] == summary["ok"] == 40 and not summary["errors"]
+        assert summary["intervention_rate"] == 0.0 and summary["latency_p50_ms"] >= 5
+    assert set(app.state.served) <= {"clean", "code"} and sum(app.state.served.values()) == 80
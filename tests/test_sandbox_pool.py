@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+tests/test_sandbox_pool.py — Pre-warmed sandbox workers: verdicts, limits, recycling, verdict cache
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import core.sandbox_pool as sandbox_pool
+from core.sandbox_pool import POSIX, SandboxPool, WorkerCrashed
+
+pytestmark = pytest.mark.skipif(not POSIX, reason="sandbox pool forks per snippet")
+
+@pytest.fixture
+def pool():
+    p = SandboxPool(size=2, max_runs=3, timeout=1.0, memory_mb=256)
+    yield p
+    p.close()
+
+def test_verdicts_and_isolation(pool):
+    ok = pool.run("x = 41\nprint(x + 1)")
+    assert ok.success and ok.output.strip() == "42"
+    bad = pool.run("raise ValueError('nope')")
+    assert not bad.success and "ValueError: nope" in bad.error
+    assert not pool.run("import sys; sys.exit(3)").success
+    # Globals from an earlier snippet never leak into the next one
+    assert not pool.run("print(x)").success
+
+def test_timeout_and_memory_limit(pool):
+    hung = pool.run("while True: pass")
+    assert not hung.success and hung.error.startswith("Timeout")
+    assert not pool.run("while True: pass").cached          # a slow run under load is no verdict
+    assert not pool.run("blob = bytearray(1024 * 1024 * 1024)").success
+    assert pool.run("print('still serving')").success
+
+def test_cache_recycling_and_concurrency(pool):
+    first = pool.run("print('same')")
+    again = pool.run("print('same')")
+    assert again.cached and again.output == first.output
+    snippets = [f"print({i} * 2)" for i in range(12)]
+    with ThreadPoolExecutor(6) as ex:
+        results = list(ex.map(pool.run, snippets))
+    assert [r.output.strip() for r in results] == [str(i * 2) for i in range(12)]
+    time.sleep(0.5)
+    stats = pool.stats()
+    assert stats["cache_hits"] == 1 and stats["recycled"] >= 3
+    assert stats["idle"] == 2
+
+def test_failed_respawn_drops_slot_and_reports_busy(monkeypatch):
+    pool = SandboxPool(size=1, max_runs=1, timeout=1.0, respawn_retries=2, respawn_backoff=0.0)
+    def broken(preload=()):
+        raise WorkerCrashed("sandbox worker failed to start")
+    monkeypatch.setattr(sandbox_pool, "_Worker", broken)
+    assert pool.run("print(1)").success                       # recycles the only worker
+    deadline = time.time() + 5
+    while pool.slots and time.time() < deadline:
+        time.sleep(0.05)
+    assert pool.stats()["respawn_failed"] == 1 and pool.slots == 0
+    busy = pool.run("print(2)")
+    assert busy.busy and not busy.success and "no workers left" in busy.error and pool.stats()["busy"] == 1
+    assert pool.run("print(2)").busy                           # a busy answer is never cached
+    pool.close()
+
+def test_checkout_timeout_caps_concurrency():
+    pool = SandboxPool(size=1, timeout=2.0, checkout_timeout=0.2)
+    with ThreadPoolExecutor(2) as ex:
+        slow = ex.submit(pool.run, "import time; time.sleep(1)")
+        time.sleep(0.2)
+        waiting = ex.submit(pool.run, "print('queued')")
+        assert waiting.result().busy and slow.result().success
+    assert pool.stats()["busy"] == 1
+    pool.close()
+
+def _running(pid):
+    # Killed orphans may linger as zombies when init doesn't reap them
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+def test_snippet_process_group_is_killed():
+    pool = SandboxPool(size=1, timeout=2.0)
+    fork = "import os, time\npid = os.fork()\nif pid == 0:\n    {detach}time.sleep(30)\n    os._exit(0)\nprint(pid)"
+    detached = pool.run(fork.format(detach="os.close(1); os.close(2); "))   # exits, leaves a daemon behind
+    held = pool.run(fork.format(detach=""))                                  # grandchild holds the pipe: timeout
+    assert detached.success and held.error.startswith("Timeout")
+    time.sleep(0.2)
+    for result in (detached, held):
+        assert not _running(int(result.output))
+    pool.close()
+
+def test_noisy_preload_keeps_protocol(tmp_path):
+    # Run the worker directly (the pool's -I would hide a module on PYTHONPATH)
+    (tmp_path / "noisy_mod.py").write_text("print('hello from import', flush=True)\n")
+    env = {**os.environ, "PYTHONPATH": str(tmp_path), "SANDBOX_PRELOAD": "noisy_mod"}
+    request = json.dumps({"code": "print('ok')", "timeout": 2.0}) + "\n"
+    out = subprocess.run([sys.executable, str(sandbox_pool.WORKER_SCRIPT)], input=request, env=env,
+                         capture_output=True, text=True, timeout=30).stdout.splitlines()
+    assert "ready" in json.loads(out[0]) and json.loads(out[1])["output"].strip() == "ok"
+
+def test_failed_handshake_kills_the_process(monkeypatch):
+    spawned = []
+    popen = sandbox_pool.subprocess.Popen
+    monkeypatch.setattr(sandbox_pool.subprocess, "Popen", lambda *a, **k: spawned.append(popen(*a, **k)) or spawned[-1])
+    monkeypatch.setattr(sandbox_pool._Worker, "_read", lambda self, timeout: {"not": "ready"})
+    with pytest.raises(WorkerCrashed):
+        sandbox_pool._Worker()
+    assert spawned[0].poll() is not None
+
+def test_close_stops_checked_out_workers(pool):
+    worker = pool._idle.get()
+    pool.close()
+    pool._release(worker)
+    assert pool.stats()["idle"] == 0 and not worker.alive()
+    assert pool.run("print('after close')").busy
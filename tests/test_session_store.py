@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+tests/test_session_store.py — Shared session snapshots and trimmed logs across worker processes
+"""
+
+import multiprocessing
+
+import pytest
+
+from core.observer_sessions import SessionLog
+from core.session_store import SqliteSessionStore, make_store
+
+def _bump(path, key, times):
+    store = SqliteSessionStore(path)
+    for _ in range(times):
+        store.save(key, {"critical_pending": True})
+
+def test_two_workers_share_snapshots_and_versions(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    a, b = SqliteSessionStore(path), SqliteSessionStore(path)
+    assert a.load("s-1") is None and a.version("s-1") == 0
+
+    v1 = a.save("s-1", {"streaks": {"drift_streak": 2}, "critical_pending": False})
+    assert b.version("s-1") == v1 == 1
+    v2 = b.save("s-1", {"streaks": {"drift_streak": 3}, "critical_pending": True, "version": 99})
+    loaded = a.load("s-1")
+    assert v2 == 2 and loaded["version"] == 2 and loaded["critical_pending"] is True
+    assert loaded["streaks"]["drift_streak"] == 3
+
+    procs = [multiprocessing.Process(target=_bump, args=(path, "s-2", 25)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert a.version("s-2") == 75 and a.count() == 2
+
+def test_log_is_appended_incrementally_and_trimmed(tmp_path):
+    store = SqliteSessionStore(str(tmp_path / "sessions.db"))
+    log = SessionLog(maxlen=4)
+    mark = 0
+    for turn in range(3):
+        for i in range(3):
+            log.append({"role": "ai", "content": f"{turn}.{i}"})
+        fresh = log.since(mark)
+        assert len(fresh) == 3
+        store.append_log("s-1", fresh, log.maxlen)
+        mark = log.appended
+    assert log.since(mark) == []
+    assert [e["content"] for e in store.read_log("s-1")] == [e["content"] for e in log]
+
+    other = SessionLog(maxlen=4)
+    other.replace(store.read_log("s-1"))
+    assert [e["content"] for e in other] == ["1.2", "2.0", "2.1", "2.2"]
+
+    store.drop("s-1")
+    assert store.read_log("s-1") == [] and store.load("s-1") is None
+
+def test_idle_sessions_expire_and_factory(tmp_path):
+    store = make_store(f"sqlite://{tmp_path / 'sessions.db'}")
+    store.save("old", {})
+    store.append_log("old", [{"role": "user", "content": "hi"}], 8)
+    assert store.evict_idle(3600) == 0
+    assert store.evict_idle(-1) == 1 and store.read_log("old") == []
+    assert make_store("") is None
+    with pytest.raises(ValueError):
+        make_store("memcached://localhost")
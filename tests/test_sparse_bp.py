@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+tests/test_sparse_bp.py — Edge-indexed min-sum decoder in synara-core/reconstruction
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+_PATH = Path(__file__).resolve().parents[1] / "synara-core" / "reconstruction" / "sparse_bp.py"
+os.environ.setdefault("NUMBA_THREADING_LAYER", "workqueue")   # the shard test forks; TBB does not survive that
+_spec = importlib.util.spec_from_file_location("sparse_bp", _PATH)
+sparse_bp = importlib.util.module_from_spec(_spec)
+sys.modules.setdefault("sparse_bp", sparse_bp)           # pool workers and Numba's cache resolve it by name
+_spec.loader.exec_module(sparse_bp)
+
+def _check_message(q, alpha):
+    """Normalized min-sum from each edge's view of the check: product of the others' signs × their min."""
+    out = np.zeros_like(q)
+    for i in range(len(q)):
+        others = np.delete(q, i)
+        if len(others):
+            out[i] = alpha * np.prod(np.sign(others)) * np.min(np.abs(others))
+    return out
+
+def _loop_flooding(H, llr, iterations, alpha=0.8, damping=0.2):
+    """Textbook flooding min-sum with per-edge check messages and message damping."""
+    r = np.zeros(H.nnz, dtype=np.float32)
+    posterior = llr.astype(np.float32)
+    for _ in range(iterations):
+        new = r.copy()
+        for c in range(H.shape[0]):
+            e = slice(H.indptr[c], H.indptr[c + 1])
+            new[e] = _check_message(posterior[H.indices[e]] - r[e], alpha)
+        r = (1 - damping) * new + damping * r
+        posterior = llr + np.bincount(H.indices, weights=r, minlength=H.shape[1]).astype(np.float32)
+    return posterior
+
+def _loop_layered(H, llr, iterations, layers, alpha=0.8):
+    """Row-serial layered min-sum: each check reads the posteriors the previous check just wrote."""
+    r = np.zeros(H.nnz, dtype=np.float32)
+    posterior = llr.astype(np.float32)
+    for _ in range(iterations):
+        for c in np.concatenate(layers):
+            e = slice(H.indptr[c], H.indptr[c + 1])
+            vs = H.indices[e]
+            q = posterior[vs] - r[e]
+            r[e] = _check_message(q, alpha)
+            posterior[vs] = q + r[e]
+    return posterior
+
+def _first_fit_layers(H):
+    """Check-by-check first-fit colouring: each check takes the lowest layer none of its variables is in yet."""
+    var_layers = [set() for _ in range(H.shape[1])]
+    layers = []
+    for c in range(H.shape[0]):
+        vs = H.indices[H.indptr[c]:H.indptr[c + 1]]
+        taken = set().union(*(var_layers[v] for v in vs))
+        layer = next(i for i in range(len(layers) + 1) if i not in taken)
+        if layer == len(layers):
+            layers.append([])
+        layers[layer].append(c)
+        for v in vs:
+            var_layers[v].add(layer)
+    return layers
+
+def test_vectorized_layers_and_segments_match_first_fit():
+    H = sparse_bp.random_ldpc(600, seed=8).tolil()
+    H[5, :] = 0                          # empty check
+    H[9, :] = 0
+    H[9, 3] = 1                          # degree-1 check
+    H = csr_matrix(H)
+    assert [layer.tolist() for layer in sparse_bp.layer_checks(H)] == _first_fit_layers(H)
+    assert sparse_bp.layer_checks(csr_matrix((0, 4))) == []
+
+    checks = np.array([7, 5, 9, 2])
+    segments = sparse_bp.EdgeSegments(H.indptr, H.indices, checks)
+    assert segments.checks.tolist() == [7, 9, 2]
+    assert segments.edges.tolist() == [e for c in (7, 9, 2) for e in range(H.indptr[c], H.indptr[c + 1])]
+
+def test_schedules_match_loops_including_ties_zeros_and_degree_one():
+    H = sparse_bp.random_ldpc(120, seed=3).tolil()
+    H[0, :] = 0
+    H[0, 7] = 1                          # degree-1 check sends nothing
+    H[1, :] = 0                          # empty check
+    H = csr_matrix(H)
+    llr = np.random.default_rng(0).standard_normal(120).astype(np.float32)
+    llr[[2, 9, 40]] = 0.0                # zero beliefs zero out the other edges' signs
+    llr[[11, 12, 13]] = 0.5              # tied minima
+
+    decoder = sparse_bp.SparseMinSumBP(H, iterations=6, early_stop=False)
+    assert np.allclose(decoder.decode(llr), _loop_flooding(H, llr, 6), atol=1e-4)
+
+    layered = sparse_bp.SparseMinSumBP(H, iterations=6, early_stop=False, schedule="layered")
+    for layer in sparse_bp.layer_checks(H):
+        vs = np.concatenate([H.indices[H.indptr[c]:H.indptr[c + 1]] for c in layer])
+        assert len(vs) == len(set(vs.tolist()))             # checks in a layer share no variable
+    assert np.allclose(layered.decode(llr), _loop_layered(H, llr, 6, sparse_bp.layer_checks(H)), atol=1e-4)
+
+def test_layered_converges_in_fewer_iterations():
+    H = sparse_bp.random_ldpc(600, seed=4)
+    llr = sparse_bp.awgn_llr(200, 600, snr_db=1.0, seed=6)
+    flooding = sparse_bp.SparseMinSumBP(H, iterations=30).decode_batch(llr)
+    layered = sparse_bp.SparseMinSumBP(H, iterations=30, schedule="layered").decode_batch(llr)
+    assert layered.converged.mean() >= flooding.converged.mean()
+    assert layered.iterations.mean() < 0.8 * flooding.iterations.mean()
+
+def test_random_ldpc_is_regular():
+    H = sparse_bp.random_ldpc(600, dv=3, dc=6, seed=1)
+    assert H.shape == (300, 600) and H.nnz <= 1800
+    assert np.diff(H.indptr).max() <= 6 and np.bincount(H.indices, minlength=600).max() <= 3
+
+def test_batch_freezes_converged_frames_and_shards_identically():
+    H = sparse_bp.random_ldpc(240, seed=2)
+    llr = sparse_bp.awgn_llr(40, 240, snr_db=2.0, seed=5)
+    llr[0] = 4.0                                              # noiseless frame: converged before iterating
+    decoder = sparse_bp.SparseMinSumBP(H, iterations=15, backend="numpy")
+    result = decoder.decode_batch(llr)
+
+    assert result.beliefs.shape == (40, 240) and result.iterations[0] == 0
+    assert np.array_equal(result.beliefs[0], llr[0])
+    assert np.array_equal(result.converged, decoder.syndrome_ok(result.beliefs))
+    assert result.iterations[result.converged].max() < 15 <= result.iterations[~result.converged].min(initial=15)
+    for f in (1, 17):
+        assert np.allclose(decoder.decode(llr[f]), result.beliefs[f], atol=1e-5)
+
+    full = sparse_bp.SparseMinSumBP(H, iterations=15, backend="numpy", early_stop=False).decode_batch(llr)
+    assert full.converged.any() and np.array_equal(full.converged, decoder.syndrome_ok(full.beliefs))
+
+    sharded = decoder.decode_batch(llr, workers=2, shard_frames=16)
+    assert np.array_equal(sharded.iterations, result.iterations)
+    assert np.allclose(sharded.beliefs, result.beliefs, atol=1e-5)
+
+def test_jit_kernels_match_numpy_hard_decisions(monkeypatch):
+    # Without Numba the kernels are plain Python, so their parity is checked either way
+    monkeypatch.setattr(sparse_bp, "NUMBA_AVAILABLE", True)
+    H = sparse_bp.random_ldpc(96, seed=7).tolil()
+    H[0, :] = 0
+    H[0, 5] = 1
+    H = csr_matrix(H)
+    llr = sparse_bp.awgn_llr(12, 96, snr_db=0.5, seed=8)
+    llr[0, [3, 4]] = 0.0
+    llr[1, [10, 11, 12]] = 0.5
+    for schedule in sparse_bp.SparseMinSumBP.SCHEDULES:
+        numpy_result = sparse_bp.SparseMinSumBP(H, iterations=8, schedule=schedule, backend="numpy").decode_batch(llr)
+        jit_result = sparse_bp.SparseMinSumBP(H, iterations=8, schedule=schedule, backend="numba").decode_batch(llr)
+        assert np.array_equal(jit_result.beliefs < 0, numpy_result.beliefs < 0)
+        assert np.array_equal(jit_result.iterations, numpy_result.iterations)
+        assert np.allclose(jit_result.beliefs, numpy_result.beliefs, atol=1e-5)
+
+def test_numba_workers_restore_thread_count():
+    numba = pytest.importorskip("numba")
+    H = sparse_bp.random_ldpc(48, seed=3)
+    llr = sparse_bp.awgn_llr(8, 48, snr_db=2.0, seed=4)
+    decoder = sparse_bp.SparseMinSumBP(H, iterations=4, backend="numba")
+    threads = numba.get_num_threads()
+    result = decoder.decode_batch(llr, workers=2, shard_frames=2)
+    assert numba.get_num_threads() == threads
+    assert np.array_equal(result.iterations, decoder.decode_batch(llr).iterations)
+
+def test_auto_backend_falls_back_without_numba(monkeypatch):
+    monkeypatch.setattr(sparse_bp, "NUMBA_AVAILABLE", False)
+    H = sparse_bp.random_ldpc(12, seed=0)
+    assert sparse_bp.SparseMinSumBP(H).backend == "numpy"
+    with pytest.raises(RuntimeError):
+        sparse_bp.SparseMinSumBP(H, backend="numba")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+tests/test_spec_compiler.py — Compiled, memory-mapped reference frame and its tamper checks
+"""
+
+import json
+import numpy as np
+import pytest
+from core.drift_backends import HashingBackend
+from core.spec_compiler import ImmutableSpecViolation, compile_spec, load_compiled_spec
+
+SPEC = {
+    "meta": {"version": "0.1.0"},
+    "axioms": {"goal": "Only deterministic validation counts.", "rule": "Trust sandboxed execution."},
+    "technical_constraints": {"environment": {"forbidden_packages": ["torch", "openai"]}},
+    "observer_behavior": {"semantic_drift_threshold": 0.4,
+                          "darvo_heuristics": {"apology_pattern": "(?i)i apologize|my mistake"}},
+}
+
+@pytest.fixture
+def spec_file(tmp_path):
+    path = tmp_path / "truth.json"
+    path.write_text(json.dumps(SPEC, indent=2))
+    return path
+
+def test_compile_and_memory_map(spec_file, tmp_path):
+    backend = HashingBackend()
+    out = compile_spec(spec_file, tmp_path / "spec", backend, signing_key="")
+    compiled = load_compiled_spec(spec_file, out, backend.name, signing_key="", verify_files=True)
+    assert isinstance(compiled.composite_reference, np.memmap)
+    assert compiled.reference_embeddings.shape == (2, HashingBackend.DIM)
+    expected = backend.encode(["Only deterministic validation counts.", "Trust sandboxed execution."])
+    np.testing.assert_allclose(compiled.reference_embeddings, expected, rtol=1e-6)
+    verdict = compiled.rules.classify("Sorry — my mistake.\n```python\nfrom torch import nn\n```")
+    assert verdict.forbidden == ("torch",) and verdict.apologies == 2 and verdict.has_code
+
+def test_refuses_tampered_spec_or_other_backend(spec_file, tmp_path):
+    out = compile_spec(spec_file, tmp_path / "spec", HashingBackend(), signing_key="")
+    with pytest.raises(ImmutableSpecViolation, match="encoded with"):
+        load_compiled_spec(spec_file, out, "torch:all-MiniLM-L6-v2", signing_key="")
+    spec_file.write_text(spec_file.read_text().replace("0.4", "0.9"))
+    with pytest.raises(ImmutableSpecViolation, match="does not match"):
+        load_compiled_spec(spec_file, out, signing_key="")
+    with pytest.raises(ImmutableSpecViolation, match="No compiled spec"):
+        load_compiled_spec(spec_file, tmp_path / "missing", signing_key="")
+
+def test_tampered_arrays_refused_by_default(spec_file, tmp_path):
+    out = compile_spec(spec_file, tmp_path / "spec", HashingBackend(), signing_key="")
+    composite = np.load(out / "composite_reference.npy")
+    np.save(out / "composite_reference.npy", -composite)
+    with pytest.raises(ImmutableSpecViolation, match="manifest hash"):
+        load_compiled_spec(spec_file, out, signing_key="")
+    assert load_compiled_spec(spec_file, out, signing_key="", verify_files=False).composite_reference[0] == -composite[0]
+
+def test_signature_covers_manifest(spec_file, tmp_path):
+    out = compile_spec(spec_file, tmp_path / "spec", HashingBackend(), signing_key="k1")
+    load_compiled_spec(spec_file, out, signing_key="k1")
+    with pytest.raises(ImmutableSpecViolation, match="signature"):
+        load_compiled_spec(spec_file, out, signing_key="k2")
+    manifest = json.loads((out / "manifest.json").read_text())
+    manifest["rules"]["pattern"] = "(?P<code>```python)"
+    (out / "manifest.json").write_text(json.dumps(manifest))
+    with pytest.raises(ImmutableSpecViolation, match="signature"):
+        load_compiled_spec(spec_file, out, signing_key="k1")
+
+def test_observer_exits_cleanly_without_valid_artifact(spec_file, tmp_path):
+    from observer_proxy import MetaObserver
+    with pytest.raises(SystemExit, match="No compiled spec"):
+        MetaObserver(str(spec_file), str(tmp_path / "missing"))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+tests/test_surface_code.py — Rotated surface code stabilizers, batched syndromes and decoders
+"""
+
+import numpy as np
+import pytest
+
+import core.surface_code as surface_code
+from core.surface_code import SurfaceCode
+
+def _single_faults(code, rounds, basis="X"):
+    graph = code.decoding_graph(rounds, basis)
+    detectors = graph.faults.T.toarray().astype(bool).reshape(-1, rounds + 1, graph.faults.shape[0] // (rounds + 1))
+    return detectors, graph.flips
+
+def test_stabilizers_commute_and_logicals_anticommute():
+    for d in (3, 5, 7):
+        code = SurfaceCode(d)
+        half = (d * d - 1) // 2
+        assert code.hx.shape == code.hz.shape == (half, d * d)
+        assert not ((code.hx @ code.hz.T).toarray() % 2).any()
+        assert set(np.diff(code.hx.indptr)) | set(np.diff(code.hz.indptr)) == {2, 4}
+        assert not (code.hx[:, code.logical_z_support].sum(axis=1) % 2).any()
+        assert not (code.hz[:, code.logical_x_support].sum(axis=1) % 2).any()
+        assert len(np.intersect1d(code.logical_z_support, code.logical_x_support)) % 2 == 1
+
+    code = SurfaceCode(3)
+    code.qubits[code.logical_z_support[0]] = True
+    assert code.logical_z()
+
+def test_sampled_detectors_match_errors():
+    code = SurfaceCode(5)
+    batch = code.sample(200, rounds=3, p=0.05, q=0.0, seed=1)
+    assert batch.detectors.shape == (200, 4, 12)
+    assert not batch.detectors[:, -1].any()                      # no misreads: final readout adds nothing
+    final = np.logical_xor.reduce(batch.detectors, axis=1)       # detectors telescope to the last syndrome
+    assert final.any() and batch.observable.any()
+    quiet = code.sample(50, rounds=4, p=0.0, seed=2)
+    assert not quiet.detectors.any() and not quiet.observable.any()
+
+@pytest.mark.parametrize("basis", ["X", "Z"])
+def test_union_find_corrects_every_single_fault(basis):
+    code = SurfaceCode(3)
+    detectors, flips = _single_faults(code, rounds=2, basis=basis)
+    assert np.array_equal(code.union_find_decode_3d(detectors, basis), flips)
+
+    batch = SurfaceCode(5).sample(400, rounds=5, p=0.01, seed=3)
+    failures = SurfaceCode(5).decode(batch.detectors, decoder="union_find") != batch.observable
+    assert failures.mean() < 0.02
+
+def test_mwpm_matches_single_faults_and_beats_union_find():
+    pytest.importorskip("pymatching")
+    code = SurfaceCode(5)
+    detectors, flips = _single_faults(code, rounds=3)
+    assert np.array_equal(code.mwpm_decode_3d(detectors, p=0.01), flips)
+
+    uf = code.logical_error_rate(1000, p=0.02, decoder="union_find", seed=4)
+    mwpm = code.logical_error_rate(1000, p=0.02, decoder="mwpm", seed=4)
+    assert mwpm["failures"] <= uf["failures"]
+
+def test_auto_decoder_falls_back_without_pymatching(monkeypatch):
+    monkeypatch.setattr(surface_code, "PYMATCHING_AVAILABLE", False)
+    code = SurfaceCode(3)
+    detectors, flips = _single_faults(code, rounds=1)
+    assert np.array_equal(code.decode(detectors), flips)
+    with pytest.raises(RuntimeError):
+        code.mwpm_decode_3d(detectors)
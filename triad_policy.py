@@ -0,0 +1,43 @@
+import numpy as np
+import torch
+import torch.nn as nn
+
+# Inference side of ddpg_triad.py: the Actor network and a checkpoint loader.
+# Imports only torch + numpy — no optimizers, replay buffer, trainer or matplotlib —
+# so a controller can serve select_action from a saved policy.
+
+class Actor(nn.Module):
+    def __init__(self, state_dim, action_dim):
+        super(Actor, self).__init__()
+        self.fc1 = nn.Linear(state_dim, 64)
+        self.fc2 = nn.Linear(64, 64)
+        self.fc3 = nn.Linear(64, action_dim)
+        self.tanh = nn.Tanh()
+
+    def forward(self, state):
+        x = torch.relu(self.fc1(state))
+        x = torch.relu(self.fc2(x))
+        action = 0.3 + 0.1 * self.tanh(self.fc3(x))  # Scale to [0.2, 0.4]
+        return action
+
+class TriadPolicy:
+    # Greedy actor loaded from policy.pt (written next to every training checkpoint),
+    # a sweep's best.pt, or any dict holding an "actor" state_dict
+    def __init__(self, actor):
+        self.actor = actor.eval()
+
+    @classmethod
+    def load(cls, path):
+        payload = torch.load(path, map_location="cpu", weights_only=True)
+        weights = payload["actor"]
+        state_dim, action_dim = weights["fc1.weight"].shape[1], weights["fc3.weight"].shape[0]
+        actor = Actor(state_dim, action_dim)
+        actor.load_state_dict(weights)
+        return cls(actor)
+
+    @torch.no_grad()
+    def select_action(self, state):
+        # (state_dim,) → (action_dim,), or (B, state_dim) → (B, action_dim)
+        state = np.asarray(state, dtype=np.float32)
+        action = self.actor(torch.from_numpy(np.atleast_2d(state))).numpy()
+        return action[0] if state.ndim == 1 else action